@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measures pel.hexdump.hexdump() throughput over inputs from 1KB to 16MB,
+comparing it against the original byte-at-a-time implementation.
+
+    python3 benchmarks/hexdump.py [--reference-limit <bytes>]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.hexdump import hexdump
+
+
+def referenceHexdump(data: memoryview, bytes_per_line: int = 16,
+                     bytes_per_chunk: int = 4) -> list:
+    """
+    The byte-at-a-time hexdump the table-driven version replaced.
+    """
+    dump = []
+    num_chunks = math.ceil(bytes_per_line / bytes_per_chunk)
+    char_per_line = bytes_per_line * 2 + (2 * num_chunks) - 2
+    for i in range(0, len(data), bytes_per_line):
+        raw = ''
+        text = ''
+        for j, b in enumerate(data[i:i+bytes_per_line]):
+            if 0 != j and 0 == j % bytes_per_chunk:
+                raw += '  '
+            raw += ("%02X") % (b)
+            text += chr(b) if 0x20 <= b < 0x7f else '.'
+        raw = raw.ljust(char_per_line)
+        text = text.ljust(bytes_per_line)
+        dump.append(("%08X     %s     %s") % (i, raw, text))
+    return dump
+
+
+def measure(func, data: memoryview, *args) -> float:
+    """
+    Returns the best time of a few runs, in seconds.
+    """
+    number = max(1, (1 << 20) // len(data))
+    return min(timeit.repeat(lambda: func(data, *args), number=number,
+                             repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--reference-limit', type=int, default=1 << 20,
+                        help='largest input to time the original version on')
+    args = parser.parse_args()
+
+    results = []
+    for size in [1 << n for n in range(10, 25, 2)]:
+        data = memoryview(os.urandom(size))
+        for bytes_per_line, bytes_per_chunk in ((16, 4), (10, 4)):
+            result = {"Size": size,
+                      "Bytes per line": bytes_per_line,
+                      "Bytes per chunk": bytes_per_chunk}
+            seconds = measure(hexdump, data, bytes_per_line, bytes_per_chunk)
+            result["MB/s"] = round(size / seconds / 1e6, 1)
+
+            if size <= args.reference_limit:
+                assert hexdump(data, bytes_per_line, bytes_per_chunk) == \
+                    referenceHexdump(data, bytes_per_line, bytes_per_chunk)
+                reference = measure(referenceHexdump, data, bytes_per_line,
+                                    bytes_per_chunk)
+                result["Original MB/s"] = round(size / reference / 1e6, 1)
+                result["Speedup"] = round(reference / seconds, 1)
+
+            results.append(result)
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
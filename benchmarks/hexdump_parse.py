@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measures pel.hexdump.parse() on IO drawer dump sized inputs in each of the
+IO drawer hex dump line formats, comparing it against the original
+character-at-a-time parser.
+
+    python3 benchmarks/hexdump_parse.py [--size <bytes>]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.hexdump import parse
+from io_drawer.dump import HEX_DUMP_LINE_FORMATS
+
+
+def referenceParse(lines: list, line_format: str) -> bytearray:
+    """
+    The character-at-a-time parser the compiled version replaced.
+    """
+    hex_digit = re.compile('^[0-9a-fA-F]$')
+    data = bytearray()
+    for line in lines:
+        line = line.rstrip('\n')
+        prev_byte_is_high_nibble = False
+        if len(line) <= len(line_format):
+            for i in range(len(line)):
+                if (line_format[i] == 'A'):
+                    if not hex_digit.match(line[i]):
+                        break
+                elif (line_format[i] == 'D'):
+                    if not hex_digit.match(line[i]):
+                        break
+                    if prev_byte_is_high_nibble:
+                        byte_val = bytes.fromhex(line[(i-1):(i+1)])
+                        data.extend(byte_val)
+                        prev_byte_is_high_nibble = False
+                    else:
+                        prev_byte_is_high_nibble = True
+                elif (line_format[i] == 'C'):
+                    continue
+                elif (line_format[i] != line[i]):
+                    break
+    return data
+
+
+def buildLines(data: bytes, line_format: str) -> list:
+    """
+    Returns data as hex dump lines in the given line format, ending with a
+    short line.
+    """
+    bytes_per_line = line_format.count('D') // 2
+    lines = []
+    for offset in range(0, len(data), bytes_per_line):
+        digits = iter(data[offset:offset + bytes_per_line].hex().upper())
+        address = iter('%08X' % offset)
+        line = ''
+        for char in line_format:
+            if char == 'D':
+                line += next(digits, '')
+            elif char == 'A':
+                line += next(address)
+            elif char == 'C':
+                line += '.'
+            else:
+                line += char
+        lines.append(line.rstrip() + '\n')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=2 << 20,
+                        help='bytes of dump data')
+    args = parser.parse_args()
+
+    data = os.urandom(args.size - 5)
+    results = []
+    for line_format in HEX_DUMP_LINE_FORMATS:
+        lines = buildLines(data, line_format)
+        assert parse(lines, line_format) == data
+        assert referenceParse(lines, line_format) == data
+
+        compiled = min(timeit.repeat(lambda: parse(lines, line_format),
+                                     number=1, repeat=3))
+        reference = min(timeit.repeat(
+            lambda: referenceParse(lines, line_format), number=1, repeat=1))
+        results.append({"Line format": line_format,
+                        "Size": len(data),
+                        "Compiled (s)": round(compiled, 3),
+                        "Original (s)": round(reference, 3),
+                        "Speedup": round(reference / compiled, 1)})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measures io_drawer.ilog PTE table lookups over a full ilog buffer for each
+IO drawer type, comparing PTETable.get_entry() against the original search
+that tries each table entry's regular expression in turn.
+
+    python3 benchmarks/ilog_pte_lookup.py [--entries <count>]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from io_drawer.drawer_type import MEX_DRAWER_TYPE, NIMITZ_DRAWER_TYPE
+from io_drawer.ilog import PTETable, REPORTED_MASK, parse_ilog_data
+
+
+def referenceGetEntry(table: PTETable, pte: int):
+    """
+    The linear search the precompiled matcher replaced.
+    """
+    for entry in table.entries:
+        if entry.matches(pte):
+            return entry
+    return None
+
+
+def buildIlog(table: PTETable, count: int) -> bytes:
+    """
+    Returns an ilog buffer with count entries.  Most PTEs match a table
+    entry, some with the reported flag set, and the rest are undefined.
+    """
+    rand = random.Random(0)
+    data = bytearray()
+    for seq in range(count):
+        entry = rand.choice(table.entries)
+        pte = entry.pte_value | (rand.getrandbits(32) & ~entry.pte_mask)
+        choice = rand.random()
+        if choice < 0.1:
+            pte |= REPORTED_MASK
+        elif choice < 0.2:
+            pte = rand.getrandbits(32)
+        data += (seq * 7 % 0x10000).to_bytes(2, 'big')
+        data += (seq % 0x10000).to_bytes(2, 'big')
+        data += pte.to_bytes(4, 'big')
+    return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=4096,
+                        help='ilog entries in the buffer')
+    args = parser.parse_args()
+
+    results = []
+    for drawer_type in (MEX_DRAWER_TYPE, NIMITZ_DRAWER_TYPE):
+        header_file = drawer_type.get_header_file_path()
+        table = PTETable(header_file)
+        data = buildIlog(table, args.entries)
+        ptes = [int.from_bytes(data[i + 4:i + 8], 'big')
+                for i in range(0, len(data), 8)]
+
+        for pte in ptes:
+            assert table.get_entry(pte) is referenceGetEntry(table, pte)
+        lines = parse_ilog_data(memoryview(data), header_file)
+        with mock.patch.object(PTETable, 'get_entry', referenceGetEntry):
+            assert lines == parse_ilog_data(memoryview(data), header_file)
+
+        lookup = min(timeit.repeat(
+            lambda: [table.get_entry(pte) for pte in ptes],
+            number=1, repeat=5))
+        reference = min(timeit.repeat(
+            lambda: [referenceGetEntry(table, pte) for pte in ptes],
+            number=1, repeat=1))
+        parse = min(timeit.repeat(
+            lambda: parse_ilog_data(memoryview(data), header_file),
+            number=1, repeat=3))
+        results.append({"Drawer type": drawer_type.name,
+                        "Table entries": len(table.entries),
+                        "Ilog entries": len(ptes),
+                        "Lookup (s)": round(lookup, 4),
+                        "Original lookup (s)": round(reference, 4),
+                        "Speedup": round(reference / lookup, 1),
+                        "parse_ilog_data (s)": round(parse, 4)})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Measures the oe500 register dump user data parser on a large multi-chip
+register dump, comparing it against the original parser that walked the
+dump with DataStream and looked up each register from its hex strings.
+
+    python3 benchmarks/oe500_register_dump.py [--chips <count>]
+                                             [--registers <count>]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from collections import OrderedDict
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.datastream import DataStream
+from pel.hwdiags.parserdata import ParserData
+from udparsers.oe500 import oe500
+
+MODEL_ECS = [0x20da0010, 0x20da0020, 0x60d20011]
+
+
+def referenceParseRegisterDump(parser: ParserData, data: memoryview) -> str:
+    """
+    The register dump parser the struct based version replaced.  It uses the
+    uncached register lookup, as the original did.
+    """
+    stream = DataStream(data, byte_order='big', is_signed=False)
+    out = OrderedDict()
+    dump = []
+
+    reg_name_len = 25
+    data_chunk_len = 4
+    chip_desc_len = 31 + reg_name_len + data_chunk_len
+
+    chip_count = stream.get_int(4)
+
+    for c in range(0, chip_count):
+        model_ec = stream.get_mem(4).hex()
+        chip_pos = stream.get_int(2)
+        node_pos = stream.get_int(1)
+        num_regs = stream.get_int(4)
+
+        chip_desc = parser.get_chip_desc(model_ec, node_pos, chip_pos) + ' '
+        dump.append(chip_desc.ljust(chip_desc_len, '*'))
+
+        for r in range(0, num_regs):
+            reg_id = stream.get_mem(3).hex()
+            reg_inst = stream.get_int(1)
+            data_size = stream.get_int(1)
+            data_buf = stream.get_mem(data_size).hex()
+
+            reg_name, reg_addr = parser._decode_reg_data(model_ec, reg_id,
+                                                         reg_inst)
+
+            reg_name = reg_name[0: reg_name_len]
+            reg_name = reg_name.ljust(reg_name_len)
+
+            chunks = []
+            for i in range(0, len(data_buf), data_chunk_len):
+                chunks.append(data_buf[i: i + data_chunk_len])
+
+            data_buf = ' '.join(chunks)
+
+            dump.append("  %s (%s) %s" % (reg_name, reg_addr,
+                                          data_buf.upper()))
+
+    out["Register Dump"] = dump
+
+    return json.dumps(out)
+
+
+def writeDataFiles(data_path: str, reg_ids: list):
+    """
+    Writes a hwdiags data file for each model_ec, naming most registers.
+    """
+    for model_ec in MODEL_ECS:
+        registers = {}
+        for reg_id in reg_ids[:len(reg_ids) * 9 // 10]:
+            registers["%06x" % reg_id] = [
+                "REG_%06X" % reg_id,
+                {str(inst): "%08x" % (reg_id << 4 | inst)
+                 for inst in range(4)}]
+        data = {"model_ec": {"id": "%08x" % model_ec, "type": "chip"},
+                "registers": registers}
+        with open(os.path.join(data_path, '%08x.json' % model_ec), 'w') as fp:
+            json.dump(data, fp)
+
+
+def buildRegisterDump(chips: int, registers: int, reg_ids: list) -> bytes:
+    """
+    Returns a register dump with the given number of chips and registers per
+    chip.
+    """
+    rand = random.Random(0)
+    data = bytearray(chips.to_bytes(4, 'big'))
+    for c in range(chips):
+        data += MODEL_ECS[c % len(MODEL_ECS)].to_bytes(4, 'big')
+        data += c.to_bytes(2, 'big') + bytes([c % 4])
+        data += registers.to_bytes(4, 'big')
+        for r in range(registers):
+            size = rand.choice((4, 8, 8, 8, 16))
+            data += rand.choice(reg_ids).to_bytes(3, 'big')
+            data += bytes([rand.randrange(4), size])
+            data += rand.getrandbits(size * 8).to_bytes(size, 'big')
+    return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--chips', type=int, default=64,
+                        help='chips in the register dump')
+    parser.add_argument('--registers', type=int, default=1000,
+                        help='registers per chip')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PELTOOL_CACHE_DIR'] = os.path.join(tmp, 'cache')
+        data_path = os.path.join(tmp, 'data')
+        os.mkdir(data_path)
+        reg_ids = random.Random(1).sample(range(1 << 24), 500)
+        writeDataFiles(data_path, reg_ids)
+        data = memoryview(buildRegisterDump(args.chips, args.registers,
+                                            reg_ids))
+
+        def parse(parser_data: ParserData) -> str:
+            with mock.patch.object(oe500, 'parser_data', parser_data):
+                return oe500.parseUDToJson(2, 1, data)
+
+        parser_data = ParserData(data_path)
+        assert parse(parser_data) == \
+            referenceParseRegisterDump(parser_data, data)
+
+        # The register lookups are memoized, so time the first parse in a
+        # process, which starts with an empty cache, and repeated parses.
+        # Both versions load the data files in the first parse.
+        first = min(timeit.repeat(
+            lambda: parse(ParserData(data_path)), number=1, repeat=3))
+        repeated = min(timeit.repeat(
+            lambda: parse(parser_data), number=1, repeat=3))
+        reference = min(timeit.repeat(
+            lambda: referenceParseRegisterDump(ParserData(data_path), data),
+            number=1, repeat=3))
+
+        results = [{"Chips": args.chips,
+                    "Registers per chip": args.registers,
+                    "Size": len(data),
+                    "First parse (s)": round(first, 3),
+                    "Repeated parse (s)": round(repeated, 3),
+                    "Original (s)": round(reference, 3),
+                    "Speedup": round(reference / first, 1)}]
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measures message registry lookups, comparing the (SRC type, reason code)
+index against a linear search of the registry entries.
+
+Uses the production message registry if it can be found, otherwise a
+synthetic registry of a similar size.
+
+    python3 benchmarks/registry_lookup.py [--registry <path>]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.peltool.registry import Registry, getRegistryPath
+
+
+def syntheticRegistry(count: int) -> list:
+    """
+    Returns registry entries shaped like the production message registry.
+    """
+    pels = []
+    for i in range(count):
+        src = {"ReasonCode": "0x%04X" % (0x1000 + i)}
+        if i % 5 == 0:
+            src["Type"] = "11"
+        pels.append({"Name": "xyz.openbmc_project.Error%d" % i,
+                     "SRC": src,
+                     "Documentation": {"Message": "Error %d" % i}})
+    return pels
+
+
+def linearSearch(pels: list, code: str, srcType: str) -> dict:
+    """
+    The linear search the registry index replaced.
+    """
+    for pel in pels:
+        if "ReasonCode" not in pel["SRC"]:
+            continue
+        if srcType != pel["SRC"].get("Type", "BD"):
+            continue
+        if code not in pel["SRC"]["ReasonCode"]:
+            continue
+        return pel
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--registry', default=getRegistryPath(),
+                        help='message_registry.json to use')
+    parser.add_argument('--entries', type=int, default=700,
+                        help='size of the synthetic registry')
+    parser.add_argument('--number', type=int, default=20,
+                        help='passes over the lookup keys')
+    args = parser.parse_args()
+
+    registry = Registry.__new__(Registry)
+    if args.registry:
+        registry.pels = registry.loadJson(args.registry)
+        source = args.registry
+    else:
+        registry.pels = syntheticRegistry(args.entries)
+        source = 'synthetic'
+
+    build = timeit.timeit(lambda: Registry.buildIndex(registry.pels), number=1)
+    registry.index = Registry.buildIndex(registry.pels)
+
+    # Every code in the registry, plus as many misses.
+    keys = list(registry.index)
+    keys += [(srcType, '0xFF' + code[4:]) for srcType, code in keys]
+
+    for srcType, code in keys:
+        assert registry.findEntry(code, srcType) is \
+            linearSearch(registry.pels, code, srcType), (srcType, code)
+
+    lookups = len(keys) * args.number
+    indexed = timeit.timeit(
+        lambda: [registry.getErrorMessage(c, t) for t, c in keys],
+        number=args.number)
+    linear = timeit.timeit(
+        lambda: [linearSearch(registry.pels, c, t) for t, c in keys],
+        number=args.number)
+
+    print(json.dumps({"Registry": source,
+                      "Entries": len(registry.pels),
+                      "Index build (ms)": round(build * 1e3, 3),
+                      "Indexed lookup (us)": round(indexed / lookups * 1e6, 3),
+                      "Linear lookup (us)": round(linear / lookups * 1e6, 3)},
+                     indent=4))
+
+
+if __name__ == '__main__':
+    main()
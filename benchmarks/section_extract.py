@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Measures extracting one section from a PEL with many User Data sections,
+comparing pel.parseSections(), which only parses the requested section,
+against parsing the whole PEL and picking the section out.
+
+    python3 benchmarks/section_extract.py [--sections <count>]
+                                          [--size <bytes>]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+import pel
+from pel.peltool.config import Config
+
+
+def buildSection(section_id: bytes, body: bytes, sub_type: int = 0) -> bytes:
+    """
+    Returns a section with the given ID and body.
+    """
+    return section_id + struct.pack('>HBBH', 8 + len(body), 1, sub_type,
+                                    0x2000) + body
+
+
+def buildPEL(sections: int, size: int) -> bytes:
+    """
+    Returns a BMC PEL with a Primary SRC and the given number of text User
+    Data sections of about the given size.
+    """
+    line = b'Text user data line with some detail about the failure\n'
+    text = (line * (size // len(line) + 1))[:size & ~3]
+    ud = [buildSection(b'UD', text, 3) for _ in range(sections)]
+    ps = buildSection(b'PS', struct.pack('>BBBBHH8I', 2, 0, 0, 9, 0, 72,
+                                         *[0] * 8) +
+                      b'BD8D1001'.ljust(32), 1)
+
+    timestamp = bytes.fromhex('2022030818402700')
+    ph = buildSection(b'PH', timestamp + timestamp + struct.pack(
+        '>cxxBIQII', b'O', 3 + sections, 1, 0, 0x50000001, 0x50000001))
+    uh = buildSection(b'UH', struct.pack('>BBBBIBBHI', 0x10, 3, 0x40, 0, 0,
+                                         0, 0, 0x2000, 0))
+    return ph + uh + ps + b''.join(ud)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sections', type=int, default=200,
+                        help='User Data sections in the PEL')
+    parser.add_argument('--size', type=int, default=2000,
+                        help='size of each User Data section')
+    args = parser.parse_args()
+
+    config = Config()
+    config.every_pel = True
+    config.allow_plugins = False
+    data = buildPEL(args.sections, args.size)
+
+    results = []
+    for name in ('Primary SRC', 'User Data %d' % (args.sections - 1)):
+        def extract():
+            section, = pel.parseSections(data, [name], config)
+            return section.data
+
+        def reference():
+            return pel.parse(data, config).toDict()[name]
+
+        assert extract() == reference()
+
+        new = min(timeit.repeat(extract, number=10, repeat=5)) / 10
+        old = min(timeit.repeat(reference, number=10, repeat=5)) / 10
+        results.append({"Section": name,
+                        "PEL size": len(data),
+                        "Section only (ms)": round(new * 1000, 3),
+                        "Whole PEL (ms)": round(old * 1000, 3),
+                        "Speedup": round(old / new, 1)})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
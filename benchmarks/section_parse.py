@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Measures extracting the fixed-layout fields of the Private Header, User
+Header, SRC and SRC callout FRU identity and MRU structures with one struct
+unpack per record, comparing it against the original extraction of each
+field with its own DataStream call.
+
+    python3 benchmarks/section_parse.py [--count <PELs>]
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.datastream import DataStream
+from pel.peltool import private_header, src, user_header
+
+
+def referenceReadPrivateHeader(stream: DataStream) -> tuple:
+    """
+    The Private Header field extraction the struct based version replaced.
+    """
+    def getTimestamp(stream: DataStream) -> str:
+        year = stream.get_mem(2).hex()
+        month = stream.get_mem(1).hex()
+        day = stream.get_mem(1).hex()
+        hour = stream.get_mem(1).hex()
+        min = stream.get_mem(1).hex()
+        sec = stream.get_mem(1).hex()
+        stream.get_mem(1).hex()
+        return month + "/" + day + "/" + year + " " + hour + ":" + min + \
+            ":" + sec
+
+    return (getTimestamp(stream), getTimestamp(stream),
+            bytes.decode(stream.get_mem(1)), stream.get_int(1),
+            stream.get_int(1), stream.get_int(1), stream.get_int(4),
+            stream.get_int(8), stream.get_int(4), stream.get_int(4))
+
+
+def readPrivateHeader(stream: DataStream) -> tuple:
+    fields = stream.unpack_record(private_header._privateHeaderRecord)
+    return (private_header.formatTimestamp(fields[0]),
+            private_header.formatTimestamp(fields[1]),
+            bytes.decode(fields[2])) + fields[3:]
+
+
+def referenceReadUserHeader(stream: DataStream) -> tuple:
+    """
+    The User Header field extraction the struct based version replaced.
+    """
+    return (stream.get_int(1), stream.get_int(1), stream.get_int(1),
+            stream.get_int(1), stream.get_int(4), stream.get_int(1),
+            stream.get_int(1), stream.get_int(2), stream.get_int(4))
+
+
+def readUserHeader(stream: DataStream) -> tuple:
+    return stream.unpack_record(user_header._userHeaderRecord)
+
+
+def referenceReadSRC(stream: DataStream) -> tuple:
+    """
+    The SRC field extraction the struct based version replaced.
+    """
+    fields = ["0x" + stream.get_mem(1).hex(), stream.get_int(1),
+              stream.get_int(1), stream.get_int(1), stream.get_int(2),
+              stream.get_int(2)]
+    for i in range(8):
+        fields.append(stream.get_int(4))
+    fields.append(bytes.decode(stream.get_mem(32)))
+    return tuple(fields)
+
+
+def readSRC(stream: DataStream) -> tuple:
+    fields = stream.unpack_record(src._srcRecord)
+    return ("0x%02x" % fields[0],) + fields[1:14] + (bytes.decode(fields[14]),)
+
+
+def referenceReadFRUIdentity(stream: DataStream) -> tuple:
+    """
+    The FRU identity structure extraction the struct based version replaced.
+    """
+    type = stream.get_int(2)
+    size = stream.get_int(1)
+    flags = stream.get_int(1)
+    pn = ccin = sn = ""
+    if flags & 0x08 or flags & 0x02:
+        pn = bytes.decode(stream.get_mem(8)).strip("\u0000")
+    if flags & 0x04:
+        ccin = bytes.decode(stream.get_mem(4)).strip("\u0000")
+    if flags & 0x01:
+        sn = bytes.decode(stream.get_mem(12)).strip("\u0000")
+    return type, size, flags, pn, ccin, sn
+
+
+def readFRUIdentity(stream: DataStream) -> tuple:
+    fru = src.FRUIdentity(stream)
+    return fru.type, fru.size, fru.flags, fru.pnOrProcedureID, fru.ccin, fru.sn
+
+
+def referenceReadMRU(stream: DataStream) -> tuple:
+    """
+    The MRU structure extraction the struct based version replaced.
+    """
+    fields = [stream.get_int(2), stream.get_int(1), stream.get_int(1),
+              stream.get_int(4)]
+    for _ in range(fields[2] & 0xf):
+        fields.append((stream.get_int(4), stream.get_int(4)))
+    return tuple(fields)
+
+
+def readMRU(stream: DataStream) -> tuple:
+    mru = src.MRU(stream)
+    return (mru.type, mru.flattenedSize, mru.flags, mru.reserved4B) + \
+        tuple((m.priority, m.id) for m in mru.mrus)
+
+
+def buildRecords(count: int) -> list:
+    """
+    Returns count sets of the record bytes each reader extracts, with varying
+    field values.
+    """
+    records = []
+    for i in range(count):
+        timestamp = bytes.fromhex('20220308184027%02d' % (i % 100))
+        ph = timestamp + timestamp + struct.pack(
+            '>cxxBIQII', b'BHO'[i % 3:i % 3 + 1], 3 + i % 4, i, 0,
+            0x50000000 + i, 0x50000000 + i)
+        uh = struct.pack('>BBBBIBBHI', i % 0x80, 3, 0x40, 0, 0, 0, 0, 0xA800,
+                         0)
+        ps = struct.pack('>BBBBHH8I', 2, 1, 0, 9, 0, 72,
+                         *[(i * 8 + w) & 0xffffffff for w in range(8)])
+        ps += ('BD8D%04X' % (i & 0xffff)).encode().ljust(32)
+        fru = struct.pack('>HBB', 0x4944, 28, 0x1D) + b'01AB234\0' + \
+            b'2E2D' + ('YL10UF%06d' % i).encode()
+        mrus = 1 + i % 4
+        mru = struct.pack('>HBBI', 0x4D52, 8 + 8 * mrus, mrus, 0)
+        mru += struct.pack('>%dI' % (2 * mrus), *range(i, i + 2 * mrus))
+        records.append((ph, uh, ps, fru, mru))
+    return records
+
+
+READERS = [("Private Header", referenceReadPrivateHeader, readPrivateHeader),
+           ("User Header", referenceReadUserHeader, readUserHeader),
+           ("SRC", referenceReadSRC, readSRC),
+           ("FRU Identity", referenceReadFRUIdentity, readFRUIdentity),
+           ("MRU", referenceReadMRU, readMRU)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--count', type=int, default=10000,
+                        help='records of each type to extract')
+    args = parser.parse_args()
+
+    records = buildRecords(args.count)
+
+    def extract(index: int, read) -> list:
+        out = []
+        for record in records:
+            stream = DataStream(record[index], byte_order='big',
+                                is_signed=False)
+            out.append(read(stream))
+        return out
+
+    results = []
+    for index, (name, reference_read, read) in enumerate(READERS):
+        assert extract(index, read) == extract(index, reference_read)
+
+        new = min(timeit.repeat(lambda: extract(index, read), number=1,
+                                repeat=5))
+        reference = min(timeit.repeat(
+            lambda: extract(index, reference_read), number=1, repeat=5))
+
+        results.append({"Record": name,
+                        "Count": args.count,
+                        "Struct (s)": round(new, 4),
+                        "Original (s)": round(reference, 4),
+                        "Speedup": round(reference / new, 1)})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Measures exporting the summaries of a directory of PELs with --export,
+which only decodes the PEL headers, comparing the time and peak memory of
+the CSV and binary column formats against the JSON summary list of
+peltool -l --no-index.
+
+    python3 benchmarks/summary_export.py [--pels <count>]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'modules'))
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.summary_columns import COLUMNS, readSummaryColumns
+
+
+def buildSection(section_id: bytes, body: bytes, sub_type: int = 0) -> bytes:
+    """
+    Returns a section with the given ID and body.
+    """
+    return section_id + struct.pack('>HBBH', 8 + len(body), 1, sub_type,
+                                    0x2000) + body
+
+
+def buildPEL(eid: int) -> bytes:
+    """
+    Returns a BMC PEL with a Primary SRC and a User Data section.
+    """
+    refcode = b'BD8D%04X' % (eid % 64)
+    ps = buildSection(b'PS', struct.pack('>BBBBHH8I', 2, 0, 0, 9, 0, 72,
+                                         *[0] * 8) + refcode.ljust(32), 1)
+    ud = buildSection(b'UD', b'x' * 200, 3)
+
+    timestamp = bytes.fromhex('2022030818402700')
+    ph = buildSection(b'PH', timestamp + timestamp + struct.pack(
+        '>cxxBIQII', b'O', 4, 1, 0, eid, eid))
+    uh = buildSection(b'UH', struct.pack('>BBBBIBBHI', 0x10, 3, 0x40, 0, 0,
+                                         0, 0, 0x2000, 0))
+    return ph + uh + ps + ud
+
+
+class NullStdout:
+    """
+    Text stdout, with a binary buffer, that discards what's written.
+    """
+
+    def __init__(self):
+        self.buffer = self
+
+    def write(self, data) -> int:
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def run(func, *args, stdout=None):
+    with contextlib.redirect_stdout(stdout or NullStdout()):
+        func(*args)
+    return stdout
+
+
+def measure(func, *args) -> (float, int):
+    """
+    Returns: best time of a few runs of func, and its peak memory.
+    """
+    seconds = min(timeit.repeat(lambda: run(func, *args), number=1,
+                                repeat=3))
+    tracemalloc.start()
+    run(func, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pels', type=int, default=20000,
+                        help='PELs in the directory')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PELTOOL_CACHE_DIR'] = os.path.join(tmp, 'cache')
+        path = os.path.join(tmp, 'pels')
+        os.mkdir(path)
+        for i in range(args.pels):
+            with open(os.path.join(path, '%08d' % i), 'wb') as fd:
+                fd.write(buildPEL(0x50000000 + i))
+
+        config = Config()
+        config.use_index = False
+        config.allow_plugins = False
+
+        # Check the exports hold the same fields as the -l summaries.
+        summaries = json.loads(run(peltool.listOption, path, config,
+                                   stdout=io.StringIO()).getvalue())
+        out = run(peltool.exportPELSummaries, path, config, 'csv',
+                  stdout=io.StringIO())
+        expected = [dict({"EID": eid}, **{name: summary[name]
+                                          for name in COLUMNS
+                                          if name != "EID"})
+                    for eid, summary in summaries.items()]
+        assert list(csv.DictReader(io.StringIO(out.getvalue()))) == expected
+
+        out = io.StringIO()
+        out.buffer = io.BytesIO()
+        run(peltool.exportPELSummaries, path, config, 'columns', stdout=out)
+        columns = readSummaryColumns(out.buffer.getvalue())
+        assert ["0x%08X" % eid for eid in columns.columns["EID"]] == \
+            list(summaries)
+        columnsSize = len(out.buffer.getvalue())
+
+        results = []
+        listTime, listPeak = measure(peltool.listOption, path, config)
+        for name, func, fmt in (
+                ("List JSON (-l --no-index)", peltool.listOption, None),
+                ("CSV (--export csv)", peltool.exportPELSummaries, 'csv'),
+                ("Columns (--export columns)", peltool.exportPELSummaries,
+                 'columns')):
+            if fmt is None:
+                seconds, peak = listTime, listPeak
+            else:
+                seconds, peak = measure(func, path, config, fmt)
+            results.append({"Output": name,
+                            "PELs": args.pels,
+                            "Time (s)": round(seconds, 3),
+                            "Peak memory (KiB)": peak // 1024,
+                            "Speedup": round(listTime / seconds, 1)})
+        results.append({"Columns file size": columnsSize})
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+This module contains a process-wide cache of parsed IO drawer definition
+files, such as the C++ header file with the PTE table and the trace string
+file.
+"""
+
+import os
+import time
+
+
+# Files modified less than this many nanoseconds ago are not cached.  File
+# modification times are only as precise as the file system clock, so a file
+# that is rewritten soon after it was parsed could otherwise keep the same
+# size and modification time, and the stale parsed version would be used.
+RECENTLY_MODIFIED_NS = 2 * 1000 * 1000 * 1000
+
+# Parsed files, keyed by (load function, absolute file path).  Each value is a
+# ((modification time, size), parsed object) tuple.
+_cache = {}
+
+
+def get_cached(file_path: str, load):
+    """
+    Returns the result of calling load(file_path), reusing the result of an
+    earlier call if the file has not changed since.
+
+    The file is considered unchanged if its modification time and size are
+    the same.  Callers share the returned object, so it must not be modified.
+
+    Exceptions from load are not caught.
+    """
+
+    # If the file cannot be accessed, let load report the error
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return load(file_path)
+
+    key = (load, os.path.abspath(file_path))
+    file_key = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(key)
+    if (cached is not None) and (cached[0] == file_key):
+        return cached[1]
+
+    value = load(file_path)
+    if (time.time_ns() - st.st_mtime_ns) >= RECENTLY_MODIFIED_NS:
+        _cache[key] = (file_key, value)
+    else:
+        _cache.pop(key, None)
+    return value
+
+
+def clear_cache(file_path: str = None):
+    """
+    Removes parsed files from the cache so they are read again on next use.
+
+    If file_path is specified, only the results for that file are removed.
+    Otherwise the cache is emptied.
+    """
+
+    if file_path is None:
+        _cache.clear()
+    else:
+        file_path = os.path.abspath(file_path)
+        for key in [key for key in _cache if key[1] == file_path]:
+            del _cache[key]
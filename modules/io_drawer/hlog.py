@@ -5,6 +5,8 @@ This module contains functions to parse and format history log data.
 import re
 from collections import namedtuple
 
+from io_drawer.cache import get_cached
+from io_drawer.tables import HLOG_FIELDS, load_table
 from pel.datastream import DataStream
 from pel.hexdump import hexdump
 
@@ -42,11 +44,42 @@ def get_hlog_fields(header_file_path: str) -> list:
     """
     Returns the list of fields in the history log.
 
-    Parses the C++ header file to obtain the field definitions.
+    Parses the C++ header file to obtain the field definitions.  The parsed
+    fields are cached and the file is only parsed again if it changes.
     """
 
-    # Build list of fields by parsing C++ header file
+    return list(get_cached(header_file_path, _read_hlog_fields))
+
+
+def _read_hlog_fields(header_file_path: str) -> tuple:
+    """
+    Returns a tuple of the fields in the history log.
+
+    Uses the precompiled table for the C++ header file if there is a valid
+    one, otherwise parses the header file.
+    """
+
+    properties_list = load_table(header_file_path, HLOG_FIELDS)
+    if properties_list is None:
+        properties_list = read_hlog_field_definitions(header_file_path)
+
     fields = []
+    for properties in properties_list:
+        if len(properties) == 2:
+            size = int(properties[0])
+            name = properties[1]
+            field = HistoryLogField(name, size)
+            fields.append(field)
+    return tuple(fields)
+
+
+def read_hlog_field_definitions(header_file_path: str) -> list:
+    """
+    Parses the C++ header file and returns the properties of each history log
+    field definition, as a list of (size, name) tuples of strings.
+    """
+
+    properties_list = []
     in_data_structure = False
     with open(header_file_path) as file:
         for line in file:
@@ -57,13 +90,8 @@ def get_hlog_fields(header_file_path: str) -> list:
             elif in_data_structure:
                 match = HLOG_FIELD_RE.fullmatch(line)
                 if match:
-                    properties = match.groups()
-                    if len(properties) == 2:
-                        size = int(properties[0])
-                        name = properties[1]
-                        field = HistoryLogField(name, size)
-                        fields.append(field)
-    return fields
+                    properties_list.append(match.groups())
+    return properties_list
 
 
 def parse_hlog_data(data: memoryview, header_file_path: str) -> list:
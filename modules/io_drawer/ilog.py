@@ -4,6 +4,8 @@ This module parses and formats ilog/PTE data.
 
 import re
 
+from io_drawer.cache import get_cached
+from io_drawer.tables import PTE_TABLE, load_table
 from io_drawer.utils import format_timestamp
 from pel.datastream import DataStream
 
@@ -56,6 +58,10 @@ TBL_ENTRY_RE = re.compile(r'\s*\{\s*"([^"]+)"\s*\,\s*"((?:[^"]|\\")*)"\s*'
 #   { ""        , "The End" }
 TBL_END_RE = re.compile(r'\s*\{\s*""\s*\,\s*"The End".*\s*')
 
+# Regex for a PTE pattern that can be matched with a nibble mask and value
+# rather than a regular expression: 8 hex digits, any of which can be '*'.
+PTE_MASK_PATTERN_RE = re.compile(r'[0-9a-fA-F*]{8}')
+
 
 class PTETableEntry:
     """
@@ -79,11 +85,33 @@ class PTETableEntry:
         # in the message format string.  A PTE is 4 bytes long.
         self.params = tuple(p for p in self.params if (p >= 1) and (p <= 4))
 
-        # Compile regular expression corresponding to pte_pattern.  pte_pattern
-        # is not in regular expression format.  It contains '*' characters to
-        # match any one character.  Convert '*' to '.'.
-        re_pattern = self.pte_pattern.replace('*', '.')
-        self.pte_re = re.compile(re_pattern, re.IGNORECASE)
+        # Regular expression corresponding to pte_pattern.  Compiled on first
+        # use by the pte_re property; PTETable.get_entry() normally matches
+        # using pte_mask and pte_value instead.
+        self._pte_re = None
+
+        # Most patterns can also be expressed as a mask and value: a PTE
+        # matches if (pte & pte_mask) == pte_value.  Each '*' clears one
+        # nibble of the mask.  Both are None if the pattern has another form.
+        self.pte_mask = None
+        self.pte_value = None
+        if PTE_MASK_PATTERN_RE.fullmatch(self.pte_pattern):
+            self.pte_mask = int(''.join('0' if c == '*' else 'F'
+                                        for c in self.pte_pattern), 16)
+            self.pte_value = int(self.pte_pattern.replace('*', '0'), 16)
+
+    @property
+    def pte_re(self) -> re.Pattern:
+        """
+        Returns the compiled regular expression corresponding to pte_pattern.
+        """
+
+        if self._pte_re is None:
+            # pte_pattern is not in regular expression format.  It contains
+            # '*' characters to match any one character.  Convert '*' to '.'.
+            re_pattern = self.pte_pattern.replace('*', '.')
+            self._pte_re = re.compile(re_pattern, re.IGNORECASE)
+        return self._pte_re
 
     def get_message(self, pte: int) -> str:
         """
@@ -166,6 +194,11 @@ class PTETable:
         self.header_file_path = header_file_path
         self.entries = []
 
+        # Matcher built from the entries by _get_matcher(), and the
+        # identity and length of the entries list it was built from
+        self._matcher = None
+        self._matcher_key = None
+
         # Parse header file to get PTE table
         self._parse_header_file()
 
@@ -174,13 +207,68 @@ class PTETable:
         Returns the table entry that matches the specified PTE.
 
         Returns None if no matching entry is found.
+
+        If more than one entry matches, the first one in the table is
+        returned.  This is the same entry found by calling
+        PTETableEntry.matches() on each entry in turn, but uses a
+        dictionary lookup per distinct pattern mask instead.
         """
 
-        for entry in self.entries:
+        masks, other_entries = self._get_matcher()
+
+        # A reported error also matches entries for the PTE without the
+        # reported flag
+        ptes = (pte,)
+        if (((pte & ERROR_MASK) == ERROR_VALUE) and
+                ((pte & REPORTED_MASK) == REPORTED_VALUE)):
+            ptes = (pte, pte & ~REPORTED_MASK)
+
+        # Find the lowest index of a matching entry
+        first = len(self.entries)
+        for mask, values in masks:
+            for value in ptes:
+                index = values.get(value & mask, first)
+                if index < first:
+                    first = index
+
+        # Check entries whose pattern is not a mask and value
+        for index, entry in other_entries:
+            if index >= first:
+                break
             if entry.matches(pte):
-                return entry
+                first = index
+                break
+
+        if first < len(self.entries):
+            return self.entries[first]
         return None
 
+    def _get_matcher(self) -> tuple:
+        """
+        Returns the matcher used by get_entry(), building it if the entries
+        have changed.
+
+        The matcher is a tuple of two lists.  The first contains a
+        (mask, values) tuple for each distinct pattern mask, where values is
+        a dictionary mapping a pattern value to the index of the first entry
+        with that mask and value.  The second contains an (index, entry)
+        tuple for each entry whose pattern is not a mask and value.
+        """
+
+        key = (id(self.entries), len(self.entries))
+        if self._matcher_key != key:
+            masks = {}
+            other_entries = []
+            for index, entry in enumerate(self.entries):
+                if entry.pte_mask is None:
+                    other_entries.append((index, entry))
+                else:
+                    values = masks.setdefault(entry.pte_mask, {})
+                    values.setdefault(entry.pte_value, index)
+            self._matcher = (list(masks.items()), other_entries)
+            self._matcher_key = key
+        return self._matcher
+
     def _add_entry(self, fields: tuple):
         """
         Creates a table entry based on the specified fields from the C++ header
@@ -215,19 +303,49 @@ class PTETable:
     def _parse_header_file(self):
         """
         Parses the C++ header file to get the PTE table.
+
+        Uses the precompiled table for the header file if there is a valid
+        one.
         """
 
-        in_table = False
-        with open(self.header_file_path) as file:
-            for line in file:
-                if TBL_START_RE.fullmatch(line):
-                    in_table = True
-                elif TBL_END_RE.fullmatch(line):
-                    in_table = False
-                elif in_table:
-                    match = TBL_ENTRY_RE.fullmatch(line)
-                    if match:
-                        self._add_entry(match.groups())
+        fields_list = load_table(self.header_file_path, PTE_TABLE)
+        if fields_list is None:
+            fields_list = read_pte_table_fields(self.header_file_path)
+        for fields in fields_list:
+            self._add_entry(fields)
+
+
+def read_pte_table_fields(header_file_path: str) -> list:
+    """
+    Parses the C++ header file and returns the fields of each PTE table
+    entry, as a list of tuples of strings.
+    """
+
+    fields_list = []
+    in_table = False
+    with open(header_file_path) as file:
+        for line in file:
+            if TBL_START_RE.fullmatch(line):
+                in_table = True
+            elif TBL_END_RE.fullmatch(line):
+                in_table = False
+            elif in_table:
+                match = TBL_ENTRY_RE.fullmatch(line)
+                if match:
+                    fields_list.append(match.groups())
+    return fields_list
+
+
+def get_pte_table(header_file_path: str) -> PTETable:
+    """
+    Returns the PTE table defined in the specified C++ header file.
+
+    The table is shared with other callers and is only parsed again if the
+    header file changes.  Use io_drawer.cache.clear_cache() to force it to be
+    parsed again.
+    """
+
+    return get_cached(header_file_path, PTETable)
 
 
 def parse_ilog_data(data: memoryview, header_file_path: str) -> list:
@@ -238,7 +356,7 @@ def parse_ilog_data(data: memoryview, header_file_path: str) -> list:
     """
 
     # Get PTE Table from C++ header file
-    table = PTETable(header_file_path)
+    table = get_pte_table(header_file_path)
 
     # Add ilog table header to output lines
     lines = []
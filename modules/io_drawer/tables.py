@@ -0,0 +1,144 @@
+"""
+This module reads and writes precompiled IO drawer table files.
+
+The PTE table and history log fields in the C++ header files, and the trace
+strings in the trace string files, are found by matching each line of those
+files against regular expressions.  To avoid that cost at run time, the fields
+captured by the regular expressions are written at build time to a marshal
+file next to each source file, for example mex_pte.h.marshal.
+
+A precompiled file is only used if it was built from a source file with the
+same size and checksum, so a stale or missing file falls back to parsing the
+source file.
+
+To write the precompiled files for the files in a directory:
+
+    python3 -m io_drawer.tables [directory]
+"""
+
+import argparse
+import marshal
+import os
+import zlib
+
+from io_drawer.drawer_type import DRAWER_TYPES
+
+
+# Suffix added to a source file path to get the precompiled file path
+TABLES_FILE_SUFFIX = '.marshal'
+
+# Version of the precompiled file contents.  Increment if the fields stored
+# for a table change.
+TABLES_FILE_VERSION = 1
+
+# Names of the tables stored in precompiled files
+PTE_TABLE = 'pte_table'
+HLOG_FIELDS = 'hlog_fields'
+TRACE_STRINGS = 'trace_strings'
+
+
+def get_tables_file_path(source_path: str) -> str:
+    """
+    Returns the path to the precompiled file for the specified source file.
+    """
+
+    return source_path + TABLES_FILE_SUFFIX
+
+
+def _get_source_context(source_path: str) -> list:
+    """
+    Returns what a precompiled file must have been built from to be valid:
+    the file format versions and the size and checksum of the source file.
+
+    Raises an OSError if the source file cannot be read.
+    """
+
+    with open(source_path, 'rb') as file:
+        data = file.read()
+    return [TABLES_FILE_VERSION, marshal.version, len(data), zlib.crc32(data)]
+
+
+def load_table(source_path: str, name: str) -> list:
+    """
+    Returns the fields of the specified table from the precompiled file for
+    the specified source file.
+
+    Returns None if there is no valid precompiled file or it does not contain
+    the table.
+    """
+
+    try:
+        with open(get_tables_file_path(source_path), 'rb') as file:
+            data = marshal.loads(file.read())
+        if data['context'] != _get_source_context(source_path):
+            return None
+        return data['tables'].get(name)
+    except (OSError, EOFError, ValueError, TypeError, KeyError,
+            AttributeError):
+        return None
+
+
+def write_tables_file(source_path: str, tables: dict):
+    """
+    Writes the precompiled file for the specified source file.
+
+    The tables parameter maps a table name to a list of field tuples.
+    """
+
+    data = {'context': _get_source_context(source_path), 'tables': tables}
+    with open(get_tables_file_path(source_path), 'wb') as file:
+        file.write(marshal.dumps(data))
+
+
+def write_drawer_tables_files(directory: str = None) -> list:
+    """
+    Parses the C++ header file and trace string file of each drawer type and
+    writes their precompiled files.
+
+    The source files are read from the specified directory, or the directory
+    containing this module if not specified, and the precompiled files are
+    written next to them.
+
+    Returns the list of precompiled file paths written.
+    """
+
+    # Import here to avoid circular imports; these modules load tables
+    from io_drawer.hlog import read_hlog_field_definitions
+    from io_drawer.ilog import read_pte_table_fields
+    from io_drawer.trace import read_trace_string_fields
+
+    if directory is None:
+        directory = os.path.dirname(__file__)
+
+    paths = []
+    for drawer_type in DRAWER_TYPES:
+        header_file = os.path.join(directory, drawer_type.header_file_name)
+        write_tables_file(header_file, {
+            PTE_TABLE: read_pte_table_fields(header_file),
+            HLOG_FIELDS: read_hlog_field_definitions(header_file)
+        })
+        paths.append(get_tables_file_path(header_file))
+
+        string_file = os.path.join(directory, drawer_type.string_file_name)
+        write_tables_file(string_file, {
+            TRACE_STRINGS: read_trace_string_fields(string_file)
+        })
+        paths.append(get_tables_file_path(string_file))
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Write precompiled IO drawer table files.')
+    parser.add_argument('directory', nargs='?',
+                        help='directory containing the drawer type source '
+                             'files (default: the io_drawer package)')
+    args = parser.parse_args()
+
+    for path in write_drawer_tables_files(args.directory):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
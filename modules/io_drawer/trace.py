@@ -4,6 +4,8 @@ This module parses and formats trace data.
 
 import re
 
+from io_drawer.cache import get_cached
+from io_drawer.tables import TRACE_STRINGS, load_table
 from io_drawer.utils import format_timestamp
 from pel.datastream import DataStream
 from pel.hexdump import hexdump
@@ -14,6 +16,11 @@ class TraceString:
     Represents one trace string from the trace string file.
     """
 
+    # Currently the source file line number is multipled by 100000 to form
+    # part of the hash value.  The hash value modulo this number is not based
+    # on the line number.
+    PARTIAL_HASH_MODULUS = 100000
+
     def __init__(self, hash_value: int, message_format: str, location: str):
         """
         Constructor.
@@ -53,11 +60,11 @@ class TraceString:
         the source file line number containing the trace may have changed.
         """
 
-        # Currently the source file line number is multipled by 100000 to form
-        # part of the hash value.  Check if the lower order digits in the hash
-        # match; those digits are not based on the line number.
+        # Check if the lower order digits in the hash match; those digits are
+        # not based on the line number.
         return ((self.hash_value != hash_value) and
-                ((self.hash_value % 100000) == (hash_value % 100000)))
+                ((self.hash_value % self.PARTIAL_HASH_MODULUS) ==
+                 (hash_value % self.PARTIAL_HASH_MODULUS)))
 
 
 class TraceStringFile:
@@ -84,12 +91,21 @@ class TraceStringFile:
         self.string_file_path = string_file_path
         self.trace_strings = []
 
-        # Parse string file to obtain trace strings
-        with open(self.string_file_path) as file:
-            for line in file:
-                match = self.LINE_RE.fullmatch(line)
-                if match:
-                    self._add_trace_string(match.groups())
+        # Trace strings indexed by exact hash value, keeping the first one
+        # with each value.
+        self._exact_matches = {}
+
+        # Trace strings indexed by the hash digits that are not based on the
+        # line number, keeping the last one with each value.
+        self._partial_matches = {}
+
+        # Get trace strings from the precompiled table for the string file if
+        # there is a valid one.  Otherwise parse the string file.
+        fields_list = load_table(self.string_file_path, TRACE_STRINGS)
+        if fields_list is None:
+            fields_list = read_trace_string_fields(self.string_file_path)
+        for fields in fields_list:
+            self._add_trace_string(fields)
 
     def get_trace_string(self, hash_value: int) -> TraceString:
         """
@@ -98,16 +114,14 @@ class TraceStringFile:
         Returns None if no matching trace string is found.
         """
 
-        # Loop through all trace strings looking for an exact match.  Also save
-        # any partial matches.  If no exact match is found, return the last
-        # partial match found (if any).
-        partial_match = None
-        for trace_string in self.trace_strings:
-            if trace_string.is_match(hash_value):
-                return trace_string
-            elif trace_string.is_partial_match(hash_value):
-                partial_match = trace_string
-        return partial_match
+        # Return the first exact match.  If no exact match is found, return
+        # the last partial match (if any).  Without an exact match, every
+        # trace string with the same lower order digits is a partial match.
+        trace_string = self._exact_matches.get(hash_value)
+        if trace_string is None:
+            trace_string = self._partial_matches.get(
+                hash_value % TraceString.PARTIAL_HASH_MODULUS)
+        return trace_string
 
     def _add_trace_string(self, fields: tuple):
         """
@@ -127,6 +141,9 @@ class TraceStringFile:
         # Create trace string and add to list of trace strings
         trace_string = TraceString(hash_value, message_format, location)
         self.trace_strings.append(trace_string)
+        self._exact_matches.setdefault(hash_value, trace_string)
+        self._partial_matches[
+            hash_value % TraceString.PARTIAL_HASH_MODULUS] = trace_string
 
 
 class TraceBufferHeader:
@@ -375,6 +392,33 @@ def _format_trace_entry(entry: TraceEntry, string_file: TraceStringFile,
                 lines.append(f'{indent}{dump_line}')
 
 
+def read_trace_string_fields(string_file_path: str) -> list:
+    """
+    Parses the trace string file and returns the fields of each trace string,
+    as a list of tuples of strings.
+    """
+
+    fields_list = []
+    with open(string_file_path) as file:
+        for line in file:
+            match = TraceStringFile.LINE_RE.fullmatch(line)
+            if match:
+                fields_list.append(match.groups())
+    return fields_list
+
+
+def get_trace_string_file(string_file_path: str) -> TraceStringFile:
+    """
+    Returns the trace strings in the specified trace string file.
+
+    The object is shared with other callers and the file is only parsed again
+    if it changes.  Use io_drawer.cache.clear_cache() to force it to be
+    parsed again.
+    """
+
+    return get_cached(string_file_path, TraceStringFile)
+
+
 def parse_trace_data(data: memoryview, string_file_path: str) -> list:
     """
     Parses binary trace data and returns formatted output.
@@ -383,7 +427,7 @@ def parse_trace_data(data: memoryview, string_file_path: str) -> list:
     """
 
     # Parse trace string file
-    string_file = TraceStringFile(string_file_path)
+    string_file = get_trace_string_file(string_file_path)
 
     # Parse trace buffer
     lines = []
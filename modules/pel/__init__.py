@@ -0,0 +1,55 @@
+"""
+Library for parsing OpenPOWER Platform Event Logs (PELs).
+
+    import pel
+
+    with open(path, 'rb') as fd:
+        log = pel.parse(fd.read())
+    print(log.eid, log.referenceCode)
+    for section in log.sections:
+        print(section.name, section.data)
+    print(log.toJSON())
+
+To parse only some sections of a PEL, which doesn't parse the others:
+
+    src, = pel.parseSections(data, ['Primary SRC'])
+"""
+
+
+def parse(data: memoryview, config: 'Config' = None) -> 'PEL':
+    """
+    Parses a PEL, starting at the beginning of data, into a PEL object with
+    the parsed headers, the list of parsed sections and the PEL data as
+    peltool shows it.  The JSON text is only rendered if PEL.toJSON() is
+    called.
+
+    Unless a pel.peltool.config.Config is given, every PEL is parsed and
+    parser plugins are used.  With a Config, PELs its filters exclude
+    aren't parsed.
+
+    Returns: pel.peltool.parsed_pel.PEL, or None if data doesn't start with
+             a valid PEL or the PEL is excluded by config.
+    """
+    # Imported here so that importing a module from the pel package, as
+    # every parser plugin does, doesn't load the section parsers.
+    from pel.peltool.parsed_pel import parse
+    return parse(data, config)
+
+
+def parseSections(data: memoryview, names: list,
+                  config: 'Config' = None) -> list:
+    """
+    Parses only the named sections of a PEL, starting at the beginning of
+    data.  The sections are found from the section headers, so the other
+    sections aren't parsed.  A name without a count, eg 'User Data',
+    selects every section with that name.
+
+    The config is used the same way as by parse().
+
+    Returns: list of pel.peltool.parsed_pel.Section, in the order they are
+             in the PEL, or None if data doesn't start with a valid PEL or
+             the PEL is excluded by config.
+    Raises ValueError if the PEL's section headers don't fit in data.
+    """
+    from pel.peltool.parsed_pel import parseSections
+    return parseSections(data, names, config)
@@ -0,0 +1,98 @@
+"""
+On-disk caches shared by the pel package: where they are stored, how a
+cached entry is matched to the file it was built from, and how cache files
+are written.
+"""
+
+import os
+import time
+
+
+# Files modified less than this many nanoseconds ago are not cached.  File
+# modification times are only as precise as the file system clock, so a file
+# that is rewritten soon after it was cached could otherwise keep the same
+# size and modification time, and the stale cached entry would be used.
+RECENTLY_MODIFIED_NS = 2 * 1000 * 1000 * 1000
+
+
+def getCacheDir() -> str:
+    """
+    Returns the directory used to store the on-disk caches of the pel
+    package, such as peltool's summary index and the hwdiags data file
+    index, creating it if needed.  The location can be overridden with
+    PELTOOL_CACHE_DIR, otherwise $XDG_CACHE_HOME/peltool (or
+    ~/.cache/peltool) is used, as it was when only peltool had caches.
+    Returns an empty string if there is no usable cache directory.
+    """
+    path = os.environ.get('PELTOOL_CACHE_DIR')
+    if not path:
+        base = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        path = os.path.join(base, 'peltool')
+
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return ''
+
+    return path if os.access(path, os.W_OK) else ''
+
+
+def getFileKey(path: str) -> list:
+    """
+    Returns the size and modification time of a file, used to detect when a
+    cached entry is stale.  Returns an empty list if the file doesn't exist.
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return []
+    return [st.st_size, st.st_mtime_ns]
+
+
+def isRecentlyModified(key: list) -> bool:
+    """
+    Returns True if the file key from getFileKey() is for a file modified
+    too recently for its cached entry to be trusted, or a file that doesn't
+    exist.
+    """
+    return not key or time.time_ns() - key[1] < RECENTLY_MODIFIED_NS
+
+
+def writeCacheFile(path: str, data: bytes) -> bool:
+    """
+    Atomically replaces the cache file at the given path with data, so
+    concurrent processes never see a partially written file.  A cache is
+    only an optimization, so nothing is reported if it can't be written.
+    Returns True if the file was written, False otherwise.
+    """
+    # The temporary file is unique to this process, and created with
+    # O_EXCL like tempfile.mkstemp(), without the cost of importing tempfile
+    # on the peltool startup path.
+    tmpPath = os.path.join(os.path.dirname(path),
+                           '.tmp-%d-%s' % (os.getpid(), os.path.basename(path)))
+    try:
+        fd = os.open(tmpPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Left behind by an earlier process with the same PID.
+        try:
+            os.remove(tmpPath)
+            fd = os.open(tmpPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                         0o600)
+        except OSError:
+            return False
+    except (OSError, ValueError):
+        return False
+
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+        os.replace(tmpPath, path)
+    except OSError:
+        try:
+            os.remove(tmpPath)
+        except OSError:
+            pass
+        return False
+
+    return True
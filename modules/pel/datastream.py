@@ -1,3 +1,6 @@
+import struct
+
+
 class DataStream:
     """
     A simple object to manage extracting data from a memoryview. Will perform
@@ -66,3 +69,29 @@ class DataStream:
 
         return int.from_bytes(self.get_mem(num_bytes),
                               byteorder=byte_order, signed=is_signed)
+
+    def unpack(self, fmt: str) -> tuple:
+        """
+        Returns a tuple of the fields of a fixed-layout record described by the
+        given `struct` format string and increments the current index by the
+        size of the record. The format string should start with a byte order
+        character, such as '>' for big endian.
+
+        The whole record is range checked and extracted at once, which is much
+        faster than calling `get_int` for each field.
+        """
+        size = struct.calcsize(fmt)
+        assert self.check_range(size), "range check failure"
+        fields = struct.unpack_from(fmt, self.data, self.index)
+        self.index += size
+        return fields
+
+    def unpack_record(self, record: struct.Struct) -> tuple:
+        """
+        Same as `unpack`, but with a precompiled `struct.Struct`. Use this for
+        records that are extracted often.
+        """
+        assert self.check_range(record.size), "range check failure"
+        fields = record.unpack_from(self.data, self.index)
+        self.index += record.size
+        return fields
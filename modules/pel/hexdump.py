@@ -1,6 +1,15 @@
+import functools
+import itertools
 import math
 import re
 
+# Maps each byte value to the character shown for it in the ASCII column.
+_ASCII_TABLE = bytes(b if 0x20 <= b < 0x7f else ord('.') for b in range(256))
+
+# Characters accepted as hex digits by parse().
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+
 def hexdump(data: memoryview,
             bytes_per_line: int = 16,
             bytes_per_chunk: int = 4) -> list:
@@ -14,38 +23,42 @@ def hexdump(data: memoryview,
     assert 1 <= bytes_per_line <= 256, "bytes_per_line must be within 1-256"
     assert 1 <= bytes_per_chunk <= 256, "bytes_per_chunk must be within 1-256"
 
-    dump = []
+    data = bytes(data)
 
     num_chunks = math.ceil(bytes_per_line / bytes_per_chunk)
 
     # Two char per byte plus the 2 spaces in between each chunk.
     char_per_line = bytes_per_line * 2 + (2 * num_chunks) - 2
 
-    # Iterate one line at a time
-    for i in range(0, len(data), bytes_per_line):
-
-        raw  = ''
-        text = ''
-
-        # Iterate the data for this line.
-        for j, b in enumerate(data[i:i+bytes_per_line]):
-
-            # Add spaces in between each chunk.
-            if 0 != j and 0 == j % bytes_per_chunk:
-                raw += '  '
-
-            # Convert to hex string.
-            raw += ("%02X") % (b)
-
-            # Convert to character.
-            text += chr(b) if 0x20 <= b < 0x7f else '.'
-
-        # Left justify to pad spaces on the right.
-        raw  = raw.ljust(char_per_line)
-        text = text.ljust(bytes_per_line)
-
-        # Append a new line in the output
-        dump.append(("%08X     %s     %s") % (i, raw, text))
+    # Convert all of the data at once. The ASCII column is the data with
+    # unprintable bytes translated to '.', sliced a line at a time.
+    text = data.translate(_ASCII_TABLE).decode('ascii')
+
+    # Full lines. The hex string is split into chunks from the start of each
+    # line, with one space between chunks that is then widened to two.
+    full = len(data) - len(data) % bytes_per_line
+    if bytes_per_line % bytes_per_chunk == 0:
+        # Chunks never span lines, so the whole hex string can be built at
+        # once and sliced, skipping the separator between lines.
+        raw = data[:full].hex(' ', -bytes_per_chunk).upper().replace(' ', '  ')
+        step = char_per_line + 2
+        dump = ['%08X     %s     %s' % (i, raw[j:j + char_per_line],
+                                        text[i:i + bytes_per_line])
+                for i, j in zip(range(0, full, bytes_per_line),
+                                range(0, len(raw), step))]
+    else:
+        dump = ['%08X     %s     %s' % (
+                    i,
+                    data[i:i + bytes_per_line].hex(
+                        ' ', -bytes_per_chunk).upper().replace(' ', '  '),
+                    text[i:i + bytes_per_line])
+                for i in range(0, full, bytes_per_line)]
+
+    # Left justify the last partial line to pad spaces on the right.
+    if full < len(data):
+        raw = data[full:].hex(' ', -bytes_per_chunk).upper().replace(' ', '  ')
+        dump.append('%08X     %s     %s' % (full, raw.ljust(char_per_line),
+                                            text[full:].ljust(bytes_per_line)))
 
     return dump
 
@@ -86,28 +99,67 @@ def parse(lines: list,
     Ignores lines that do not match the specified line format.
     """
 
-    hex_digit = re.compile('^[0-9a-fA-F]$')
-    data = bytearray()
+    # Complete lines are matched with one regular expression compiled from
+    # the line format.  Anything else, such as a short final line, is parsed
+    # one character at a time.
+    line_re = _compile_line_format(line_format)
+    digits = []
     for line in lines:
         line = line.rstrip('\n')
-        prev_byte_is_high_nibble = False
-        # Note: sometimes last line of hexdump is shorter than line format
-        if len(line) <= len(line_format):
-            for i in range(len(line)):
-                if (line_format[i] == 'A'):
-                    if not hex_digit.match(line[i]):
-                        break
-                elif (line_format[i] == 'D'):
-                    if not hex_digit.match(line[i]):
-                        break
-                    if prev_byte_is_high_nibble:
-                        byte_val = bytes.fromhex(line[(i-1):(i+1)])
-                        data.extend(byte_val)
-                        prev_byte_is_high_nibble = False
-                    else:
-                        prev_byte_is_high_nibble = True
-                elif (line_format[i] == 'C'):
-                    continue
-                elif (line_format[i] != line[i]):
-                    break
+        match = line_re.fullmatch(line) if line_re else None
+        if match:
+            digits.extend(match.groups())
+        elif len(line) <= len(line_format):
+            digits.append(_parse_line(line, line_format).hex())
+    return bytearray.fromhex(''.join(digits))
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_line_format(line_format: str):
+    """
+    Returns a regular expression that matches a complete line in the given
+    format, with one group per run of data digits.  Returns None if a run of
+    data digits has an odd length, since each byte must be within one run.
+    """
+    pattern = ''
+    for char, run in itertools.groupby(line_format):
+        count = len(list(run))
+        if char == 'A':
+            pattern += '[0-9a-fA-F]{%d}' % count
+        elif char == 'D':
+            if count % 2:
+                return None
+            pattern += '([0-9a-fA-F]{%d})' % count
+        elif char == 'C':
+            pattern += '.{%d}' % count
+        else:
+            pattern += re.escape(char * count)
+    return re.compile(pattern, re.DOTALL)
+
+
+def _parse_line(line: str, line_format: str) -> bytearray:
+    """
+    Parses one hex dump line a character at a time.  Stops at the first
+    character that doesn't match the format, keeping the bytes before it.
+    """
+    data = bytearray()
+    prev_byte_is_high_nibble = False
+    for i in range(len(line)):
+        if (line_format[i] == 'A'):
+            if line[i] not in _HEX_DIGITS:
+                break
+        elif (line_format[i] == 'D'):
+            if line[i] not in _HEX_DIGITS:
+                break
+            if prev_byte_is_high_nibble:
+                byte_val = bytes.fromhex(line[(i-1):(i+1)])
+                data.extend(byte_val)
+                prev_byte_is_high_nibble = False
+            else:
+                prev_byte_is_high_nibble = True
+        elif (line_format[i] == 'C'):
+            continue
+        elif (line_format[i] != line[i]):
+            break
     return data
+
@@ -1,31 +1,152 @@
 from collections import OrderedDict
+import functools
 import glob
 import json
 import os
 import re
+import struct
 
 import pel.hwdiags.data
+from pel.datastream import DataStream
+from pel.cache import getCacheDir, getFileKey, writeCacheFile
 
 class ParserData:
     """
     The human readable output for registers, addresses, signature descriptions,
     etc. are stored in JSON data files. This class is simply a wrapper to access
     the data files and provide functions for data needed by openpower-hw-diags.
+
+    Each data file holds the data for one model_ec and is only loaded the first
+    time that model_ec is queried. Use the shared `parser_data` instance rather
+    than creating a new one so the loaded data is reused.
     """
 
-    def __init__(self):
+    # Version of the model_ec index file format.
+    INDEX_VERSION = 1
+
+    # Maximum number of results kept for each of the memoized decoders.
+    DECODE_CACHE_SIZE = 4096
+
+    # Register dump chip header: model/EC, chip position, node position and
+    # number of registers.
+    _chip_header = struct.Struct('>IHBI')
+
+    # Register dump register header: register ID and instance, and data size.
+    _reg_header = struct.Struct('>IB')
+
+    def __init__(self, data_path: str = None):
         """
-        Reads and stores all the JSON data files from `pel.hwdiags.data`.
+        Finds the JSON data files in `pel.hwdiags.data`, or in the given
+        directory.
         """
+        if data_path is None:
+            data_path = os.path.dirname(pel.hwdiags.data.__file__)
+
+        self._data_path = data_path
+        self._data_files = sorted(glob.glob(os.path.join(data_path, '*.json')))
+
+        # The loaded data for each model_ec.
         self._data = {}
 
-        data_path = os.path.dirname(pel.hwdiags.data.__file__)
+        # The data file for each model_ec, built on first use.
+        self._model_ec_files = None
+
+        # Memoized decoders, keyed on their raw arguments. Register dumps and
+        # signature lists repeat the same values many times.
+        cache = functools.lru_cache(maxsize=self.DECODE_CACHE_SIZE)
+        self._cached_sig_desc = cache(self._decode_sig_desc)
+        self._cached_signature = cache(self._decode_signature)
+        self._cached_reg_data = cache(self._decode_reg_data)
+        self._cached_reg_lookup = cache(self._lookup_reg)
+
+    def _load_data_file(self, data_file: str) -> dict:
+        """
+        Reads and returns the data in a JSON data file.
+        """
+        with open(data_file, 'r') as fp:
+            return json.load(fp)
+
+    def _get_index_path(self) -> str:
+        """
+        Returns the path of the file that caches the model_ec of each data
+        file, or an empty string if there is no cache directory.
+        """
+        cache_dir = getCacheDir()
+        return os.path.join(cache_dir, 'hwdiags-index.json') if cache_dir \
+            else ''
+
+    def _get_model_ec_files(self) -> dict:
+        """
+        Returns the data file for each model_ec.
+
+        The model_ec of a data file is only known after reading it, so the
+        model_ec of each file is remembered in an index file in the pel
+        package cache directory along with the file size and modification
+        time. Only new or changed files are read to rebuild the index. The
+        index is only an optimization, so a missing, corrupt or unwritable
+        index file is ignored without any message.
+        """
+        if self._model_ec_files is not None:
+            return self._model_ec_files
+
+        index_path = self._get_index_path()
+        context = [self.INDEX_VERSION, os.path.realpath(self._data_path)]
+
+        try:
+            with open(index_path, 'r') as fp:
+                index = json.load(fp)
+            if index["Context"] != context:
+                index = {}
+            else:
+                index = index["Files"]
+        except (OSError, ValueError, TypeError, KeyError):
+            index = {}
+        if not isinstance(index, dict):
+            index = {}
+
+        # If more than one file has the same model_ec, the last one is used.
+        files = {}
+        model_ec_files = {}
+        loaded = {}
+        for data_file in self._data_files:
+            name = os.path.basename(data_file)
+            key = getFileKey(data_file)
+            entry = index.get(name)
+            if not isinstance(entry, list) or entry[:-1] != key:
+                loaded[data_file] = self._load_data_file(data_file)
+                entry = key + [loaded[data_file]["model_ec"]["id"]]
+            files[name] = entry
+            model_ec_files[entry[-1]] = data_file
+
+        # Keep the data of any files read to rebuild the index.
+        for model_ec, data_file in model_ec_files.items():
+            if data_file in loaded:
+                self._data[model_ec] = loaded[data_file]
+
+        if files != index and index_path:
+            data = json.dumps({"Context": context, "Files": files})
+            writeCacheFile(index_path, data.encode())
+
+        self._model_ec_files = model_ec_files
+        return model_ec_files
+
+    def _get_data(self, model_ec: str) -> dict:
+        """
+        Returns the data for the given lowercase model_ec, loading its data
+        file if needed. Returns an empty dictionary if there is no data.
+        """
+        data = self._data.get(model_ec)
+        if data is None:
+            data_file = self._get_model_ec_files().get(model_ec)
+            if data_file is None:
+                return {}
 
-        for data_file in glob.glob(os.path.join(data_path, '*.json')):
-            with open(data_file, 'r') as fp:
-                data = json.load(fp)
+            data = self._data.get(model_ec)
+            if data is None:
+                data = self._load_data_file(data_file)
+                self._data[model_ec] = data
 
-            self._data[data["model_ec"]["id"]] = data
+        return data
 
 
     _re_1byte_hex = re.compile('[0-9A-Fa-f]{2}')
@@ -59,7 +180,7 @@ class ParserData:
         # Check parameters
         self._check_hex(model_ec, 4)
 
-        return True if model_ec in self._data else False
+        return True if self._get_data(model_ec) else False
 
 
     def get_attn_desc(self, model_ec: str, attn_type: int) -> str:
@@ -76,7 +197,7 @@ class ParserData:
 
         # Extract the attention type.
         try:
-            out = self._data[model_ec]["attn_types"][attn_type]
+            out = self._get_data(model_ec)["attn_types"][attn_type]
         except KeyError:
             out = attn_type
 
@@ -97,7 +218,7 @@ class ParserData:
 
         # Extract chip type.
         try:
-            chip_type = self._data[model_ec]["model_ec"]["type"]
+            chip_type = self._get_data(model_ec)["model_ec"]["type"]
         except KeyError:
             chip_type = "unknown"
 
@@ -117,6 +238,13 @@ class ParserData:
         """
         Returns a human readable string description of the given signature info.
         """
+        return self._cached_sig_desc(model_ec, sig_id, sig_inst, sig_bit)
+
+    def _decode_sig_desc(self, model_ec: str, sig_id: str, sig_inst: int,
+                         sig_bit: int) -> str:
+        """
+        Uncached version of get_sig_desc().
+        """
         # Check parameters.
         self._check_hex(model_ec, 4)
         self._check_hex(sig_id,   2)
@@ -128,15 +256,17 @@ class ParserData:
         sig_id  = sig_id.lower()
         sig_bit = str(sig_bit)
 
+        data = self._get_data(model_ec)
+
         # Extract signature name.
         try:
-            sig_name = self._data[model_ec]["signatures"][sig_id][0]
+            sig_name = data["signatures"][sig_id][0]
         except KeyError:
             sig_name = "id:" + sig_id.upper()
 
         # Extract signature description.
         try:
-            sig_desc = self._data[model_ec]["signatures"][sig_id][1][sig_bit]
+            sig_desc = data["signatures"][sig_id][1][sig_bit]
         except KeyError:
             sig_desc = ""
 
@@ -153,6 +283,14 @@ class ParserData:
         parse the information and return data for the chip description,
         signature details, and attention type.
         """
+        # Return a copy so callers can't change the cached result.
+        return OrderedDict(self._cached_signature(word_a, word_b, word_c))
+
+    def _decode_signature(self, word_a: str, word_b: str,
+                          word_c: str) -> OrderedDict:
+        """
+        Uncached version of get_signature().
+        """
         self._check_hex(word_a, 4)
         self._check_hex(word_b, 4)
         self._check_hex(word_c, 4)
@@ -184,29 +322,130 @@ class ParserData:
         """
         Returns the register name and address for the given register data.
         """
+        return self._cached_reg_data(model_ec, reg_id, reg_inst)
+
+    def _decode_reg_data(self, model_ec: str, reg_id: str,
+                         reg_inst: int) -> (str, str):
+        """
+        Uncached version of get_reg_data().
+        """
         # Check parameters.
         self._check_hex(model_ec, 4)
         self._check_hex(reg_id,   3)
         self._check_int(reg_inst, 1)
 
+        reg_name, reg_addr = self._lookup_reg(int(model_ec, base=16),
+                                              int(reg_id, base=16), reg_inst)
+
+        return reg_name, "0x%08X" % reg_addr
+
+    def _lookup_reg(self, model_ec: int, reg_id: int,
+                    reg_inst: int) -> (str, int):
+        """
+        Returns the register name and integer address for the given register
+        data, which must already be in range.
+        """
         # All keys are strings. Hex keys are lowercase.
-        model_ec = model_ec.lower()
-        reg_id   = reg_id.lower()
+        reg_id   = "%06x" % reg_id
         reg_inst = str(reg_inst)
 
+        data = self._get_data("%08x" % model_ec)
+
         # Extract register name.
         try:
-            reg_name = self._data[model_ec]["registers"][reg_id][0]
+            reg_name = data["registers"][reg_id][0]
         except KeyError:
             reg_name = "id:%s inst:%s" % (reg_id.upper(), reg_inst)
 
         # Extract register address.
         try:
-            reg_addr = self._data[model_ec]["registers"][reg_id][1][reg_inst]
+            reg_addr = data["registers"][reg_id][1][reg_inst]
             reg_addr = int(reg_addr, base=16)
         except KeyError:
             reg_addr = 0
 
-        return reg_name, "0x%08X" % reg_addr
+        return reg_name, reg_addr
+
+
+    def get_signature_list(self, data: memoryview) -> list:
+        """
+        Decodes a signature list buffer: a 4 byte signature count followed by
+        12 bytes for each signature. Returns a list with the output of
+        get_signature() for each signature.
+        """
+        stream = DataStream(data, byte_order='big', is_signed=False)
+
+        sig_count = stream.get_int(4)
+
+        out = []
+        for i in range(0, sig_count):
+            words = stream.get_mem(12).hex()
+            out.append(self.get_signature(words[0:8], words[8:16],
+                                          words[16:24]))
+
+        return out
+
+
+    def get_register_dump(self, data: memoryview) -> list:
+        """
+        Decodes a register dump buffer. The buffer contains a 4 byte chip count
+        followed by the following for each chip:
+          4 byte chip model/EC
+          2 byte chip position
+          1 byte node position
+          4 byte number of registers
+          For each register:
+            3 byte register ID
+            1 byte register instance
+            1 byte data size
+            * byte data buffer (* depends on value of data size)
+
+        Returns a list with a (chip description, registers) tuple for each
+        chip, where registers is a list with a (register name, register
+        address, register data) tuple for each register. The register address
+        is an integer and the register data is a memoryview of the data buffer.
+
+        Raises an AssertionError if the buffer is too short, or a register has
+        no data.
+        """
+        data = memoryview(data).cast('B')
+        size = len(data)
+
+        assert 4 <= size, "range check failure"
+        chip_count = int.from_bytes(data[0:4], 'big')
+        offset = 4
+
+        lookup_reg = self._cached_reg_lookup
+        chip_header = self._chip_header
+        reg_header = self._reg_header
+        chips = []
+        for c in range(0, chip_count):
+            assert offset + chip_header.size <= size, "range check failure"
+            model_ec, chip_pos, node_pos, num_regs = \
+                chip_header.unpack_from(data, offset)
+            offset += chip_header.size
+
+            chip_desc = self.get_chip_desc("%08x" % model_ec, node_pos,
+                                           chip_pos)
+
+            regs = []
+            for r in range(0, num_regs):
+                assert offset + reg_header.size <= size, "range check failure"
+                reg_id_inst, data_size = reg_header.unpack_from(data, offset)
+                offset += reg_header.size
+
+                end = offset + data_size
+                assert 0 < data_size and end <= size, "range check failure"
+
+                reg_name, reg_addr = lookup_reg(model_ec, reg_id_inst >> 8,
+                                                reg_id_inst & 0xff)
+                regs.append((reg_name, reg_addr, data[offset:end]))
+                offset = end
+
+            chips.append((chip_desc, regs))
+
+        return chips
 
 
+# The shared ParserData instance.
+parser_data = ParserData()
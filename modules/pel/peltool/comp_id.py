@@ -8,28 +8,46 @@ componentIDs = {}
 pelConfigRootPath = "/usr/share/phosphor-logging/pels"
 attemptedToParseCompIDs = False
 
+componentIDFileSuffix = "_component_ids.json"
+
+def getComponentsConfigPath() -> str:
+    """
+    Returns the directory holding the component ID file of each creator, or
+    an empty string if it can't be found.
+    """
+    if os.path.exists(pelConfigRootPath): # BMC env
+        return pelConfigRootPath
+    try: # Non-BMC env
+        import pel_registry
+        return os.path.dirname(pel_registry.__file__)
+    except ModuleNotFoundError:
+        return ""
+
+def getComponentIDFiles() -> list:
+    """
+    Returns the paths of the component ID files in the components config
+    directory, or an empty list if there is none.
+    """
+    componentsConfigPath = getComponentsConfigPath()
+    if not componentsConfigPath:
+        return []
+    return sorted(os.path.join(componentsConfigPath, file)
+                  for file in os.listdir(componentsConfigPath)
+                  if componentIDFileSuffix in file)
+
 def getAllCreatorsCompIDs():
     global attemptedToParseCompIDs
     if attemptedToParseCompIDs:
         return
 
     attemptedToParseCompIDs = True
-    componentsConfigPath = ""
-    if os.path.exists(pelConfigRootPath): # BMC env
-        componentsConfigPath = pelConfigRootPath
-    else: # Non-BMC env
-        try:
-            import pel_registry
-            componentsConfigPath = os.path.dirname(pel_registry.__file__)
-        except ModuleNotFoundError:
-            print("Failed to find PEL creators components config file", file=sys.stderr)
-            return
-
-    componentIDFileSuffix = "_component_ids.json"
-    for file in os.listdir(componentsConfigPath):
-        if componentIDFileSuffix not in file:
-            continue
-        with open(os.path.join(componentsConfigPath, file), 'r') as fileFd:
+    if not getComponentsConfigPath():
+        print("Failed to find PEL creators components config file", file=sys.stderr)
+        return
+
+    for path in getComponentIDFiles():
+        file = os.path.basename(path)
+        with open(path, 'r') as fileFd:
             creatorID = file[0:file.find(componentIDFileSuffix)]
             componentIDs[creatorID] = json.load(fileFd)
 
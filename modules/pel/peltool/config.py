@@ -5,6 +5,8 @@ class Config:
 
     def __init__(self) -> None:
         self.allow_plugins = True
+        self.use_index = True
+        self.jobs = 1
         self.serviceable = False
         self.non_serviceable = False
         self.every_pel = False
@@ -24,3 +26,6 @@ class Config:
         self.compact = False
         self.recent = None
         self.creator_ids = []
+        self.sections = []
+        self.user_data_cache_size = 0
+        self.output = 'json'
@@ -33,10 +33,10 @@ class ExtendedUserHeader:
         self.symptomID = ""
 
     def toJSON(self) -> OrderedDict:
-        self.machineType = bytes.decode(self.stream.get_mem(8))
-        self.serialNumber = bytes.decode(self.stream.get_mem(12))
-        self.serverFWVersion = bytes.decode(self.stream.get_mem(16))
-        self.subsystemFWVersion = bytes.decode(self.stream.get_mem(16))
+        self.machineType = bytes(self.stream.get_mem(8)).decode()
+        self.serialNumber = bytes(self.stream.get_mem(12)).decode()
+        self.serverFWVersion = bytes(self.stream.get_mem(16)).decode()
+        self.subsystemFWVersion = bytes(self.stream.get_mem(16)).decode()
         self.reserved4B = self.stream.get_int(4)
         self.refTime = getTimestamp(self.stream)
         self.reserved1B1 = self.stream.get_int(1)
@@ -44,8 +44,8 @@ class ExtendedUserHeader:
         self.reserved1B3 = self.stream.get_int(1)
         self.symptomIDSize = self.stream.get_int(1)
         if self.symptomIDSize != 0:
-            self.symptomID = bytes.decode(
-                self.stream.get_mem(self.symptomIDSize))
+            self.symptomID = bytes(
+                self.stream.get_mem(self.symptomIDSize)).decode()
         else:
             self.symptomID = ''
 
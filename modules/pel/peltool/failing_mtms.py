@@ -25,8 +25,8 @@ class FailingMTMS:
         self.serialNumber = ""
 
     def toJSON(self) -> OrderedDict:
-        self.machineType = bytes.decode(self.stream.get_mem(8))
-        self.serialNumber = bytes.decode(self.stream.get_mem(12))
+        self.machineType = bytes(self.stream.get_mem(8)).decode()
+        self.serialNumber = bytes(self.stream.get_mem(12)).decode()
 
         out = OrderedDict()
         out["Section Version"] = self.versionID
@@ -0,0 +1,255 @@
+"""
+Watches a PEL directory for newly committed PELs.
+
+inotify is used where it's available, through ctypes so no extra package is
+needed, and the process sleeps until the kernel reports a file was written.
+Elsewhere, or if inotify can't be set up, the directory is polled with
+os.scandir() and the size and modification time of each file compared.
+
+A file is only reported once it holds a complete PEL, found by walking its
+section headers, so a PEL that is still being written is picked up when the
+write finishes rather than parsed half written.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from pel.peltool.pel_file import openPELFile
+from pel.peltool.pel_headers import PEL_MAGIC, TruncatedPELError, \
+    readSectionTable
+
+# inotify event masks, from <sys/inotify.h>.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Watch descriptor, mask, cookie and name length at the start of each
+# inotify event.  The name, padded with NULs, follows.
+_inotifyEvent = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """
+    Reports the files written to, moved into or removed from a directory,
+    using inotify.
+    Raises OSError if inotify isn't available.
+    """
+
+    def __init__(self, path: str):
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            init = libc.inotify_init1
+            addWatch = libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {e}")
+
+        self.path = path
+        self.fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | \
+            IN_DELETE_SELF | IN_MOVE_SELF
+        if addWatch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), path)
+
+    def read(self, timeout: float = None) -> list:
+        """
+        Waits up to timeout seconds, or forever if timeout is None, for
+        files in the directory to change.
+        Returns: names of the changed files, empty if the timeout expired.
+        Raises FileNotFoundError if the directory was removed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _inotifyEvent.unpack_from(data, offset)
+            offset += _inotifyEvent.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                raise FileNotFoundError(f"{self.path} was removed")
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so any file may have changed.
+                names.extend(os.listdir(self.path))
+            elif name:
+                names.append(name)
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Reports the files created, changed or removed in a directory by
+    comparing the size and modification time of each file every interval
+    seconds.
+    """
+
+    def __init__(self, path: str, interval: float = 0.5):
+        self.path = path
+        self.interval = interval
+        self.files = self._scan()
+
+    def _scan(self) -> dict:
+        """
+        Returns: size and modification time of each file in the directory.
+        """
+        files = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    # Removed since the directory was read.
+                    continue
+        return files
+
+    def read(self, timeout: float = None) -> list:
+        """
+        Polls the directory until a file changes, or until timeout seconds
+        have passed if timeout isn't None.
+        Returns: names of the changed files, empty if the timeout expired.
+        Raises FileNotFoundError if the directory was removed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, max(0, deadline - time.monotonic()))
+            time.sleep(wait)
+
+            files = self._scan()
+            names = [name for name, stat in files.items()
+                     if self.files.get(name) != stat]
+            names.extend(name for name in self.files if name not in files)
+            self.files = files
+            if names or (deadline is not None and
+                         time.monotonic() >= deadline):
+                return names
+
+    def close(self) -> None:
+        pass
+
+
+def openWatcher(path: str, interval: float = 0.5):
+    """
+    Returns: an InotifyWatcher for the directory, or a PollingWatcher if
+    inotify isn't available.
+    """
+    try:
+        return InotifyWatcher(path)
+    except OSError:
+        return PollingWatcher(path, interval)
+
+
+def isCompletePEL(file: str) -> bool:
+    """
+    Returns: True if the file holds a complete PEL, or anything that isn't a
+    valid PEL, which can't become one, such as a PEL with a corrupt section
+    header.  False if the file ends before the sections its headers declare,
+    so it's still being written, or the file no longer exists.
+    """
+    try:
+        with openPELFile(file) as data:
+            if len(data) < len(PEL_MAGIC):
+                return False
+            if data[:len(PEL_MAGIC)] != PEL_MAGIC:
+                return True
+            try:
+                readSectionTable(data)
+            except TruncatedPELError:
+                return False
+            except ValueError:
+                # Reported by the parser once the file is displayed.
+                return True
+            return True
+    except FileNotFoundError:
+        return False
+
+
+def _matchExtension(name: str, extension: str) -> bool:
+    return not extension or extension == os.path.splitext(name)[1]
+
+
+def _followPELFiles(path: str, extension: str, interval: float, watcher,
+                    seen: set, pending: set):
+    """
+    Generator over the new PEL files in a directory, see followPELFiles().
+    Yields: path of each new file.
+    """
+    try:
+        while True:
+            for name in sorted(pending):
+                file = os.path.join(path, name)
+                if not isCompletePEL(file):
+                    if not os.path.isfile(file):
+                        pending.discard(name)
+                    continue
+                pending.discard(name)
+                seen.add(name)
+                yield file
+
+            try:
+                names = watcher.read(interval if pending else None)
+            except FileNotFoundError:
+                return
+
+            for name in names:
+                if not os.path.isfile(os.path.join(path, name)):
+                    seen.discard(name)
+                    pending.discard(name)
+                elif name not in seen and _matchExtension(name, extension):
+                    pending.add(name)
+    finally:
+        watcher.close()
+
+
+def followPELFiles(path: str, extension: str = None, interval: float = 0.5,
+                   watcher=None):
+    """
+    Starts watching a directory for PEL files created from now on.  Files
+    already in the directory are skipped, as are files that don't have the
+    extension, if one is given.  Each file is reported once, unless it's
+    removed and created again.  Files that are still being written are
+    checked again each time the directory changes and, for the polling
+    watcher, every interval seconds.
+    Returns: generator over the paths of the new files, in the order they're
+    completed, which ends when the directory is removed.
+    """
+    seen = set(os.listdir(path))
+    if watcher is None:
+        watcher = openWatcher(path, interval)
+
+    # A file created while the watcher was being set up may not be reported
+    # by it, so the directory is read again once it's watched.
+    pending = {name for name in os.listdir(path)
+               if name not in seen and _matchExtension(name, extension)}
+    return _followPELFiles(path, extension, interval, watcher, seen, pending)
@@ -31,8 +31,8 @@ class ImpactedPartition:
         self.logicalPartLogID = self.stream.get_int(4)
 
         if self.lpNameLength:
-            self.lpName = bytes.decode(
-                self.stream.get_mem(self.lpNameLength)).rstrip('\x00')
+            self.lpName = bytes(
+                self.stream.get_mem(self.lpNameLength)).decode().rstrip('\x00')
 
         if self.targetLPcount:
             for _ in range(self.targetLPcount):
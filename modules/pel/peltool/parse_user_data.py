@@ -1,7 +1,9 @@
 from pel.peltool.pel_values import creatorIDs
 from pel.peltool.config import Config
 from pel.hexdump import hexdump
+from collections import OrderedDict
 from enum import Enum, unique
+import hashlib
 import json
 import importlib
 
@@ -19,6 +21,62 @@ def get_value(data: memoryview, start: int, end: int) -> int:
     return int.from_bytes(data[start: start + end], byteorder="big")
 
 
+class ParseCache:
+    """
+    A bounded cache of user data parse results.  Many PELs carry identical
+    user data, so the result is looked up by the creator ID, component ID,
+    sub-type, version and a digest of the data instead of parsing it again.
+    When the cache is full the least recently used result is dropped.
+
+    The hits and misses counters count the lookups since the cache was
+    cleared.
+    """
+
+    def __init__(self):
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def getKey(self, parser: 'ParseUserData', config: Config) -> tuple:
+        """
+        Returns the key for the result of the parser with config.
+        """
+        digest = hashlib.blake2b(parser.data, digest_size=16).digest()
+        return (parser.creatorID, parser.compID, parser.subType,
+                parser.version, config.allow_plugins, digest)
+
+    def get(self, key: tuple) -> str:
+        """
+        Returns the cached result for key, or None if there isn't one.
+        """
+        value = self.results.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: str, maxSize: int) -> None:
+        """
+        Adds the result for key, dropping the least recently used results to
+        keep at most maxSize.
+        """
+        self.results[key] = value
+        while len(self.results) > maxSize:
+            self.results.popitem(last=False)
+
+    def clear(self) -> None:
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every ParseUserData in the process.  Only used if
+# config.user_data_cache_size is set.
+parseCache = ParseCache()
+
+
 class ParseUserData:
     """
     The toJSON() function handles parsing the data from either UserData or
@@ -34,6 +92,18 @@ class ParseUserData:
         self.data = data
 
     def parse(self, config: Config) -> str:
+        if not config.user_data_cache_size:
+            return self.parseData(config)
+
+        key = parseCache.getKey(self, config)
+        value = parseCache.get(key)
+        if value is None:
+            value = self.parseData(config)
+            if value is not None:
+                parseCache.put(key, value, config.user_data_cache_size)
+        return value
+
+    def parseData(self, config: Config) -> str:
         if self.creatorID in creatorIDs and creatorIDs[self.creatorID] == "BMC" \
                 and self.compID == 0x2000:
             value = self.getBuiltinFormatJSON()
@@ -97,7 +167,7 @@ class ParseUserData:
 
     def getBuiltinFormatJSON(self) -> str:
         if self.subType == UserDataFormat.json.value:
-            string = bytes.decode(self.data).strip().rstrip('\x00')
+            string = bytes(self.data).decode().strip().rstrip('\x00')
             return string
         elif self.subType == UserDataFormat.cbor.value:
             # TODO, support CBOR (binary JSON)
@@ -113,7 +183,7 @@ class ParseUserData:
         elif self.subType == UserDataFormat.text.value:
             lines = []
             line = ''
-            for ch in bytes.decode(self.data).strip().rstrip('\x00'):
+            for ch in bytes(self.data).decode().strip().rstrip('\x00'):
                 if ch != '\n':
                     if ord(ch) < ord(' ') or ord(ch) > ord('~'):
                         ch = '.'
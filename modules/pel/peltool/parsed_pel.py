@@ -0,0 +1,130 @@
+import json
+from collections import OrderedDict
+
+
+class Section:
+    """
+    A parsed PEL section: the section object, such as a PrivateHeader, SRC
+    or UserData, and its data as shown in peltool's JSON output.
+    """
+
+    def __init__(self, name: str, section, data: OrderedDict):
+        self.name = name
+        self.section = section
+        self.data = data
+
+    @property
+    def sectionID(self) -> int:
+        return self.section.sectionID
+
+    @property
+    def sectionLen(self) -> int:
+        return self.section.sectionLen
+
+    @property
+    def versionID(self) -> int:
+        return self.section.versionID
+
+    @property
+    def subType(self) -> int:
+        return self.section.subType
+
+    @property
+    def componentID(self) -> int:
+        return self.section.componentID
+
+
+class PEL:
+    """
+    A parsed PEL, returned by pel.parse().
+
+    The sections are available as Section objects in the order they appear
+    in the PEL, starting with the Private Header and User Header.  The JSON
+    text peltool displays for the PEL is only rendered if toJSON() is
+    called, so code that just reads fields doesn't pay for it.
+    """
+
+    def __init__(self, sections: list, data: OrderedDict):
+        self.sections = sections
+        self.data = data
+        self._json = None
+
+    @property
+    def privateHeader(self) -> 'PrivateHeader':
+        return self.sections[0].section
+
+    @property
+    def userHeader(self) -> 'UserHeader':
+        return self.sections[1].section
+
+    @property
+    def eid(self) -> str:
+        """
+        The Entry ID, as 8 hex digits.
+        """
+        lEID = self.privateHeader.lEID
+        return lEID[2:] if lEID[0:2] == "0x" else lEID
+
+    @property
+    def referenceCode(self) -> str:
+        """
+        The Primary SRC reference code, or an empty string if there is no
+        Primary SRC.
+        """
+        return self.data.get("Primary SRC", {}).get("Reference Code", "")
+
+    def toDict(self) -> OrderedDict:
+        """
+        Returns the PEL data as an OrderedDict of section names to section
+        data, the same data peltool displays as JSON.
+        """
+        return self.data
+
+    def toJSON(self) -> str:
+        """
+        Returns the PEL as the JSON string peltool displays.  The string is
+        rendered the first time it's asked for.
+        """
+        if self._json is None:
+            from pel.peltool.peltool import prettyPrint
+            self._json = prettyPrint(json.dumps(self.data, indent=4))
+        return self._json
+
+
+def _getConfig(config: 'Config') -> 'Config':
+    """
+    Returns the config to parse with: config, or one that parses every PEL.
+    """
+    from pel.peltool.config import Config
+
+    if config is None:
+        config = Config()
+        config.every_pel = True
+    return config
+
+
+def parse(data: memoryview, config: 'Config' = None) -> PEL:
+    """
+    Parses the PEL at the beginning of data, see pel.parse().
+    Returns: PEL, or None if no PEL is parsed.
+    """
+    from pel.datastream import DataStream
+    from pel.peltool.peltool import parsePELObject
+
+    stream = DataStream(data, byte_order='big', is_signed=False)
+    return parsePELObject(stream, _getConfig(config), False)
+
+
+def parseSections(data: memoryview, names: list,
+                  config: 'Config' = None) -> list:
+    """
+    Parses only the named sections of the PEL at the beginning of data, see
+    pel.parseSections().
+    Returns: list of Section, or None if no PEL is parsed.
+    """
+    from pel.datastream import DataStream
+    from pel.peltool.peltool import parsePELSections
+
+    stream = DataStream(data, byte_order='big', is_signed=False)
+    _, sections = parsePELSections(stream, _getConfig(config), names, False)
+    return sections
@@ -0,0 +1,40 @@
+import contextlib
+import mmap
+
+
+@contextlib.contextmanager
+def openPELFile(path: str):
+    """
+    Context manager that opens a PEL file and yields its contents as a
+    read-only memoryview.
+
+    The file is memory mapped, so only the pages that are parsed are read
+    from disk and the data isn't copied into a new bytes object.  Commands
+    that only filter on the Private Header and User Header touch just the
+    first page of each PEL.  Files that cannot be mapped, such as empty
+    files or files on file systems without mmap support, are read instead.
+
+    The memoryview, and any slices of it, should not be used after the
+    context exits.
+    """
+    with open(path, 'rb') as fd:
+        try:
+            mapping = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapping = None
+        if mapping is None:
+            yield memoryview(fd.read())
+            return
+
+    view = memoryview(mapping)
+    try:
+        yield view
+    finally:
+        view.release()
+        try:
+            mapping.close()
+        except BufferError:
+            # A slice of the view is still referenced, for example by a
+            # section object that was returned.  The mapping is closed when
+            # it is garbage collected.
+            pass
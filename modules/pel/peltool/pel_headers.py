@@ -0,0 +1,186 @@
+import struct
+import sys
+from collections import namedtuple
+from pel.peltool.pel_types import SectionID
+from pel.peltool.pel_values import sectionNames
+from pel.peltool.user_header import UserHeader
+
+# Section header followed by the Private Header fields.  The timestamps,
+# creator version and reserved bytes are skipped.
+PRIVATE_HEADER = struct.Struct('>HHBBH16xcxxBI8xII')
+
+# Section header followed by the User Header fields.
+USER_HEADER = struct.Struct('>HHBBHBBBB4xBBHI')
+
+# The section header at the start of every section: section ID, section
+# length, version, sub-type and component ID.
+SECTION_HEADER = struct.Struct('>HHBBH')
+
+# Offset of the section count in the Private Header, from the start of the
+# section header.
+SECTION_COUNT_OFFSET = 27
+
+# Section IDs as integers, looked up once rather than on every PEL.
+_privateHeaderID = SectionID.privateHeader.value
+_userHeaderID = SectionID.userHeader.value
+
+# The first 2 bytes of a PEL, the Private Header section ID.
+PEL_MAGIC = _privateHeaderID.to_bytes(2, 'big')
+
+# Where a section is in a PEL, from its section header.  The index is the
+# position of the section in the PEL, starting with 0 for the Private
+# Header, and the offset is where its section header starts in the data.
+SectionEntry = namedtuple('SectionEntry', ['name', 'index', 'offset',
+                                           'sectionID', 'sectionLen',
+                                           'versionID', 'subType',
+                                           'componentID'])
+
+
+class TruncatedPELError(ValueError):
+    """
+    Raised when the data ends before the sections a PEL's headers declare.
+    """
+
+
+def getSectionName(sectionID: int) -> str:
+    id = chr((sectionID >> 8) & 0xFF) + chr(sectionID & 0xFF)
+    return sectionNames.get(id, 'Unknown')
+
+
+def numberSectionNames(names: list) -> list:
+    """
+    Returns the section names with a ' <count>' added to the names that
+    appear more than once, eg 'User Data 0', 'User Data 1', as peltool
+    displays them.
+    """
+    counts = {}
+    for name in names:
+        counts[name] = counts.get(name, 0) + 1
+
+    numbered = []
+    modifiers = {}
+    for name in names:
+        if counts[name] != 1:
+            modifier = modifiers.get(name, 0)
+            modifiers[name] = modifier + 1
+            name = name + ' ' + str(modifier)
+        numbered.append(name)
+    return numbered
+
+
+class PELHeaders:
+    """
+    The raw Private Header and User Header fields used to decide whether a
+    PEL should be displayed.  Provides the same attributes considerPEL()
+    reads from the PrivateHeader and UserHeader classes, so one object can
+    be passed as both.
+
+    Nothing is formatted for display, that is left to PrivateHeader.toJSON()
+    and UserHeader.toJSON() once a PEL has been selected.
+    """
+
+    isHidden = UserHeader.isHidden
+    isServiceable = UserHeader.isServiceable
+
+    def __init__(self, creatorID: str = "", sectionCount: int = 0,
+                 obmcLogID: int = 0, pLID: int = 0, lEID: int = 0,
+                 eventSubsystem: int = 0, eventSeverity: int = 0,
+                 actionFlags: int = 0):
+        self.creatorID = creatorID
+        self.sectionCount = sectionCount
+        self.obmcLogID = obmcLogID
+        self.pLID = pLID
+        self.lEID = lEID
+        self.eventSubsystem = eventSubsystem
+        self.eventSeverity = eventSeverity
+        self.actionFlags = actionFlags
+
+
+def readHeaders(data: memoryview, offset: int = 0) -> PELHeaders:
+    """
+    Decodes the Private Header and User Header of the PEL at offset in data
+    with a single fixed-offset unpack of each section.
+    Returns: PELHeaders, or None if either section ID is wrong or data is
+    too short to hold both sections.
+    """
+    size = len(data) - offset
+    if size < PRIVATE_HEADER.size:
+        print("Failed to parse Private Header, only %d bytes" % max(size, 0),
+              file=sys.stderr)
+        return None
+
+    (sectionID, _, _, _, _, creatorID, sectionCount, obmcLogID,
+     pLID, lEID) = PRIVATE_HEADER.unpack_from(data, offset)
+    if sectionID != _privateHeaderID:
+        print("Failed to parse Private Header, section ID = %x" % (sectionID), file=sys.stderr)
+        return None
+
+    if size < PRIVATE_HEADER.size + USER_HEADER.size:
+        print("Failed to parse User Header, only %d bytes" %
+              (size - PRIVATE_HEADER.size), file=sys.stderr)
+        return None
+
+    (sectionID, _, _, _, _, eventSubsystem, _, eventSeverity, _, _, _,
+     actionFlags, _) = USER_HEADER.unpack_from(data, offset + PRIVATE_HEADER.size)
+    if sectionID != _userHeaderID:
+        print("Failed to parse User Header, section ID = %d" % (sectionID), file=sys.stderr)
+        return None
+
+    return PELHeaders(bytes.decode(creatorID), sectionCount, obmcLogID,
+                      pLID, lEID, eventSubsystem, eventSeverity, actionFlags)
+
+
+def readSectionHeaders(data: memoryview, offset: int = 0) -> list:
+    """
+    Walks the section headers of the PEL at offset in data, using the
+    section count in the Private Header and the length in each section
+    header.  No section is parsed or named.
+    Returns: a tuple of the offset, section ID, section length, version,
+    sub-type and component ID of each section.
+    Raises TruncatedPELError if the PEL doesn't fit in data, or ValueError if
+    there isn't a Private Header at offset or a section header is invalid.
+    """
+    if offset + SECTION_COUNT_OFFSET >= len(data):
+        raise TruncatedPELError(f"Truncated PEL at offset {offset}")
+
+    sectionID = SECTION_HEADER.unpack_from(data, offset)[0]
+    if sectionID != _privateHeaderID:
+        raise ValueError(f"No Private Header at offset {offset}")
+
+    sectionCount = data[offset + SECTION_COUNT_OFFSET]
+    if sectionCount == 0:
+        raise ValueError(f"No sections in PEL at offset {offset}")
+
+    headers = []
+    pos = offset
+    for _ in range(sectionCount):
+        if pos + SECTION_HEADER.size > len(data):
+            raise TruncatedPELError(f"Truncated PEL at offset {offset}")
+        header = SECTION_HEADER.unpack_from(data, pos)
+        if header[1] < SECTION_HEADER.size:
+            raise ValueError(f"Bad section length {header[1]} at "
+                             f"offset {pos}")
+        headers.append((pos,) + header)
+        pos += header[1]
+
+    if pos > len(data):
+        raise TruncatedPELError(f"Truncated PEL at offset {offset}")
+    return headers
+
+
+def readSectionTable(data: memoryview, offset: int = 0) -> list:
+    """
+    Finds the sections of the PEL at offset in data from its section
+    headers, see readSectionHeaders().
+    Returns: a SectionEntry for each section, named as peltool displays it.
+    Raises TruncatedPELError if the PEL doesn't fit in data, or ValueError if
+    there isn't a Private Header at offset or a section header is invalid.
+    """
+    headers = readSectionHeaders(data, offset)
+
+    # The Private Header and User Header are never numbered.
+    names = [getSectionName(header[1]) for header in headers]
+    names[2:] = numberSectionNames(names[2:])
+
+    return [SectionEntry(name, index, *header)
+            for index, (name, header) in enumerate(zip(names, headers))]
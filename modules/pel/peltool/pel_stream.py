@@ -0,0 +1,185 @@
+"""
+Splits a stream of back-to-back PELs into individual PELs.
+
+Collectors often ship many PELs as one concatenated blob, or as a tar
+archive of PEL files, instead of one file per PEL.  A PEL doesn't store its
+total length, but the Private Header holds the number of sections and every
+section header holds the section length, so the end of each PEL is found by
+walking its section headers.
+"""
+
+import sys
+import tarfile
+
+from pel.peltool.pel_file import openPELFile
+from pel.peltool.pel_headers import PEL_MAGIC, SECTION_COUNT_OFFSET, \
+    SECTION_HEADER, readSectionTable
+
+
+def getPELLength(data: memoryview, offset: int = 0) -> int:
+    """
+    Returns the length of the PEL at offset in data, found by walking its
+    section headers.
+    Raises ValueError if there isn't a Private Header at offset or the PEL
+    doesn't fit in data.
+    """
+    last = readSectionTable(data, offset)[-1]
+    return last.offset + last.sectionLen - offset
+
+
+def iterPELs(data: memoryview):
+    """
+    Generator over the PELs in a buffer of back-to-back PELs.  Nothing is
+    copied, each PEL is a slice of data.
+    Yields: offset and data of each PEL.
+    Raises ValueError, after yielding the PELs before it, if a PEL is
+    truncated or the data following a PEL isn't a PEL.
+    """
+    data = memoryview(data)
+    offset = 0
+    while offset < len(data):
+        length = getPELLength(data, offset)
+        yield offset, data[offset:offset + length]
+        offset += length
+
+
+def _readExactly(fd, size: int) -> bytes:
+    """
+    Reads size bytes from a file object, which may return less than asked
+    for, such as a pipe.  Returns fewer bytes only at the end of the file.
+    """
+    data = fd.read(size)
+    while data and len(data) < size:
+        more = fd.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+def _readSection(fd, header: bytes, offset: int) -> bytes:
+    """
+    Reads the rest of the section whose header, and possibly more of the
+    section, has been read from a file object.
+    Returns: the whole section.
+    """
+    if len(header) < SECTION_HEADER.size:
+        raise ValueError(f"Truncated PEL at offset {offset}")
+    sectionLen = SECTION_HEADER.unpack_from(header)[1]
+    if sectionLen < len(header):
+        raise ValueError(f"Bad section length {sectionLen} in PEL at "
+                         f"offset {offset}")
+    section = header + _readExactly(fd, sectionLen - len(header))
+    if len(section) < sectionLen:
+        raise ValueError(f"Truncated PEL at offset {offset}")
+    return section
+
+
+def _readConcatenatedPELs(fd, name: str, prefix: bytes = b''):
+    """
+    Generator over the PELs read one section at a time from a file object
+    of back-to-back PELs, so only one PEL is held in memory.  Any bytes
+    already read from the file object are passed in prefix.
+    Yields: name and data of each PEL.
+    """
+    offset = 0
+    while True:
+        header = prefix + _readExactly(fd, SECTION_COUNT_OFFSET + 1 -
+                                       len(prefix))
+        prefix = b''
+        if not header:
+            return
+        if header[:len(PEL_MAGIC)] != PEL_MAGIC:
+            raise ValueError(f"No Private Header at offset {offset}")
+
+        sections = [_readSection(fd, header, offset)]
+        for _ in range(1, header[SECTION_COUNT_OFFSET]):
+            sections.append(_readSection(
+                fd, _readExactly(fd, SECTION_HEADER.size), offset))
+
+        pel = b''.join(sections)
+        yield f"{name} at offset {offset}", memoryview(pel)
+        offset += len(pel)
+
+
+class _PrefixedReader:
+    """
+    File object that returns bytes already read from another file object
+    before reading the rest of it.
+    """
+
+    def __init__(self, prefix: bytes, fd):
+        self.prefix = prefix
+        self.fd = fd
+
+    def read(self, size: int = -1) -> bytes:
+        if not self.prefix:
+            return self.fd.read(size)
+        if size < 0:
+            data = self.prefix + self.fd.read()
+        elif size <= len(self.prefix):
+            data = self.prefix[:size]
+        else:
+            data = self.prefix + _readExactly(self.fd, size - len(self.prefix))
+        self.prefix = self.prefix[len(data):]
+        return data
+
+
+def readPELs(fd, name: str = '<stream>'):
+    """
+    Generator over the PELs read from a file object, such as a pipe, with
+    either back-to-back PELs or a tar archive, optionally compressed, of
+    files each holding one or more back-to-back PELs.  The stream is read
+    sequentially, one PEL at a time, so memory use doesn't grow with the
+    size of the stream.
+    Yields: name and data of each PEL.  The data is only valid until the
+    next PEL is read.
+    Raises ValueError if the stream is corrupt.
+    """
+    prefix = _readExactly(fd, len(PEL_MAGIC))
+    if not prefix:
+        return
+    if prefix == PEL_MAGIC:
+        yield from _readConcatenatedPELs(fd, name, prefix)
+        return
+
+    try:
+        with tarfile.open(fileobj=_PrefixedReader(prefix, fd),
+                          mode='r|*') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Each file starts on a PEL boundary, so a corrupt file
+                # doesn't stop the rest of the archive being read.
+                memberName = f"{name}:{member.name}"
+                try:
+                    yield from _readConcatenatedPELs(tar.extractfile(member),
+                                                     memberName)
+                except ValueError as e:
+                    print(f"Could not read PELs from {memberName}: {e}",
+                          file=sys.stderr)
+    except tarfile.TarError as e:
+        raise ValueError(f"Not a PEL stream or tar archive: {e}")
+
+
+def openPELStream(path: str):
+    """
+    Generator over the PELs in a file of back-to-back PELs or a tar archive
+    of PEL files.  A path of '-' reads from standard input.  A file of
+    back-to-back PELs is memory mapped and split without copying.
+    Yields: name and data of each PEL.  The data is only valid until the
+    next PEL is read.
+    Raises ValueError if the stream is corrupt.
+    """
+    if path == '-':
+        yield from readPELs(sys.stdin.buffer, '<stdin>')
+        return
+
+    with openPELFile(path) as data:
+        if data[:len(PEL_MAGIC)] == PEL_MAGIC:
+            for offset, pel in iterPELs(data):
+                yield f"{path} at offset {offset}", pel
+            return
+
+    with open(path, 'rb') as fd:
+        yield from readPELs(fd, path)
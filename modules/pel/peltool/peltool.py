@@ -5,35 +5,28 @@ import sys
 import os
 import json
 import argparse
+import atexit
+import functools
 import syslog
 from pel.datastream import DataStream
 from collections import OrderedDict
 from pel.peltool.private_header import PrivateHeader
 from pel.peltool.user_header import UserHeader
-from pel.peltool.src import SRC
 from pel.peltool.pel_types import SectionID, SeverityValues
-from pel.peltool.extend_user_header import ExtendedUserHeader
-from pel.peltool.failing_mtms import FailingMTMS
-from pel.peltool.user_data import UserData
-from pel.peltool.ext_user_data import ExtUserData
-from pel.peltool.default import Default
-from pel.peltool.imp_partition import ImpactedPartition
-from pel.peltool.pel_values import sectionNames, severityGroupValues
+from pel.peltool.pel_values import severityGroupValues
 from pel.peltool.config import Config
-from pel.hexdump import hexdump
-
-
-def getSectionName(sectionID: int) -> str:
-    id = chr((sectionID >> 8) & 0xFF) + chr(sectionID & 0xFF)
-    return sectionNames.get(id, 'Unknown')
+from pel.peltool.comp_id import getAllCreatorsCompIDs
+from pel.cache import getFileKey
+from pel.peltool.pel_headers import SECTION_HEADER, PELHeaders, \
+    SectionEntry, getSectionName, numberSectionNames, readHeaders, \
+    readSectionTable
+from pel.peltool.pel_file import openPELFile
+from pel.peltool.parsed_pel import PEL, Section
 
 
 def parseHeader(stream: DataStream):
-    sectionID = stream.get_int(2)
-    sectionLen = stream.get_int(2)
-    versionID = stream.get_int(1)
-    subType = stream.get_int(1)
-    componentID = stream.get_int(2)
+    sectionID, sectionLen, versionID, subType, componentID = \
+        stream.unpack_record(SECTION_HEADER)
     return sectionID, sectionLen, versionID, subType, componentID
 
 
@@ -63,9 +56,13 @@ def generateUH(stream: DataStream, creatorID: str, out: OrderedDict) -> (bool, U
     return True, uh
 
 
+# The section classes, and the message registry and plugins they load, are
+# only imported when a section of that type is parsed, so commands that never
+# get that far start quickly.
 def generateSRC(stream: DataStream, out: OrderedDict,
                 sectionID: int, sectionLen: int, versionID: int, subType: int,
-                componentID: int, creatorID: str, config: Config) -> (bool, SRC):
+                componentID: int, creatorID: str, config: Config) -> (bool, 'SRC'):
+    from pel.peltool.src import SRC
     src = SRC(stream, sectionID, sectionLen,
               versionID, subType, componentID, creatorID)
     out[getSectionName(sectionID)] = src.toJSON(config)
@@ -74,7 +71,8 @@ def generateSRC(stream: DataStream, out: OrderedDict,
 
 def generateEH(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
-               componentID: int, creatorID: str) -> (bool, ExtendedUserHeader):
+               componentID: int, creatorID: str) -> (bool, 'ExtendedUserHeader'):
+    from pel.peltool.extend_user_header import ExtendedUserHeader
     eh = ExtendedUserHeader(stream, sectionID, sectionLen,
                             versionID, subType, componentID, creatorID)
     out[getSectionName(sectionID)] = eh.toJSON()
@@ -83,7 +81,8 @@ def generateEH(stream: DataStream, out: OrderedDict, sectionID: int,
 
 def generateMT(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
-               componentID: int, creatorID: str) -> (bool, FailingMTMS):
+               componentID: int, creatorID: str) -> (bool, 'FailingMTMS'):
+    from pel.peltool.failing_mtms import FailingMTMS
     mt = FailingMTMS(stream, sectionID, sectionLen,
                      versionID, subType, componentID, creatorID)
     out[getSectionName(sectionID)] = mt.toJSON()
@@ -92,7 +91,8 @@ def generateMT(stream: DataStream, out: OrderedDict, sectionID: int,
 
 def generateED(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
-               componentID: int, config: Config) -> (bool, ExtUserData):
+               componentID: int, config: Config) -> (bool, 'ExtUserData'):
+    from pel.peltool.ext_user_data import ExtUserData
     ed = ExtUserData(stream, sectionID, sectionLen,
                      versionID, subType, componentID)
     out[getSectionName(sectionID)] = ed.toJSON(config)
@@ -102,7 +102,8 @@ def generateED(stream: DataStream, out: OrderedDict, sectionID: int,
 def generateUD(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
                componentID: int, creatorID: str,
-               config: Config) -> (bool, UserData):
+               config: Config) -> (bool, 'UserData'):
+    from pel.peltool.user_data import UserData
     ud = UserData(stream, sectionID, sectionLen, versionID,
                   subType, componentID, creatorID)
 
@@ -112,7 +113,8 @@ def generateUD(stream: DataStream, out: OrderedDict, sectionID: int,
 
 def generateIP(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
-               componentID: int, creatorID: str) -> (bool, ExtUserData):
+               componentID: int, creatorID: str) -> (bool, 'ImpactedPartition'):
+    from pel.peltool.imp_partition import ImpactedPartition
     ip = ImpactedPartition(stream, sectionID, sectionLen,
                            versionID, subType, componentID,
                            creatorID)
@@ -122,7 +124,8 @@ def generateIP(stream: DataStream, out: OrderedDict, sectionID: int,
 
 def generateDefault(stream: DataStream, out: OrderedDict, sectionID: int,
                     sectionLen: int, versionID: int, subType: int,
-                    componentID: int) -> (bool, ExtUserData):
+                    componentID: int) -> (bool, 'Default'):
+    from pel.peltool.default import Default
     ed = Default(stream, sectionID, sectionLen,
                  versionID, subType, componentID)
     out[getSectionName(sectionID)] = ed.toJSON()
@@ -132,66 +135,63 @@ def generateDefault(stream: DataStream, out: OrderedDict, sectionID: int,
 def sectionFun(stream: DataStream, out: OrderedDict, sectionID: int,
                sectionLen: int, versionID: int, subType: int,
                componentID: int, creatorID: str, config: Config):
+    """
+    Parses a section into out using the class for its section ID.
+    Returns: success and the section object.
+    """
     if sectionID == SectionID.primarySRC.value or \
             sectionID == SectionID.secondarySRC.value:
-        generateSRC(stream, out, sectionID, sectionLen,
-                    versionID, subType, componentID, creatorID, config)
+        return generateSRC(stream, out, sectionID, sectionLen,
+                           versionID, subType, componentID, creatorID, config)
     elif sectionID == SectionID.extendedUserHeader.value:
-        generateEH(stream, out, sectionID, sectionLen,
-                   versionID, subType, componentID, creatorID)
+        return generateEH(stream, out, sectionID, sectionLen,
+                          versionID, subType, componentID, creatorID)
     elif sectionID == SectionID.failingMTMS.value:
-        generateMT(stream, out, sectionID, sectionLen,
-                   versionID, subType, componentID, creatorID)
+        return generateMT(stream, out, sectionID, sectionLen,
+                          versionID, subType, componentID, creatorID)
     elif sectionID == SectionID.extUserData.value:
-        generateED(stream, out, sectionID, sectionLen,
-                   versionID, subType, componentID, config)
+        return generateED(stream, out, sectionID, sectionLen,
+                          versionID, subType, componentID, config)
     elif sectionID == SectionID.userData.value:
-        generateUD(stream, out, sectionID, sectionLen,
-                   versionID, subType, componentID, creatorID, config)
+        return generateUD(stream, out, sectionID, sectionLen,
+                          versionID, subType, componentID, creatorID, config)
     elif sectionID == SectionID.impactedPart.value:
-        generateIP(stream, out, sectionID, sectionLen,
-                   versionID, subType, componentID, creatorID)
+        return generateIP(stream, out, sectionID, sectionLen,
+                          versionID, subType, componentID, creatorID)
     else:
-        generateDefault(stream, out, sectionID, sectionLen,
-                        versionID, subType, componentID)
-
+        return generateDefault(stream, out, sectionID, sectionLen,
+                               versionID, subType, componentID)
 
-def buildOutput(sections: list, out: OrderedDict):
-    counts = {}
 
-    # Find the section names that appear more than once.
-    # counts[section name] = [# occurrences, counter]
-    for section_num in range(len(sections)):
-        name = list(sections[section_num].keys())[0]
-        if name not in counts:
-            counts[name] = [1, 0]
-        else:
-            counts[name] = [counts[name][0]+1, 0]
+def buildOutput(sections: list, out: OrderedDict) -> list:
+    """
+    Adds the sections, each a dict of its name and data, to out.  Sections
+    that appear more than once get a ' <count>' added to their names, eg
+    'User Data 1'.
+    Returns: the name each section was added to out with.
+    """
+    names = numberSectionNames([list(section.keys())[0]
+                                for section in sections])
+    for name, section in zip(names, sections):
+        out[name] = list(section.values())[0]
+    return names
 
-    # For sections that appear more than once, add a
-    # ' <count>' to the name, eg 'User Data 1'.
-    for section_num in range(len(sections)):
-        name = list(sections[section_num].keys())[0]
 
-        if counts[name][0] == 1:
-            out[name] = sections[section_num][name]
-        else:
-            modifier = counts[name][1]
-            out[name + ' ' + str(modifier)] = sections[section_num][name]
-            counts[name][1] = modifier + 1
+def alignLine(line: str, desiredSpace: int) -> str:
+    # After index of these 2 characters ":  need to add desired space.
+    CHARACTER_SPACE = 2
+    if "\":" in line and "{" not in line:
+        ind = line.index("\":")
+        spaces = (desiredSpace - ind) * " "    # Calculating spaces needed to add to get the desired spacing.
+        ind += CHARACTER_SPACE
+        line = line[:ind] + spaces + line[ind:]
+    return line
 
 
 def prettyPrint(Mdata: str, desiredSpace: int = 34) -> str:
-    # After index of these 2 characters ":  need to add desired space.
-    CHARACTER_SPACE = 2
     lines = Mdata.split("\n")
     for i in range(len(lines)):
-        line = lines[i]
-        if "\":" in line and "{" not in line:
-            ind = line.index("\":")
-            spaces = (desiredSpace - ind) * " "    # Calculating spaces needed to add to get the desired spacing.
-            ind += CHARACTER_SPACE
-            lines[i] = line[:ind] + spaces + line[ind:]
+        lines[i] = alignLine(lines[i], desiredSpace)
     """
     Part of input
         "Section Version": 1,
@@ -203,6 +203,52 @@ def prettyPrint(Mdata: str, desiredSpace: int = 34) -> str:
     return '\n'.join(lines)
 
 
+def writePrettyJSON(data: OrderedDict, fd, desiredSpace: int = 34) -> None:
+    """
+    Writes data to the file object fd in the same format as
+    prettyPrint(json.dumps(data, indent=4)), but encodes, aligns and writes
+    it a block at a time instead of building the whole string first, so
+    memory use doesn't grow with the size of data.
+    Returns: None
+    """
+    BLOCK_CHUNKS = 256
+    chunks = []
+    for chunk in json.JSONEncoder(indent=4).iterencode(data):
+        chunks.append(chunk)
+        if len(chunks) < BLOCK_CHUNKS:
+            continue
+
+        # The encoder escapes newlines inside strings, so each newline ends
+        # a line.  Keep the last, possibly incomplete, line for the next
+        # block.
+        lines = "".join(chunks).split("\n")
+        chunks = [lines.pop()]
+        lines.append("")
+        fd.write("\n".join([alignLine(line, desiredSpace) for line in lines]))
+
+    fd.write(prettyPrint("".join(chunks), desiredSpace))
+
+
+def writeNDJSON(data: OrderedDict, fd) -> None:
+    """
+    Writes data to the file object fd as one line of compact JSON, without
+    indentation or alignment, for --output ndjson.
+    Returns: None
+    """
+    fd.write(json.dumps(data, separators=(',', ':')))
+    fd.write("\n")
+
+
+def summaryRecord(eid: str, summary: OrderedDict) -> OrderedDict:
+    """
+    Returns: the PEL summary with the Event ID (eid) added as the first
+    field, as written for each PEL with --output ndjson.
+    """
+    record = OrderedDict(EID=eid)
+    record.update(summary)
+    return record
+
+
 def considerPELIfSeverityMatches(uh: UserHeader, config: Config) -> bool:
     """
     Determine if a PEL should be considered based on its event severity.
@@ -314,7 +360,22 @@ def considerPEL(uh: UserHeader, ph, config: Config) -> bool:
 
     return True
 
-def parsePEL(stream: DataStream, config: Config, exit_on_error: bool):
+def parsePELObject(stream: DataStream, config: Config,
+                   exit_on_error: bool) -> PEL:
+    """
+    Parses a PEL stream into a PEL object.
+    Returns: PEL, or None if no PEL is parsed.
+    """
+    headers = readHeaders(stream.data, stream.index)
+    if headers is None:
+        if exit_on_error:
+            sys.exit(1)
+        else:
+            return None
+
+    if not considerPEL(headers, headers, config):
+        return None
+
     out = OrderedDict()
 
     ret, ph = generatePH(stream, out)
@@ -322,32 +383,134 @@ def parsePEL(stream: DataStream, config: Config, exit_on_error: bool):
         if exit_on_error:
             sys.exit(1)
         else:
-            return "", ""
-
-    eid = ph.lEID
-    if eid[0:2] == "0x" :
-        eid = eid[2:]
+            return None
 
     ret, uh = generateUH(stream, ph.creatorID, out)
     if ret is False:
         if exit_on_error:
             sys.exit(1)
         else:
-            return "", ""
+            return None
 
-    if not considerPEL(uh, ph, config):
-        return "", ""
+    sections = [Section(name, section, out[name])
+                for name, section in zip(out, (ph, uh))]
 
     section_jsons = []
+    section_objs = []
     for _ in range(2, ph.sectionCount):
         sectionID, sectionLen, versionID, subType, componentID = parseHeader(
             stream)
         section_json = OrderedDict()
-        sectionFun(stream, section_json, sectionID, sectionLen,
-                   versionID, subType, componentID, ph.creatorID, config)
+        _, section = sectionFun(stream, section_json, sectionID, sectionLen,
+                                versionID, subType, componentID, ph.creatorID,
+                                config)
         section_jsons.append(section_json)
+        section_objs.append(section)
+
+    names = buildOutput(section_jsons, out)
+
+    for name, section in zip(names, section_objs):
+        sections.append(Section(name, section, out[name]))
+
+    return PEL(sections, out)
+
+
+def decodeSection(data: memoryview, entry: SectionEntry, creatorID: str,
+                  config: Config) -> Section:
+    """
+    Parses one section of a PEL from its offset table entry, without parsing
+    the sections before it.
+    Returns: Section
+    """
+    stream = DataStream(data, byte_order='big', is_signed=False)
+    stream.index = entry.offset
+    out = OrderedDict()
+    if entry.index == 0:
+        _, section = generatePH(stream, out)
+    elif entry.index == 1:
+        _, section = generateUH(stream, creatorID, out)
+    else:
+        sectionID, sectionLen, versionID, subType, componentID = parseHeader(
+            stream)
+        _, section = sectionFun(stream, out, sectionID, sectionLen,
+                                versionID, subType, componentID, creatorID,
+                                config)
+    return Section(entry.name, section, list(out.values())[0])
+
+
+def matchSection(entry: SectionEntry, names: list) -> bool:
+    """
+    Checks if a section is one of the named sections.  A name without a
+    count, eg 'User Data', matches every section with that name.
+    Returns: True if the section matches a name.
+    """
+    return entry.name in names or getSectionName(entry.sectionID) in names
+
+
+def parsePELSections(stream: DataStream, config: Config, names: list,
+                     exit_on_error: bool) -> (str, list):
+    """
+    Parses only the named sections of a PEL stream.  The sections are found
+    with readSectionTable(), so the cost is proportional to the size of the
+    sections parsed rather than the whole PEL.
+    If none of the sections match, the names of the sections the PEL has are
+    printed to stderr.
+    Returns: Event ID (eid) and the list of parsed Sections, in PEL order.
+            If no PEL is parsed, an empty string and None are returned.
+    """
+    headers = readHeaders(stream.data, stream.index)
+    if headers is None:
+        if exit_on_error:
+            sys.exit(1)
+        else:
+            return "", None
+
+    if not considerPEL(headers, headers, config):
+        return "", None
+
+    eid = "{:02X}".format(headers.lEID)
+    table = readSectionTable(stream.data, stream.index)
+    sections = [decodeSection(stream.data, entry, headers.creatorID, config)
+                for entry in table if matchSection(entry, names)]
+    if not sections:
+        print(f"PEL 0x{eid} has none of the sections "
+              f"{', '.join(repr(name) for name in names)}; available sections: "
+              f"{', '.join(entry.name for entry in table)}", file=sys.stderr)
+    return eid, sections
+
+
+def parsePELData(stream: DataStream, config: Config, exit_on_error: bool):
+    """
+    Parses a PEL stream into an OrderedDict of its sections, or only the
+    sections in config.sections if given.
+    Returns: Event ID (eid) and the PEL data, which is empty if none of
+            config.sections are in the PEL.
+            If no PEL is parsed, an empty string and None are returned.
+    """
+    if config.sections:
+        eid, sections = parsePELSections(stream, config, config.sections,
+                                         exit_on_error)
+        if sections is None:
+            return "", None
+        return eid, OrderedDict((section.name, section.data)
+                                for section in sections)
 
-    buildOutput(section_jsons, out)
+    pel = parsePELObject(stream, config, exit_on_error)
+    if pel is None:
+        return "", None
+
+    return pel.eid, pel.toDict()
+
+
+def parsePEL(stream: DataStream, config: Config, exit_on_error: bool):
+    """
+    Parses a PEL stream.
+    Returns: Event ID (eid) and the PEL data as a JSON string.
+            If no PEL is parsed, empty strings are returned.
+    """
+    eid, out = parsePELData(stream, config, exit_on_error)
+    if out is None:
+        return "", ""
 
     return eid, prettyPrint(json.dumps(out, indent=4))
 
@@ -355,23 +518,24 @@ def parsePEL(stream: DataStream, config: Config, exit_on_error: bool):
 def parseAndWriteOutput(file: str, output_dir: str, config: Config,
                         delete_after_parsing: bool) -> None:
 
-    with open(file, 'rb') as fd:
-        data = fd.read()
+    with openPELFile(file) as data:
         stream = DataStream(data, byte_order='big', is_signed=False)
 
         try:
-            eid, json_string = parsePEL(stream, config, False)
+            eid, pel_data = parsePELData(stream, config, False)
 
-            if len(json_string) != 0:
+            if pel_data:
                 output_file = os.path.join(
                     output_dir, os.path.basename(file) + '.' + eid + '.json')
 
                 with open(output_file, "w") as output:
-                    output.writelines(json_string)
+                    writePrettyJSON(pel_data, output)
 
                     if delete_after_parsing:
                         os.remove(file)
-            else:
+            elif pel_data is None:
+                # Empty if the PEL has none of the --section sections,
+                # which parsePELData() already reported.
                 print(f"No PEL parsed for {file}")
         except Exception as e:
             print(f"No PEL parsed for {file}: {e}", file=sys.stderr)
@@ -434,13 +598,13 @@ def parseAndPrintPELFile(file_path: str, config: Config, exit_on_error: bool) ->
     Returns: None
     """
     try:
-        with open(file_path, 'rb') as fd:
-            data = fd.read()
+        with openPELFile(file_path) as data:
             stream = DataStream(data, byte_order='big', is_signed=False)
-            _, json_string = parsePEL(stream, config, exit_on_error)
-            if json_string:
+            _, pel_data = parsePELData(stream, config, exit_on_error)
+            if pel_data:
                 if not config.hex:
-                    print(json_string)        
+                    writePrettyJSON(pel_data, sys.stdout)
+                    print()
                 else:
                     printPELInHexFormat(data)
     except Exception as e:
@@ -478,17 +642,15 @@ def parsePelFromBmcID(path: str, config: Config) -> None:
     for root, _, files in os.walk(path):
         for file in files:
             try:
-                with open(os.path.join(root, file), 'rb') as fd:
-                    data = fd.read()
-                    stream = DataStream(data, byte_order='big', is_signed=False)
-                    out = OrderedDict()
-                    _, ph = generatePH(stream, out)
-                    if str(ph.obmcLogID) == config.bmcID:
+                with openPELFile(os.path.join(root, file)) as data:
+                    headers = readHeaders(data)
+                    if headers and str(headers.obmcLogID) == config.bmcID:
                         stream = DataStream(data, byte_order='big', is_signed=False)
-                        _, json_string = parsePEL(stream, config, False)
-                        if json_string:
+                        _, pel_data = parsePELData(stream, config, False)
+                        if pel_data:
                             if not config.hex:
-                                print(json_string)
+                                writePrettyJSON(pel_data, sys.stdout)
+                                print()
                             else:
                                 printPELInHexFormat(data)
                         foundID = True
@@ -510,21 +672,15 @@ def parsePelFromPLID(path: str, config: Config):
     plid = processId(config.plid)
     root, file_list = getFileList(path, config)
     final_summary = {}
-    for file in file_list:
-        with open(os.path.join(root, file), 'rb') as fd:
-            data = fd.read()
-            stream = DataStream(data, byte_order='big', is_signed=False)
-            try:
-                eid, summary = parsePELSummary(stream, config)
-                if eid :
-                    if plid in summary['PLID']:
-                        if config.hex:
-                            printPELInHexFormat(data)
-                        else:
-                            final_summary[eid] = summary
-            except Exception as e:
-                print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
-    if not config.hex:
+    for file, eid, summary in getPELSummaries(root, file_list, config):
+        if plid in summary['PLID']:
+            if config.hex:
+                printPELFileInHexFormat(os.path.join(root, file))
+            elif config.output == 'ndjson':
+                writeNDJSON(summaryRecord(eid, summary), sys.stdout)
+            else:
+                final_summary[eid] = summary
+    if not config.hex and config.output != 'ndjson':
         print(prettyPrint(json.dumps(final_summary, indent=4) , desiredSpace = 29))
 
 
@@ -544,28 +700,27 @@ def parsePelFromSRCID(path: str, config: Config):
 
     root, file_list = getFileList(path, config)
     final_summary = {}
-    for file in file_list:
-        with open(os.path.join(root, file), 'rb') as fd:
-            data = fd.read()
-            stream = DataStream(data, byte_order='big', is_signed=False)
-            try:
-                eid, summary = parsePELSummary(stream, config)
-                if eid :
-                    if config.src and config.src in summary['SRC']:
-                        if config.hex:
-                            printPELInHexFormat(data)
-                        else:
-                            final_summary[eid] = summary
-                    if (config.srcExcludeFile):
-                        if summary['SRC'] not in src_exclude_file_data:
-                            if config.hex:
-                                printPELInHexFormat(data)
-                            else:
-                                final_summary[eid] = summary
+    for file, eid, summary in getPELSummaries(root, file_list, config):
+        try:
+            if config.src and config.src in summary['SRC']:
+                if config.hex:
+                    printPELFileInHexFormat(os.path.join(root, file))
+                elif config.output == 'ndjson':
+                    writeNDJSON(summaryRecord(eid, summary), sys.stdout)
+                else:
+                    final_summary[eid] = summary
+            if (config.srcExcludeFile):
+                if summary['SRC'] not in src_exclude_file_data:
+                    if config.hex:
+                        printPELFileInHexFormat(os.path.join(root, file))
+                    elif config.output == 'ndjson':
+                        writeNDJSON(summaryRecord(eid, summary), sys.stdout)
+                    else:
+                        final_summary[eid] = summary
 
-            except Exception as e:
-                print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
-    if not config.hex:
+        except Exception as e:
+            print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
+    if not config.hex and config.output != 'ndjson':
         print(prettyPrint(json.dumps(final_summary, indent=4) , desiredSpace = 29))
 
 def parsePelDataFromSRCID(path: str, config: Config):
@@ -581,23 +736,22 @@ def parsePelDataFromSRCID(path: str, config: Config):
     root, file_list = getFileList(path, config)
     final_data = {}
     for file in file_list:
-        with open(os.path.join(root, file), 'rb') as fd:
-            data = fd.read()
+        with openPELFile(os.path.join(root, file)) as data:
             stream = DataStream(data, byte_order='big', is_signed=False)
             try:
-                eid, json_string = parsePEL(stream, config, False)
-                if eid :
-                    pel_data = json.loads(json_string)
-                    pel_src = pel_data.get("Primary SRC", {}).get("Reference Code", "")
-                    if config.src and config.src in pel_src:
+                pel = parsePELObject(stream, config, False)
+                if pel:
+                    if config.src and config.src in pel.referenceCode:
                         if config.hex:
                             printPELInHexFormat(data)
+                        elif config.output == 'ndjson':
+                            writeNDJSON(pel.toDict(), sys.stdout)
                         else:
-                            final_data[eid] = pel_data
+                            final_data[pel.eid] = pel.toDict()
 
             except Exception as e:
                 print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
-    if not config.hex:
+    if not config.hex and config.output != 'ndjson':
         print(prettyPrint(json.dumps(final_data, indent=4) , desiredSpace = 29))
 
 def parsePelFromRecent(path: str, config: Config) -> None:
@@ -613,10 +767,13 @@ def parsePelFromRecent(path: str, config: Config) -> None:
     # Get the sorted file list using the same algorithm as list operations
     root, file_list = getFileList(path, config)
     
+    # Only the file names are needed, so the PELs aren't summarized.
     matching_files = []
-    for file in file_list:
-        eid, summary = extractAndSummarizePEL(os.path.join(root, file), config)
-        if eid:  # This means the PEL passed all filters
+    for file, _, _ in getPELSummaries(root, file_list, config,
+                                      summaries=False):
+        if config.hex:
+            printPELFileInHexFormat(os.path.join(root, file))
+        else:
             matching_files.append(file)
     
     if len(matching_files) == 0:
@@ -640,6 +797,11 @@ def parsePELSummary(stream: DataStream, config: Config):
     Returns: Event ID (eid) and summary of PEL data.
             If no PEL is parsed or an error occurs, empty strings are returned.
     """
+    headers = readHeaders(stream.data, stream.index)
+    if headers is None:
+        return "", ""
+    if not considerPEL(headers, headers, config):
+        return "", ""
     out = OrderedDict()
     ret, ph = generatePH(stream, out)
     if ret is False:
@@ -648,9 +810,16 @@ def parsePELSummary(stream: DataStream, config: Config):
     ret, uh = generateUH(stream, ph.creatorID, out)
     if ret is False:
         return "", ""
-    if not considerPEL(uh, ph, config):
-        return "", ""
+    return eid, buildPELSummary(stream, ph, out, config)
 
+
+def buildPELSummary(stream: DataStream, ph: PrivateHeader, out: OrderedDict,
+                    config: Config) -> OrderedDict:
+    """
+    Builds the summary of a PEL whose Private Header and User Header have
+    already been parsed into out.
+    Returns: summary of PEL data.
+    """
     summary = OrderedDict()
     for _ in range(2, ph.sectionCount):
         sectionID, sectionLen, versionID, subType, componentID = parseHeader(stream)
@@ -675,7 +844,7 @@ def parsePELSummary(stream: DataStream, config: Config):
     summary["Commit Time"] = ph.commitTime
     summary["Sev"] = out["User Header"]["Event Severity"]
     summary["CompID"] = out["Private Header"]["Created by"]
-    return eid, summary
+    return summary
 
 def extractAndSummarizePEL(file: str, config: Config):
     """
@@ -683,8 +852,7 @@ def extractAndSummarizePEL(file: str, config: Config):
     Returns: Event ID (eid) and summary extracted from the PEL.
             If no PEL is parsed, empty strings are returned.
     """
-    with open(file, 'rb') as fd:
-        data = fd.read()
+    with openPELFile(file) as data:
         stream = DataStream(data, byte_order='big', is_signed=False)
         try:
             eid, summary = parsePELSummary(stream, config)
@@ -698,6 +866,259 @@ def extractAndSummarizePEL(file: str, config: Config):
     return "", ""
 
 
+def indexPELFile(file: str, config: Config) -> dict:
+    """
+    Reads the Private Header and User Header fields used by the filters
+    from a PEL file into a summary index entry.  No section is parsed, the
+    summary is only added to the entry once a query selects the PEL.
+    Returns: index entry, with an empty EID if the file is not a valid PEL.
+    """
+    with openPELFile(file) as data:
+        headers = readHeaders(data)
+        if headers is None:
+            return {"EID": ""}
+
+        entry = OrderedDict()
+        entry["EID"] = "0x{:02X}".format(headers.lEID)
+        entry["CreatorID"] = headers.creatorID
+        entry["Severity"] = headers.eventSeverity
+        entry["ActionFlags"] = headers.actionFlags
+        return entry
+
+
+def summarizeIndexedPELFile(file: str, config: Config) -> OrderedDict:
+    """
+    Parses the summary of a PEL file for its summary index entry, reporting
+    any parse errors.  Unlike parsePELSummary() no filters are applied, so
+    the summary can be reused by any query.
+    Returns: summary of the PEL, None if it could not be parsed.
+    """
+    try:
+        with openPELFile(file) as data:
+            stream = DataStream(data, byte_order='big', is_signed=False)
+            out = OrderedDict()
+            ret, ph = generatePH(stream, out)
+            if ret is False:
+                return None
+            ret, uh = generateUH(stream, ph.creatorID, out)
+            if ret is False:
+                return None
+            return buildPELSummary(stream, ph, out, config)
+    except Exception as e:
+        print(f"Exception: No PEL parsed for {os.path.basename(file)}: {e}", file=sys.stderr)
+    return None
+
+
+def summarizePELFile(file: str, config: Config):
+    """
+    Parses and summarizes a PEL file, reporting any parse errors.
+    Returns: Event ID (eid) and summary of the PEL.
+            If no PEL is parsed, empty strings are returned.
+    """
+    with openPELFile(file) as data:
+        stream = DataStream(data, byte_order='big', is_signed=False)
+        try:
+            return parsePELSummary(stream, config)
+        except Exception as e:
+            print(f"Exception: No PEL parsed for {os.path.basename(file)}: {e}", file=sys.stderr)
+    return "", ""
+
+
+def updatePELIndexEntry(file: str, config: Config):
+    """
+    Builds the summary index entry for a new or changed PEL file, reporting
+    any parse errors.
+    Returns: file key and index entry.  The entry has an empty EID if the
+    PEL could not be read.
+    """
+    key = getFileKey(file)
+    try:
+        return key, indexPELFile(file, config)
+    except Exception as e:
+        print(f"Exception: No PEL parsed for {os.path.basename(file)}: {e}", file=sys.stderr)
+    return key, {"EID": ""}
+
+
+def considerIndexEntry(entry: dict, config: Config) -> bool:
+    """
+    Returns: True if the PEL of a summary index entry passes the filters in
+    config.
+    """
+    headers = PELHeaders(creatorID=entry["CreatorID"],
+                         eventSeverity=entry["Severity"],
+                         actionFlags=entry["ActionFlags"])
+    return considerPEL(headers, headers, config)
+
+
+def captureErrors(func, item, config: Config):
+    """
+    Calls func(item, config=config), capturing anything it prints to stderr,
+    so the errors found while building a summary index entry can be stored
+    with it and reported again each time the entry is used.
+    Returns: return value of func and the captured stderr text.
+    """
+    import contextlib
+    import io
+    err = io.StringIO()
+    with contextlib.redirect_stderr(err):
+        ret = func(item, config=config)
+    return ret, err.getvalue()
+
+
+def getPELSummaries(root: str, file_list: list, config: Config,
+                    summaries: bool = True):
+    """
+    Generator over the PELs in file_list that pass the filters in config.
+    Unless disabled, the summary index is used so only new or changed files
+    are read, and only the PELs that pass the filters are summarized.  If
+    summaries is False, only the headers of each PEL are read.
+    Yields: file name, Event ID (eid) and summary of each PEL.  The summary
+    is None if summaries is False.
+    """
+    if not config.use_index:
+        paths = [os.path.join(root, file) for file in file_list]
+        if not summaries:
+            results = mapFiles(updatePELIndexEntry, paths, config,
+                               loadTables=False)
+            for file, (_, entry) in zip(file_list, results):
+                if entry["EID"] and considerIndexEntry(entry, config):
+                    yield file, entry["EID"], None
+            return
+
+        results = mapFiles(summarizePELFile, paths, config)
+        for file, (eid, summary) in zip(file_list, results):
+            if eid:
+                yield file, eid, summary
+        return
+
+    from pel.peltool.summary_index import SummaryIndex
+    index = SummaryIndex(root, config.allow_plugins)
+    try:
+        if summaries:
+            index.checkSummaries()
+        entries = [index.get(file) for file in file_list]
+        stale = [file for file, entry in zip(file_list, entries)
+                 if entry is None]
+        results = mapFiles(functools.partial(captureErrors,
+                                             updatePELIndexEntry),
+                           [os.path.join(root, file) for file in stale],
+                           config, loadTables=False)
+        updated = {}
+        for file, ((key, entry), errors) in zip(stale, results):
+            if errors:
+                entry["Errors"] = errors
+            index.put(file, key, entry)
+            updated[file] = entry
+        entries = [updated[file] if entry is None else entry
+                   for file, entry in zip(file_list, entries)]
+
+        selected = {}
+        for file, entry in zip(file_list, entries):
+            if entry["EID"] and considerIndexEntry(entry, config):
+                selected[file] = entry
+
+        if summaries:
+            # A summary that could not be parsed is stored as None, with the
+            # errors, so the file isn't parsed again until it changes.
+            missing = [(file, entry) for file, entry in selected.items()
+                       if "Summary" not in entry]
+            results = mapFiles(functools.partial(captureErrors,
+                                                 summarizeIndexedPELFile),
+                               [os.path.join(root, file)
+                                for file, _ in missing], config)
+            for (file, entry), (summary, errors) in zip(missing, results):
+                entry["Summary"] = summary
+                if errors:
+                    entry["SummaryErrors"] = errors
+                index.put(file, entry["Key"], entry)
+
+        # The stored errors are reported every time, in file order, so the
+        # output is the same whether or not the entries were just built.
+        for file, entry in zip(file_list, entries):
+            sys.stderr.write(entry.get("Errors", ""))
+            if file not in selected:
+                continue
+            if summaries:
+                sys.stderr.write(entry.get("SummaryErrors", ""))
+                if entry["Summary"] is None:
+                    continue
+            yield file, entry["EID"], entry.get("Summary")
+    finally:
+        index.save()
+
+
+def callCaptured(func, item, config: Config):
+    """
+    Calls func in a worker process, capturing anything it prints so the
+    parent process can replay it in order.  With --user-data-cache the
+    user data parse cache hits and misses of the call are returned too, as
+    each worker has its own cache and the parent prints the totals.
+    Returns: return value of func, captured stdout and stderr text, and the
+             parse cache hits and misses of the call.
+    """
+    import contextlib
+    import io
+    parseCache = None
+    if config.user_data_cache_size:
+        from pel.peltool.parse_user_data import parseCache
+        hits, misses = parseCache.hits, parseCache.misses
+    out = io.StringIO()
+    err = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        ret = func(item, config=config)
+    if parseCache is None:
+        return ret, out.getvalue(), err.getvalue(), 0, 0
+    return (ret, out.getvalue(), err.getvalue(),
+            parseCache.hits - hits, parseCache.misses - misses)
+
+
+def mapFiles(func, items: list, config: Config, loadTables: bool = True):
+    """
+    Generator that calls func(item, config=config) for each item, in order.
+    With --jobs the calls are spread over a pool of worker processes; results
+    are still yielded in the order of items, as soon as they are available,
+    and anything the workers print is replayed in the same order.
+    loadTables loads the component ID tables and message registry first,
+    for functions that parse the PEL sections.
+    Yields: return value of each call.
+    """
+    if not items:
+        return
+
+    # Loaded before the first call whether or not there are workers, so
+    # forked workers inherit them and any errors loading them are printed
+    # at the same point with or without --jobs.
+    if loadTables:
+        from pel.peltool.src import registry
+        getAllCreatorsCompIDs()
+        registry.load()
+
+    if config.jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item, config=config)
+        return
+
+    import multiprocessing
+
+    parseCache = None
+    if config.user_data_cache_size:
+        from pel.peltool.parse_user_data import parseCache
+
+    worker = functools.partial(callCaptured, func, config=config)
+    chunksize = max(1, min(16, len(items) // (config.jobs * 4)))
+    with multiprocessing.Pool(config.jobs) as pool:
+        for ret, out, err, hits, misses in pool.imap(worker, items,
+                                                      chunksize):
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            # Counted in the parent so printUserDataCacheStats() reports
+            # the lookups of every worker.
+            if parseCache is not None:
+                parseCache.hits += hits
+                parseCache.misses += misses
+            yield ret
+
+
 def getFileList(path: str, config: Config):
     """
     Reads the passed folder path and creates a list of file names in the top level
@@ -729,9 +1150,10 @@ def listCompactOption(path: str, config: Config):
     data_rows = []
     
     # Collect all data first
-    for file in file_list:
-        eid, summary = extractAndSummarizePEL(os.path.join(root, file), config)
-        if eid:
+    for file, eid, summary in getPELSummaries(root, file_list, config):
+        if config.hex:
+            printPELFileInHexFormat(os.path.join(root, file))
+        else:
             # Extract the fields for compact format
             error_id = eid if eid.startswith("0x") else f"0x{eid}"
             src = summary.get("SRC", "")
@@ -775,19 +1197,37 @@ def listCompactOption(path: str, config: Config):
 
 def listOption(path: str, config: Config):
     # Check if compact mode is enabled
-    if config.compact:
+    if config.compact and config.output != 'ndjson':
         listCompactOption(path, config)
         return
     
     root, file_list = getFileList(path, config)
     final_summary = {}
-    for file in file_list:
-        eid, summary = extractAndSummarizePEL(os.path.join(root, file), config)
-        if eid :
+    for file, eid, summary in getPELSummaries(root, file_list, config):
+        if config.hex:
+            printPELFileInHexFormat(os.path.join(root, file))
+        elif config.output == 'ndjson':
+            writeNDJSON(summaryRecord(eid, summary), sys.stdout)
+        else:
             final_summary[eid] = summary
-    if not config.hex:
+    if not config.hex and config.output != 'ndjson':
         print(prettyPrint(json.dumps(final_summary, indent=4) , desiredSpace = 29))
 
+def parsePELFile(file: str, config: Config) -> OrderedDict:
+    """
+    Parses a PEL file, reporting any parse errors.
+    Returns: PEL data, None if no PEL is parsed.
+    """
+    with openPELFile(file) as data:
+        try:
+            stream = DataStream(data, byte_order='big', is_signed=False)
+            _, pel_data = parsePELData(stream, config, False)
+            return pel_data
+        except Exception as e:
+            print(f"Exception: No PEL parsed for {os.path.basename(file)}: {e}", file=sys.stderr)
+    return None
+
+
 def extractAllPELsData(path: str, config: Config):
     """
     Extracts and display serviceable PELs data from files in the specified directory.
@@ -795,37 +1235,170 @@ def extractAllPELsData(path: str, config: Config):
     Prints a JSON-formatted string containing PEL data from all valid files.
     """
     root, file_list = getFileList(path, config)
+    paths = [os.path.join(root, file) for file in file_list]
+    if config.output == 'ndjson' and not config.hex:
+        for file, pel_data in zip(paths, mapFiles(parsePELFile, paths, config)):
+            if pel_data:
+                writeNDJSON(pel_data, sys.stdout)
+        return
+
     if not config.hex:
         print("[")
     firstPELPrinted = False
-    for file in file_list:
-        with open(os.path.join(root, file), 'rb') as fd:
-            data = fd.read()
+    for file, pel_data in zip(paths, mapFiles(parsePELFile, paths, config)):
+        if pel_data:
+            if not config.hex:
+                if firstPELPrinted:
+                    print(",")
+                writePrettyJSON(pel_data, sys.stdout)
+                firstPELPrinted = True
+            else:
+                printPELFileInHexFormat(file)
+    if not config.hex:
+        if firstPELPrinted:
+            print()
+        print("]")
+
+
+def processPELStream(source: str, config: Config, mode: str) -> None:
+    """
+    Parses the PELs in a file of back-to-back PELs, or a tar archive of PEL
+    files, one at a time in the order they appear.  A source of '-' reads
+    from standard input.  The mode selects the output of the -a, -l or -n
+    option: 'all', 'list' or 'count'.
+    Returns: None
+    """
+    from pel.peltool.pel_stream import openPELStream
+
+    count = 0
+    final_summary = {}
+    firstPELPrinted = False
+    ndjson = config.output == 'ndjson' and not config.hex
+    if mode == 'all' and not config.hex and not ndjson:
+        print("[")
+    try:
+        for name, data in openPELStream(source):
             try:
                 stream = DataStream(data, byte_order='big', is_signed=False)
-                _, json_string = parsePEL(stream, config, False)
-                if json_string:
-                    if not config.hex:
-                        if firstPELPrinted:
-                            print(",")
-                        print(json_string, end = "")
-                        firstPELPrinted = True
-                    else:
-                        printPELInHexFormat(data)
+                if mode == 'count':
+                    headers = readHeaders(data)
+                    if headers and considerPEL(headers, headers, config):
+                        count += 1
+                    continue
+
+                if mode == 'list':
+                    eid, pel_data = parsePELSummary(stream, config)
+                else:
+                    eid, pel_data = parsePELData(stream, config, False)
+                if not pel_data:
+                    continue
+                if config.hex:
+                    printPELInHexFormat(data)
+                elif ndjson:
+                    if mode == 'list':
+                        pel_data = summaryRecord(eid, pel_data)
+                    writeNDJSON(pel_data, sys.stdout)
+                elif mode == 'list':
+                    final_summary[eid] = pel_data
+                else:
+                    if firstPELPrinted:
+                        print(",")
+                    writePrettyJSON(pel_data, sys.stdout)
+                    firstPELPrinted = True
             except Exception as e:
-                print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
-    if not config.hex:
+                print(f"Exception: No PEL parsed for {name}: {e}", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Exception: Could not read PELs from {source}: {e}", file=sys.stderr)
+
+    if mode == 'count':
+        print("{\n    \"Number of PELs found\": "+str(count)+"\n}")
+    elif config.hex or ndjson:
+        return
+    elif mode == 'list':
+        print(prettyPrint(json.dumps(final_summary, indent=4) , desiredSpace = 29))
+    else:
         if firstPELPrinted:
             print()
         print("]")
 
 
+def followPELs(path: str, config: Config, mode: str) -> None:
+    """
+    Watches the PEL directory and displays each PEL committed to it from now
+    on, as soon as it's complete, until interrupted.  Only the new files are
+    parsed and the usual filters apply.  The mode selects the output of the
+    -a or -l option: 'all' or 'list'.  Each PEL is displayed as its own JSON
+    object and stdout is flushed after each one.
+    Returns: None
+    """
+    from pel.peltool.follow import followPELFiles
+
+    try:
+        for file in followPELFiles(path, config.extension):
+            if mode == 'list':
+                eid, pel_data = summarizePELFile(file, config)
+                if not eid:
+                    continue
+                if config.output == 'ndjson':
+                    pel_data = summaryRecord(eid, pel_data)
+                else:
+                    pel_data = {eid: pel_data}
+            else:
+                pel_data = parsePELFile(file, config)
+            if not pel_data:
+                continue
+            if config.hex:
+                printPELFileInHexFormat(file)
+            elif config.output == 'ndjson':
+                writeNDJSON(pel_data, sys.stdout)
+            elif mode == 'list':
+                print(prettyPrint(json.dumps(pel_data, indent=4), desiredSpace = 29))
+            else:
+                writePrettyJSON(pel_data, sys.stdout)
+                print()
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+
+
+def exportPELSummaries(path: str, config: Config, fmt: str) -> None:
+    """
+    Writes the summary of each PEL selected by the filters to stdout, in a
+    single pass that only decodes the headers of each PEL.  The format is
+    'csv', or 'columns' for the binary column file.
+    Returns: None
+    """
+    from pel.peltool.summary_columns import CSVSummaryWriter, \
+        SummaryColumns, readSummaryFile
+
+    if fmt == 'csv':
+        writer = CSVSummaryWriter(sys.stdout)
+    else:
+        writer = SummaryColumns()
+
+    root, file_list = getFileList(path, config)
+    for file in file_list:
+        try:
+            fields = readSummaryFile(os.path.join(root, file))
+            if fields is None or not considerPEL(fields[0], fields[0], config):
+                continue
+            writer.add(*fields)
+        except Exception as e:
+            print(f"Exception: No PEL parsed for {file}: {e}", file=sys.stderr)
+
+    if fmt == 'columns':
+        sys.stdout.flush()
+        writer.write(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+
+
 def printPELInHexFormat(data: memoryview) -> None:
     """
     Read single PEL file data and display in hexdecimal format.
     Returns: None
     Prints PEL data in the hexdecimal format.
     """
+    from pel.hexdump import hexdump
     try:
         mv = memoryview(data)
         hexdata = hexdump(mv)
@@ -838,27 +1411,38 @@ def printPELInHexFormat(data: memoryview) -> None:
         print(f"Exception during hexdump: {e}", file=sys.stderr)
 
 
+def printPELFileInHexFormat(file: str) -> None:
+    """
+    Read single PEL file and display it in hexdecimal format.
+    Returns: None
+    """
+    with openPELFile(file) as data:
+        printPELInHexFormat(data)
+
+
 def printPELCount(path: str, config: Config):
     """
     Reads and display serviceable PEL count from the specified directory.
     Returns: None
     Prints a JSON-formatted string containing count of valid PELs in specified directory.
     """
-    count = 0
     root, file_list = getFileList(path, config)
+    if config.use_index:
+        # The index already holds the headers of unchanged PELs, and only
+        # the headers of new PELs are read.
+        count = sum(1 for _ in getPELSummaries(root, file_list, config,
+                                               summaries=False))
+        print("{\n    \"Number of PELs found\": "+str(count)+"\n}")
+        return
+
+    count = 0
     for file in file_list:
-        with open(os.path.join(root, file), 'rb') as fd:
-            data = fd.read()
-            stream = DataStream(data, byte_order='big', is_signed=False)
+        with openPELFile(os.path.join(root, file)) as data:
             try:
-                out = OrderedDict()
-                ret, ph = generatePH(stream, out)
-                if not ret:
-                    continue
-                ret, uh = generateUH(stream, ph.creatorID, out)
-                if not ret:
+                headers = readHeaders(data)
+                if headers is None:
                     continue
-                if not considerPEL(uh, ph, config):
+                if not considerPEL(headers, headers, config):
                     continue
                 count+= 1
             except Exception as e:
@@ -866,6 +1450,17 @@ def printPELCount(path: str, config: Config):
     print("{\n    \"Number of PELs found\": "+str(count)+"\n}")
 
 
+def printUserDataCacheStats() -> None:
+    """
+    Prints the user data parse cache counters of this process, which with
+    --jobs include the lookups of the worker processes.
+    Returns: None
+    """
+    from pel.peltool.parse_user_data import parseCache
+    print(f"User data parse cache: {parseCache.hits} hits, "
+          f"{parseCache.misses} misses", file=sys.stderr)
+
+
 class CustomFormatter(argparse.RawDescriptionHelpFormatter):
     """
     This class is to enhance the formatting of argparse help messages 
@@ -899,6 +1494,7 @@ def main():
 
         List servicable PELs: {0} -l
         List PELs in compact format: {0} -l -C
+        Display each new PEL as it is committed: {0} -l --follow
         List informational PELs along with serviceable PELs: {0} -l -S Informational
         List every PEL irrespective of its type: {0} -l -E
         List only hidden PELs: {0} -l -H -O
@@ -931,10 +1527,31 @@ def main():
     parser.add_argument('-P', '--skip-parser-plugins', dest='skip_plugins',
                         action='store_true', help='Skip loading PEL parser plugins')
 
+    parser.add_argument('--no-index', dest='no_index', action='store_true',
+                        help='Do not use or update the PEL summary index')
+
+    parser.add_argument('--jobs', dest='jobs', metavar='<N>', type=int,
+                        help='Parse a directory of PELs using N worker processes')
+
+    parser.add_argument('--user-data-cache', dest='user_data_cache', metavar='<N>',
+                        type=int, help='Cache up to N user data parse results, keyed '
+                        'on the user data contents, so user data repeated across '
+                        'PELs is parsed once. The cache hits and misses are printed '
+                        'to stderr')
+
     parser.add_argument('-f', '--file', dest='file',
                         metavar='</path/to/pel/file>',
                         help='Input PEL file to extract PEL data')
 
+    parser.add_argument('--stream', dest='stream',
+                        metavar='</path/to/pel/stream>',
+                        help='Input file of back-to-back PELs, or a tar archive of '
+                        'PEL files, to process with -a, -l or -n. Use - to read stdin')
+
+    parser.add_argument('--follow', action='store_true',
+                        help='Watch the PEL directory and display each new PEL as it '
+                        'is committed, until interrupted. Use with -l (default) or -a')
+
     # Mutually exclusive display mode options
     displayModeGroup = parser.add_mutually_exclusive_group()
     displayModeGroup.add_argument('-l', '--list', action='store_true',
@@ -963,6 +1580,19 @@ def main():
                         help='Display PELs summary based on its System Reference Code')
     parser.add_argument('--src-exclude', dest='src_exclude_file',
                         metavar='<SRC_Exclude_file>', help='Display PELs summary excluding SRCs from the file')
+    parser.add_argument('--section', dest='sections', action='append',
+                        metavar='<section_name>',
+                        help='Only parse and display the named PEL section, eg '
+                        '"Primary SRC" or "User Data 3". A name without a number '
+                        'selects every section with that name. Can be repeated')
+    parser.add_argument('--output', dest='output', choices=['json', 'ndjson'],
+                        default='json',
+                        help='Output format of -a, -l, --plid and --src. ndjson '
+                        'writes each PEL as one line of compact JSON')
+    parser.add_argument('--export', dest='export', choices=['csv', 'columns'],
+                        help='Write the summary fields of the PELs to stdout as CSV, '
+                        'or as a binary file of typed columns, decoding only the '
+                        'PEL headers')
     parser.add_argument('-x', '--hex', action='store_true',
                         help='Display PEL(s) in hexdump instead of JSON')
     parser.add_argument('-r', '--reverse', nargs='?', const='all', metavar='<N>',
@@ -1019,6 +1649,20 @@ def main():
     if args.skip_plugins:
         config.allow_plugins = False
 
+    if args.no_index:
+        config.use_index = False
+
+    if args.jobs is not None:
+        if args.jobs <= 0:
+            sys.exit("--jobs value must be a positive integer")
+        config.jobs = args.jobs
+
+    if args.user_data_cache is not None:
+        if args.user_data_cache <= 0:
+            sys.exit("--user-data-cache value must be a positive integer")
+        config.user_data_cache_size = args.user_data_cache
+        atexit.register(printUserDataCacheStats)
+
     if args.serviceable:
         config.serviceable = True
 
@@ -1065,6 +1709,11 @@ def main():
     if args.recent is not None:
         config.recent = args.recent
 
+    if args.sections:
+        config.sections = args.sections
+
+    config.output = args.output
+
     if args.file:
         config.every_pel = True
         parseAndPrintPELFile(args.file, config, True)
@@ -1072,6 +1721,26 @@ def main():
             os.remove(args.file)
         sys.exit(0)
 
+    if args.stream:
+        # These select PELs by their place in a directory or look one up by
+        # ID, which a stream processed one PEL at a time can't do.
+        unsupported = [option for option, value in (
+            ('-i/--id', args.pelID), ('--bmc-id', args.bmcID),
+            ('--plid', args.plID), ('--src', args.src),
+            ('--src-exclude', args.src_exclude_file),
+            ('-R/--display-recent', args.recent),
+            ('-r/--reverse', args.reverse)) if value is not None]
+        if unsupported:
+            parser.error("--stream can't be used with " +
+                         ", ".join(unsupported))
+        mode = 'all'
+        if args.list:
+            mode = 'list'
+        elif args.show_pel_count:
+            mode = 'count'
+        processPELStream(args.stream, config, mode)
+        sys.exit(0)
+
     if not inBMC:
         if not args.path:
             sys.exit("Outside the BMC environment, please provide the path to the PELs using the -p option.")
@@ -1090,15 +1759,16 @@ def main():
                 sys.exit(f"Output directory {args.output_dir} doesn't exist")
             output_dir = args.output_dir
 
-        for root, _, files in os.walk(PELsPath):
-            for file in files:
-                if config.extension and config.extension != os.path.splitext(file)[1]:
-                    continue
-                parseAndWriteOutput(os.path.join(
-                    root, file), output_dir, config,
-                    args.clean)
-            # Only process top level directory
-            break
+        root, file_list = getFileList(PELsPath, config)
+        writer = functools.partial(parseAndWriteOutput, output_dir=output_dir,
+                                   delete_after_parsing=args.clean)
+        for _ in mapFiles(writer, [os.path.join(root, file)
+                                   for file in file_list], config):
+            pass
+        sys.exit(0)
+
+    if args.follow:
+        followPELs(PELsPath, config, 'all' if args.all else 'list')
         sys.exit(0)
 
     if args.pelID:
@@ -1135,6 +1805,10 @@ def main():
         parsePelFromRecent(PELsPath, config)
         sys.exit(0)
 
+    if args.export:
+        exportPELSummaries(PELsPath, config, args.export)
+        sys.exit(0)
+
     if args.list:
         listOption(PELsPath, config)
         sys.exit(0)
@@ -1,22 +1,31 @@
+import struct
 from pel.datastream import DataStream
 from collections import OrderedDict
 from pel.peltool.pel_values import creatorIDs
 from pel.peltool.comp_id import getDisplayCompID
 
 
-def getTimestamp(stream: DataStream) -> str:
-    year = stream.get_mem(2).hex()
-    month = stream.get_mem(1).hex()
-    day = stream.get_mem(1).hex()
-    hour = stream.get_mem(1).hex()
-    min = stream.get_mem(1).hex()
-    sec = stream.get_mem(1).hex()
-    hundredths = stream.get_mem(1).hex()
+# The Private Header fields after the section header: the create and commit
+# timestamps, creator ID, 2 reserved bytes, section count, OpenBMC log ID,
+# creator version, platform log ID and entry ID.
+_privateHeaderRecord = struct.Struct('>8s8scBBBIQII')
+
+
+def formatTimestamp(timestamp: bytes) -> str:
+    """
+    Formats an 8 byte BCD timestamp as MM/DD/YYYY HH:MM:SS.
+    """
+    t = timestamp.hex()
     #  "03/08/2022 18:40:27"
-    createTime = month + "/" + day + "/" + year + " " + hour + ":" + min + ":" + sec
+    createTime = t[4:6] + "/" + t[6:8] + "/" + t[0:4] + " " + \
+        t[8:10] + ":" + t[10:12] + ":" + t[12:14]
     return createTime
 
 
+def getTimestamp(stream: DataStream) -> str:
+    return formatTimestamp(stream.get_mem(8))
+
+
 class PrivateHeader:
     """
     This represents the Private Header section in a PEL.  It is required,
@@ -49,16 +58,15 @@ class PrivateHeader:
         self.commitTime = ""
 
     def toJSON(self) -> OrderedDict:
-        self.createTime = getTimestamp(self.stream)
-        self.commitTime = getTimestamp(self.stream)
-        self.creatorID = bytes.decode(self.stream.get_mem(1))
-        self.reserved0 = self.stream.get_int(1)
-        self.reserved1 = self.stream.get_int(1)
-        self.sectionCount = self.stream.get_int(1)
-        self.obmcLogID = self.stream.get_int(4)
-        self.creatorVersion = "0x{:02X}".format(self.stream.get_int(8))
-        self.pLID = "0x{:02X}".format(self.stream.get_int(4))
-        self.lEID = "0x{:02X}".format(self.stream.get_int(4))
+        (createTime, commitTime, creatorID, self.reserved0, self.reserved1,
+         self.sectionCount, self.obmcLogID, creatorVersion, pLID,
+         lEID) = self.stream.unpack_record(_privateHeaderRecord)
+        self.createTime = formatTimestamp(createTime)
+        self.commitTime = formatTimestamp(commitTime)
+        self.creatorID = bytes.decode(creatorID)
+        self.creatorVersion = "0x{:02X}".format(creatorVersion)
+        self.pLID = "0x{:02X}".format(pLID)
+        self.lEID = "0x{:02X}".format(lEID)
 
         out = OrderedDict()
         out["Section Version"] = self.versionID
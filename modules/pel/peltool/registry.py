@@ -1,32 +1,175 @@
+import hashlib
 import json
+import marshal
 import os
+from pel.cache import getCacheDir, getFileKey, writeCacheFile
+
+
+def getRegistryPath() -> str:
+    """
+    Returns the path to the message registry, or an empty string if it
+    can't be found.
+    """
+    try:
+        import pel_registry
+        path = pel_registry.get_registry_path()
+    except ModuleNotFoundError:
+        # On the BMC, pel_registry isn't available, so just
+        # use the known location.
+        path = \
+            '/usr/share/phosphor-logging/pels/message_registry.json'
+        if not os.path.exists(path):
+            path = ''
+    return path
 
 
 class Registry:
-    def __init__(self):
-        try:
-            import pel_registry
-            path = pel_registry.get_registry_path()
-        except ModuleNotFoundError:
-            # On the BMC, pel_registry isn't available, so just
-            # use the known location.
-            path = \
-                '/usr/share/phosphor-logging/pels/message_registry.json'
-            if not os.path.exists(path):
-                path = ''
-
-        if path:
-            self.pels = self.loadJson(path)
-        else:
+    """
+    The message registry, loaded on first use.
+
+    Parsing the registry JSON is slow on the BMC, so the loaded entries and
+    their index are also saved with marshal.  The cache is kept next to the
+    registry if that directory is writable, otherwise in the peltool cache
+    directory, and it is rebuilt when the registry's size or modification
+    time changes.
+    """
+
+    # Length of the reason codes looked up by the SRC class, e.g. "0x1001"
+    codeLen = 6
+
+    cacheVersion = 1
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.pels = None
+        self.index = None
+
+    def load(self) -> None:
+        """
+        Loads the registry if it hasn't been loaded yet.
+        """
+        if self.pels is not None:
+            return
+
+        if self.path is None:
+            self.path = getRegistryPath()
+
+        if not self.path:
             self.pels = []
+            self.index = {}
+            return
+
+        if self.loadCache():
+            return
+
+        self.pels = self.loadJson(self.path)
+        self.index = self.buildIndex(self.pels)
+        self.saveCache()
 
     def loadJson(self, path: str):
         with open(path, "r") as f:
             load_dict = json.load(f)
             return load_dict["PELs"]
 
-    def getErrorMessage(self, code: str, srcType: str) -> dict:
-        output = {}
+    def getCachePaths(self) -> list:
+        """
+        Returns the locations the cache may be stored in, in order of
+        preference.
+        """
+        paths = [self.path + '.marshal']
+        cacheDir = getCacheDir()
+        if cacheDir:
+            name = hashlib.sha1(
+                os.path.realpath(self.path).encode()).hexdigest()[:16]
+            paths.append(os.path.join(cacheDir, 'registry-' + name + '.marshal'))
+        return paths
+
+    def getCacheContext(self) -> list:
+        """
+        Returns what a cache must have been built from to be valid.
+        """
+        return [self.cacheVersion, marshal.version,
+                os.path.realpath(self.path)] + getFileKey(self.path)
+
+    def loadCache(self) -> bool:
+        """
+        Loads the registry entries and index from the cache.
+        Returns True if a valid cache was found, False otherwise.
+        """
+        context = self.getCacheContext()
+        for path in self.getCachePaths():
+            try:
+                with open(path, 'rb') as fd:
+                    data = marshal.loads(fd.read())
+                if data["Context"] != context:
+                    continue
+                pels = data["PELs"]
+                index = {key: pels[pos] for key, pos in data["Index"].items()}
+            except (OSError, EOFError, ValueError, TypeError, KeyError,
+                    IndexError):
+                continue
+
+            self.pels = pels
+            self.index = index
+            return True
+
+        return False
+
+    def saveCache(self) -> None:
+        """
+        Saves the registry entries and index to the first writable cache
+        location.  The index refers to entries by position, since marshal
+        doesn't preserve shared objects.
+        """
+        positions = {id(pel): pos for pos, pel in enumerate(self.pels)}
+        data = {"Context": self.getCacheContext(),
+                "PELs": self.pels,
+                "Index": {key: positions[id(pel)]
+                          for key, pel in self.index.items()}}
+        try:
+            data = marshal.dumps(data)
+        except ValueError:
+            return
+
+        for path in self.getCachePaths():
+            if os.access(os.path.dirname(path) or '.', os.W_OK) and \
+                    writeCacheFile(path, data):
+                return
+
+    @classmethod
+    def buildIndex(cls, pels: list) -> dict:
+        """
+        Maps (SRC type, reason code) to the first registry entry that
+        matches it, so lookups return the same entry as a linear search.
+
+        A ReasonCode string matches any code it contains, so every
+        substring of the lookup length is indexed.
+        """
+        index = {}
+        for pel in pels:
+            reasonCode = pel["SRC"].get("ReasonCode")
+            if reasonCode is None:
+                continue
+
+            entryType = pel["SRC"].get("Type", "BD")
+            if isinstance(reasonCode, str):
+                codes = [reasonCode[i:i + cls.codeLen]
+                         for i in range(len(reasonCode) - cls.codeLen + 1)]
+            else:
+                codes = [c for c in reasonCode if isinstance(c, str)]
+
+            for code in codes:
+                index.setdefault((entryType, code), pel)
+        return index
+
+    def findEntry(self, code: str, srcType: str) -> dict:
+        """
+        Returns the first registry entry for the SRC type and reason code,
+        None if there isn't one.
+        """
+        self.load()
+        if len(code) == self.codeLen:
+            return self.index.get((srcType, code))
 
         for pel in self.pels:
             if "ReasonCode" not in pel["SRC"]:
@@ -39,15 +182,24 @@ class Registry:
             if code not in pel["SRC"]["ReasonCode"]:
                 continue
 
-            output['Message'] = pel['Documentation']['Message']
+            return pel
 
-            if ('MessageArgSources' in pel['Documentation']):
-                output['MessageArgSources'] = \
-                    pel['Documentation']['MessageArgSources']
+        return None
 
-            if 'Words6To9' in pel['SRC'] and pel['SRC']['Words6To9']:
-                output['Words6To9'] = pel['SRC']['Words6To9']
+    def getErrorMessage(self, code: str, srcType: str) -> dict:
+        output = {}
 
+        pel = self.findEntry(code, srcType)
+        if pel is None:
             return output
 
+        output['Message'] = pel['Documentation']['Message']
+
+        if ('MessageArgSources' in pel['Documentation']):
+            output['MessageArgSources'] = \
+                pel['Documentation']['MessageArgSources']
+
+        if 'Words6To9' in pel['SRC'] and pel['SRC']['Words6To9']:
+            output['Words6To9'] = pel['SRC']['Words6To9']
+
         return output
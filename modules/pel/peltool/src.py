@@ -8,6 +8,7 @@ from pel.peltool.pel_values import failingComponentType, \
 from pel.peltool.comp_id import getDisplayCompID
 from pel.peltool.config import Config
 import json
+import struct
 import sys
 import importlib
 
@@ -15,6 +16,17 @@ registry = Registry()
 calloutParsers = {}
 srcParsers = {}
 
+# The SRC fields after the section header: version, flags, 1 reserved byte,
+# valid word count, 2 reserved bytes, size, the 8 hex words 2-9 and the
+# 32 character ASCII string.
+_srcRecord = struct.Struct('>BBBBHH8I32s')
+
+# The type, size and flags at the start of a FRU identity or MRU structure.
+_substructureHeader = struct.Struct('>HBB')
+
+# The MRU structure fields after the substructure header.
+_mruReserved = struct.Struct('>I')
+
 @unique
 class HeaderFlags(Enum):
     additionalSections = 0x01
@@ -40,31 +52,61 @@ class Flags(Enum):
     snSupplied = 0x01
 
 
+_pnOrProcedureFlags = Flags.pnSupplied.value | Flags.maintProcSupplied.value
+_fruIdentityFlagsMask = _pnOrProcedureFlags | Flags.ccinSupplied.value | \
+    Flags.snSupplied.value
+
+
+def _fruIdentityRecord(flags: int) -> struct.Struct:
+    """
+    Returns the record of the optional FRU identity fields present with the
+    given flags: the part number or procedure ID, CCIN and serial number.
+    """
+    fmt = '>'
+    if flags & _pnOrProcedureFlags:
+        fmt += '8s'
+    if flags & Flags.ccinSupplied.value:
+        fmt += '4s'
+    if flags & Flags.snSupplied.value:
+        fmt += '12s'
+    return struct.Struct(fmt)
+
+
+# The optional FRU identity field records, indexed by the FRU identity flags.
+_fruIdentityRecords = [_fruIdentityRecord(flags)
+                       for flags in range(_fruIdentityFlagsMask + 1)]
+
+
 def get_value(data: memoryview, start: int, end: int) -> int:
     return int.from_bytes(data[start: start + end], byteorder="big")
 
 
 class FRUIdentity:
     def __init__(self, stream: DataStream):
-        self.type = stream.get_int(2)
-        self.size = stream.get_int(1)
-        self.flags = stream.get_int(1)
+        self.type, self.size, self.flags = \
+            stream.unpack_record(_substructureHeader)
         self.pnOrProcedureID = ""
         self.ccin = ""
         self.sn = ""
         self.flattenedSize = 4
 
-        if self.flags & Flags.pnSupplied.value or self.flags & Flags.maintProcSupplied.value:
-            self.pnOrProcedureID = bytes.decode(
-                stream.get_mem(8)).strip("\u0000")
+        # The optional fields that follow depend on the flags, so extract
+        # them all at once with the record for those flags.
+        record = _fruIdentityRecords[self.flags & _fruIdentityFlagsMask]
+        if not record.size:
+            return
+        fields = iter(stream.unpack_record(record))
+
+        if self.flags & _pnOrProcedureFlags:
+            self.pnOrProcedureID = bytes.decode(next(fields)).strip("\u0000")
             self.flattenedSize += 8
 
         if self.flags & Flags.ccinSupplied.value:
-            self.ccin = bytes.decode(stream.get_mem(4)).strip("\u0000")
+            self.ccin = bytes.decode(next(fields)).strip("\u0000")
             self.flattenedSize += 4
 
         if self.flags & Flags.snSupplied.value:
-            self.sn = bytes.decode(stream.get_mem(12)).strip("\u0000")
+            self.sn = bytes.decode(next(fields)).strip("\u0000")
             self.flattenedSize += 12
 
 
@@ -73,15 +115,15 @@ class PCEIdentity:
         self.type = stream.get_int(2)
         self.flattenedSize = stream.get_int(1)
         self.flags = stream.get_int(1)
-        self.machineType = bytes.decode(stream.get_mem(8)).strip("\u0000")
-        self.serialNumber = bytes.decode(
-            stream.get_mem(12)).strip("\u0000")
+        self.machineType = bytes(stream.get_mem(8)).decode().strip("\u0000")
+        self.serialNumber = bytes(
+            stream.get_mem(12)).decode().strip("\u0000")
         if self.flattenedSize < (4 + 8 + 12):
             print("PCE identity structure size field too small")
             return
         self.pceNameSize = self.flattenedSize - (4 + 8 + 12)
-        self.pceName = bytes.decode(
-            stream.get_mem(self.pceNameSize)).strip("\u0000")
+        self.pceName = bytes(
+            stream.get_mem(self.pceNameSize)).decode().strip("\u0000")
 
 
 class MRUCallout:
@@ -92,14 +134,17 @@ class MRUCallout:
 
 class MRU:
     def __init__(self, stream: DataStream):
-        self.type = stream.get_int(2)
-        self.flattenedSize = stream.get_int(1)
-        self.flags = stream.get_int(1)
-        self.reserved4B = stream.get_int(4)
+        self.type, self.flattenedSize, self.flags = \
+            stream.unpack_record(_substructureHeader)
+        self.reserved4B, = stream.unpack_record(_mruReserved)
         self.mrus = []
-        for _ in range(self.flags & 0xf):
-            mru = MRUCallout(stream.get_int(4), stream.get_int(4))
-            self.mrus.append(mru)
+        count = self.flags & 0xf
+        if count:
+            # Each MRU callout is a 4 byte priority and a 4 byte ID.
+            fields = stream.unpack('>%dI' % (2 * count))
+            for i in range(0, len(fields), 2):
+                mru = MRUCallout(fields[i], fields[i + 1])
+                self.mrus.append(mru)
 
 
 class Callout:
@@ -110,8 +155,8 @@ class Callout:
         self.locationCode = ""
         self.locationCodeSize = stream.get_int(1)
         if self.locationCodeSize > 0:
-            self.locationCode = bytes.decode(
-                stream.get_mem(self.locationCodeSize)).strip("\u0000")
+            self.locationCode = bytes(
+                stream.get_mem(self.locationCodeSize)).decode().strip("\u0000")
         self.fruIdentity = None
         self.pceIdentity = None
         self.mru = None
@@ -329,15 +374,12 @@ class SRC:
             return ''
 
     def toJSON(self, config: Config) -> OrderedDict:
-        self.version = "0x" + self.stream.get_mem(1).hex()
-        self.flags = self.stream.get_int(1)
-        self.reserved1B = self.stream.get_int(1)
-        self.wordCount = self.stream.get_int(1)
-        self.reserved2B = self.stream.get_int(2)
-        self.size = self.stream.get_int(2)
-        for i in range(8):
-            self.hexData.append(self.stream.get_int(4))
-        self.asciiString = bytes.decode(self.stream.get_mem(32))
+        fields = self.stream.unpack_record(_srcRecord)
+        self.version = "0x%02x" % fields[0]
+        (self.flags, self.reserved1B, self.wordCount, self.reserved2B,
+         self.size) = fields[1:6]
+        self.hexData.extend(fields[6:14])
+        self.asciiString = bytes.decode(fields[14])
         self.srcType = self.asciiString[0:2]
 
         out = OrderedDict()
@@ -0,0 +1,290 @@
+"""
+Columnar export of PEL summaries, for analysing large numbers of PELs.
+
+The summary fields are decoded straight from the Private Header, User Header
+and the reference code of the Primary SRC, found by walking the section
+headers, so no section is parsed.  Rows are either written out as CSV as they
+are read, or appended to typed arrays, a few bytes per PEL, and written as a
+binary column file that can be loaded into NumPy without copying.
+
+The binary column file holds:
+    - the 8 byte magic b'PELCOLS1'
+    - a 4 byte little endian length, followed by a JSON header with the row
+      count, the name and NumPy type of each column, and the string table of
+      each string column
+    - the data of each column, little endian and aligned to 8 bytes
+"""
+
+import array
+import csv
+import json
+import struct
+import sys
+from collections import OrderedDict
+
+from pel.peltool.comp_id import getDisplayCompID
+from pel.peltool.pel_headers import PEL_MAGIC, SECTION_HEADER, PELHeaders, \
+    TruncatedPELError, readHeaders, readSectionHeaders
+from pel.peltool.pel_types import SectionID
+from pel.peltool.pel_values import creatorIDs, severityValues, \
+    subsystemValues
+from pel.peltool.private_header import formatTimestamp
+
+_primarySRCID = SectionID.primarySRC.value
+
+# Offset and size of the commit timestamp in the Private Header: the section
+# header and the create timestamp come before it.
+_commitTimeOffset = SECTION_HEADER.size + 8
+_commitTimeSize = 8
+
+# How much of a PEL file is read first.  Most PELs fit in it, so most files
+# are read with a single call.
+_prefixSize = 4096
+
+# Offset and size of the ASCII string in the SRC section: the section header,
+# the 8 byte SRC header and 8 hex words come before it.
+_srcASCIIOffset = 48
+_srcASCIISize = 32
+
+MAGIC = b'PELCOLS1'
+_headerLength = struct.Struct('<I')
+_alignment = 8
+
+# The summary columns, named as in peltool -l output, and the size of each
+# value in the binary column file.  The SRC is an index into the string
+# table of the column.  The commit time is the decimal number
+# YYYYMMDDhhmmss.
+COLUMNS = OrderedDict([
+    ("EID", 4),
+    ("PLID", 4),
+    ("SRC", 4),
+    ("CreatorID", 1),
+    ("Subsystem", 1),
+    ("Commit Time", 8),
+    ("Sev", 1),
+    ("CompID", 2),
+])
+STRING_COLUMNS = ("SRC",)
+
+
+def _typecode(size: int) -> str:
+    """
+    Returns: the array typecode of unsigned integers of the given size.
+    """
+    for typecode in 'BHILQ':
+        if array.array(typecode).itemsize == size:
+            return typecode
+    raise ValueError(f"No array type of {size} bytes")
+
+
+def readSummaryFields(data: memoryview):
+    """
+    Decodes the summary fields of the PEL at the beginning of data, without
+    parsing any section.
+    Returns: PELHeaders for the filters, reference code of the Primary SRC
+    (empty if there isn't one), commit time and component ID.  None if the
+    data doesn't start with a Private Header and User Header.
+    Raises TruncatedPELError if the PEL doesn't fit in data, or ValueError if
+    a section header is invalid.
+    """
+    if bytes(data[:len(PEL_MAGIC)]) != PEL_MAGIC:
+        return None
+    sections = readSectionHeaders(data)
+    headers = readHeaders(data)
+    if headers is None:
+        return None
+
+    src = ""
+    for offset, sectionID, sectionLen, _, _, _ in sections[2:]:
+        if sectionID == _primarySRCID:
+            if _srcASCIIOffset + _srcASCIISize > sectionLen:
+                raise ValueError(f"Primary SRC too short, {sectionLen} bytes")
+            start = offset + _srcASCIIOffset
+            src = bytes(data[start:start + _srcASCIISize]).decode().strip()
+            break
+
+    commitTime = bytes(data[_commitTimeOffset:
+                            _commitTimeOffset + _commitTimeSize])
+    return headers, src, commitTime, sections[0][5]
+
+
+def readSummaryFile(file: str):
+    """
+    Decodes the summary fields of a PEL file, see readSummaryFields().  Only
+    the start of the file is read, unless the PEL extends past it.  This is
+    quicker than memory mapping the small files most PELs are.
+    """
+    with open(file, 'rb', buffering=0) as fd:
+        data = fd.read(_prefixSize)
+        if len(data) == _prefixSize:
+            try:
+                return readSummaryFields(data)
+            except TruncatedPELError:
+                data += fd.read()
+    return readSummaryFields(data)
+
+
+class CSVSummaryWriter:
+    """
+    Writes PEL summaries as CSV rows, with the values formatted as in
+    peltool -l output.  Each row is written as soon as it's added.
+    """
+
+    def __init__(self, fd):
+        self.writer = csv.writer(fd, lineterminator='\n')
+        self.writer.writerow(COLUMNS.keys())
+        self.compIDs = {}
+
+    def add(self, headers: PELHeaders, src: str, commitTime: bytes,
+            componentID: int) -> None:
+        key = (componentID, headers.creatorID)
+        compID = self.compIDs.get(key)
+        if compID is None:
+            compID = getDisplayCompID(componentID, headers.creatorID)
+            self.compIDs[key] = compID
+
+        self.writer.writerow((
+            "0x{:02X}".format(headers.lEID),
+            "0x{:02X}".format(headers.pLID),
+            src,
+            creatorIDs.get(headers.creatorID, 'Unknown'),
+            subsystemValues.get(headers.eventSubsystem, 'Invalid'),
+            formatTimestamp(commitTime),
+            severityValues.get(headers.eventSeverity, 'Invalid'),
+            compID))
+
+
+class SummaryColumns:
+    """
+    PEL summaries held as one typed array per column, so each PEL only adds
+    a few bytes, written to and read from the binary column file.
+    """
+
+    def __init__(self):
+        self.columns = OrderedDict((name, array.array(_typecode(size)))
+                                   for name, size in COLUMNS.items())
+        self.strings = {name: [] for name in STRING_COLUMNS}
+        self.stringIndex = {name: {} for name in STRING_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["EID"])
+
+    def _stringID(self, name: str, value: str) -> int:
+        index = self.stringIndex[name]
+        id = index.get(value)
+        if id is None:
+            id = index[value] = len(self.strings[name])
+            self.strings[name].append(value)
+        return id
+
+    def add(self, headers: PELHeaders, src: str, commitTime: bytes,
+            componentID: int) -> None:
+        columns = self.columns
+        columns["EID"].append(headers.lEID)
+        columns["PLID"].append(headers.pLID)
+        columns["SRC"].append(self._stringID("SRC", src))
+        columns["CreatorID"].append(ord(headers.creatorID))
+        columns["Subsystem"].append(headers.eventSubsystem)
+        # The BCD digits of the timestamp are the decimal digits, less the
+        # hundredths of a second.  An invalid timestamp is stored as 0.
+        digits = commitTime.hex()[:14]
+        columns["Commit Time"].append(int(digits) if digits.isdigit() else 0)
+        columns["Sev"].append(headers.eventSeverity)
+        columns["CompID"].append(componentID)
+
+    def write(self, fd) -> None:
+        """
+        Writes the binary column file to the binary file object fd.
+        Returns: None
+        """
+        header = json.dumps(OrderedDict([
+            ("rows", len(self)),
+            ("columns", [[name, "<u%d" % size]
+                         for name, size in COLUMNS.items()]),
+            ("strings", self.strings)])).encode()
+        # Pad the header so the first column is aligned.
+        start = len(MAGIC) + _headerLength.size
+        header += b' ' * (-(start + len(header)) % _alignment)
+
+        fd.write(MAGIC)
+        fd.write(_headerLength.pack(len(header)))
+        fd.write(header)
+        for column in self.columns.values():
+            if sys.byteorder == 'big':
+                column = array.array(column.typecode, column)
+                column.byteswap()
+            data = column.tobytes()
+            fd.write(data)
+            fd.write(b'\0' * (-len(data) % _alignment))
+
+
+def _readHeader(data: memoryview):
+    """
+    Returns: header of a binary column file and the offset of its first
+    column.
+    Raises ValueError if data isn't a binary column file.
+    """
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a PEL summary column file")
+    length, = _headerLength.unpack_from(data, len(MAGIC))
+    start = len(MAGIC) + _headerLength.size
+    header = json.loads(bytes(data[start:start + length]))
+    return header, start + length
+
+
+def _columnData(data: memoryview, header: dict, offset: int):
+    """
+    Generator over the columns of a binary column file.
+    Yields: name, NumPy type and data of each column.
+    """
+    rows = header["rows"]
+    for name, dtype in header["columns"]:
+        size = rows * int(dtype[2:])
+        if offset + size > len(data):
+            raise ValueError(f"Truncated column {name}")
+        yield name, dtype, data[offset:offset + size]
+        offset += size + (-size % _alignment)
+
+
+def readSummaryColumns(data: memoryview) -> SummaryColumns:
+    """
+    Reads a binary column file into typed arrays.
+    Returns: SummaryColumns.
+    Raises ValueError if data isn't a valid binary column file.
+    """
+    data = memoryview(data)
+    header, offset = _readHeader(data)
+    columns = SummaryColumns()
+    for name, dtype, column in _columnData(data, header, offset):
+        values = array.array(_typecode(int(dtype[2:])))
+        values.frombytes(column)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        columns.columns[name] = values
+    for name, strings in header["strings"].items():
+        columns.strings[name] = strings
+        columns.stringIndex[name] = {value: id
+                                     for id, value in enumerate(strings)}
+    return columns
+
+
+def loadSummaryColumnsNumPy(data: memoryview) -> dict:
+    """
+    Loads a binary column file as NumPy arrays.  The integer columns share
+    the memory of data, so they aren't copied.  String columns are converted
+    to arrays of strings.
+    Returns: dict of column names to NumPy arrays.
+    Raises ImportError if NumPy isn't installed, ValueError if data isn't a
+    valid binary column file.
+    """
+    import numpy
+
+    data = memoryview(data)
+    header, offset = _readHeader(data)
+    out = OrderedDict()
+    for name, dtype, column in _columnData(data, header, offset):
+        values = numpy.frombuffer(column, dtype=dtype)
+        if name in header["strings"]:
+            values = numpy.array(header["strings"][name])[values]
+        out[name] = values
+    return out
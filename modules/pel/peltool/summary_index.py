@@ -0,0 +1,169 @@
+import json
+import os
+import zlib
+from pel.cache import getCacheDir, getFileKey, isRecentlyModified, \
+    writeCacheFile
+
+
+def _getFileKeys(paths: list) -> dict:
+    """
+    Returns: the file key of each path, see getFileKey().
+    """
+    return {path: getFileKey(path) for path in paths}
+
+
+def _getSRCParserFiles() -> list:
+    """
+    Returns the Python files of the installed SRC parser plugins, which
+    provide the SRC details shown in the summaries, without importing them.
+    """
+    import importlib.util
+    try:
+        spec = importlib.util.find_spec('srcparsers')
+    except (ImportError, ValueError):
+        return []
+    if spec is None:
+        return []
+
+    files = []
+    for location in spec.submodule_search_locations or []:
+        for root, dirs, names in os.walk(location):
+            dirs[:] = sorted(name for name in dirs if name != '__pycache__')
+            files.extend(os.path.join(root, name) for name in sorted(names)
+                         if name.endswith('.py'))
+    return files
+
+
+class SummaryIndex:
+    """
+    A persistent index of PEL summaries for one PEL directory.
+
+    Each entry is keyed by the PEL file name and remembers the size and
+    modification time of the file when it was parsed, along with the
+    Private Header/User Header fields used for filtering and, once a query
+    has selected the PEL, the summary printed by the list options.  Entries
+    are only rebuilt for new or changed files, so repeated queries don't
+    have to re-parse every PEL.  Anything printed to stderr while building
+    an entry is stored with it and printed again each time it's used, so a
+    PEL that fails to parse is reported by every query, not only the first.
+    Files that were modified within the last few seconds aren't stored, as a
+    rewrite might not change their key.
+
+    The summaries also depend on the message registry, the component ID
+    files and the SRC parser plugins.  Those are only checked, with
+    checkSummaries(), by queries that use the summaries, so counting PELs
+    doesn't have to look for them.
+
+    The index is stored in the peltool cache directory, not in the PEL
+    directory itself.
+    """
+
+    VERSION = 4
+
+    def __init__(self, pelDir: str, allowPlugins: bool):
+        self.entries = {}
+        self.dirty = False
+        self.pelDir = pelDir
+        self.allowPlugins = allowPlugins
+        self.summaryContext = None
+        self.path = ''
+
+        cacheDir = getCacheDir()
+        if not cacheDir:
+            return
+
+        # The summaries include plugin output, so keep a separate index per
+        # plugin setting so -P doesn't thrash the cache.
+        realDir = os.path.realpath(pelDir)
+        key = realDir + ('' if allowPlugins else '\0noplugins')
+        name = '%08x' % zlib.crc32(key.encode())
+        self.path = os.path.join(cacheDir, 'summary-' + name + '.json')
+        self.context = {"Version": self.VERSION,
+                        "Directory": realDir,
+                        "Plugins": allowPlugins}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r') as fd:
+                data = json.load(fd)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or \
+                data.get("Context") != self.context:
+            return
+
+        self.entries = data.get("Files", {})
+        self.summaryContext = data.get("SummaryContext")
+
+    def checkSummaries(self) -> None:
+        """
+        Drops the stored summaries if the message registry, component ID
+        files or SRC parser plugins changed since they were built.
+        Returns: None
+        """
+        if not self.path:
+            return
+
+        from pel.peltool.comp_id import getComponentIDFiles
+        from pel.peltool.registry import getRegistryPath
+
+        context = {"Registry": getFileKey(getRegistryPath()),
+                   "CompIDs": _getFileKeys(getComponentIDFiles()),
+                   "SRCParsers": _getFileKeys(_getSRCParserFiles())
+                   if self.allowPlugins else {}}
+        if context == self.summaryContext:
+            return
+
+        for entry in self.entries.values():
+            entry.pop("Summary", None)
+            entry.pop("SummaryErrors", None)
+        self.summaryContext = context
+        self.dirty = True
+    def get(self, file: str) -> dict:
+        """
+        Returns the index entry for the file if it is unchanged since it
+        was indexed, None otherwise.
+        """
+        entry = self.entries.get(file)
+        if entry is None:
+            return None
+
+        if entry["Key"] != getFileKey(os.path.join(self.pelDir, file)):
+            return None
+
+        return entry
+
+    def put(self, file: str, key: list, entry: dict) -> None:
+        """
+        Adds or replaces the entry for the file.  The key must be the file
+        size and modification time from before the file was parsed.  The
+        entry isn't stored if the file was modified too recently.
+        """
+        entry["Key"] = key
+        if isRecentlyModified(key):
+            self.entries.pop(file, None)
+            return
+        self.entries[file] = entry
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        Writes the index back to disk if it changed, dropping entries for
+        PELs that no longer exist.
+        """
+        if not self.path or not self.dirty:
+            return
+
+        try:
+            existing = set(os.listdir(self.pelDir))
+        except OSError:
+            return
+
+        files = {name: entry for name, entry in self.entries.items()
+                 if name in existing}
+        data = {"Context": self.context,
+                "SummaryContext": self.summaryContext, "Files": files}
+        writeCacheFile(self.path, json.dumps(data).encode())
+        self.dirty = False
@@ -1,3 +1,4 @@
+import struct
 from pel.datastream import DataStream
 from collections import OrderedDict
 from pel.peltool.pel_values import actionFlagsValues, subsystemValues, \
@@ -6,6 +7,12 @@ from pel.peltool.pel_types import SeverityValues, ActionFlagsValues
 from pel.peltool.comp_id import getDisplayCompID
 
 
+# The User Header fields after the section header: subsystem, scope,
+# severity, event type, 4 reserved bytes, problem domain, problem vector,
+# action flags and transmission states.
+_userHeaderRecord = struct.Struct('>BBBBIBBHI')
+
+
 class UserHeader:
     """
     This represents the Private Header section in a PEL.  It is required,
@@ -53,15 +60,10 @@ class UserHeader:
         return False
 
     def toJSON(self) -> OrderedDict:
-        self.eventSubsystem = self.stream.get_int(1)
-        self.eventScope = self.stream.get_int(1)
-        self.eventSeverity = self.stream.get_int(1)
-        self.eventType = self.stream.get_int(1)
-        self.reserved4Byte1 = self.stream.get_int(4)
-        self.problemDomain = self.stream.get_int(1)
-        self.problemVector = self.stream.get_int(1)
-        self.actionFlags = self.stream.get_int(2)
-        self.states = self.stream.get_int(4)
+        (self.eventSubsystem, self.eventScope, self.eventSeverity,
+         self.eventType, self.reserved4Byte1, self.problemDomain,
+         self.problemVector, self.actionFlags,
+         self.states) = self.stream.unpack_record(_userHeaderRecord)
 
         list = []
         for key in actionFlagsValues:
@@ -1,6 +1,6 @@
 import json
 from collections import OrderedDict
-from pel.hwdiags.parserdata import ParserData
+from pel.hwdiags.parserdata import parser_data
 
 
 def parseSRCToJson(refcode: str,
@@ -12,7 +12,7 @@ def parseSRCToJson(refcode: str,
 
     out = OrderedDict()
 
-    parser = ParserData()
+    parser = parser_data
 
     # The last byte of the refcode indicates the reason for this PEL. A value of
     # '10' indicates a system checkstop attention. Any other values is secondary
@@ -1,5 +1,29 @@
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 import os
+import sys
+
+
+class BuildPy(build_py):
+    """
+    Also writes the precompiled IO drawer table files next to the IO drawer
+    source files in the build directory.
+    """
+
+    def run(self):
+        super().run()
+        self.tables_files = []
+        if not self.dry_run:
+            sys.path.insert(0, os.path.join(os.path.dirname(__file__),
+                                            'modules'))
+            from io_drawer.tables import write_drawer_tables_files
+            self.tables_files = write_drawer_tables_files(
+                os.path.join(self.build_lib, 'io_drawer'))
+
+    def get_outputs(self, include_bytecode=1):
+        return (super().get_outputs(include_bytecode) +
+                getattr(self, 'tables_files', []))
+
 
 setup(
     name         = "openpower-pel-parsers",
@@ -9,5 +33,6 @@ setup(
     package_dir  = { "": "modules" },
     package_data = { "io_drawer": [ "mex_pte.h", "nimitz_pte.h",
                                     "mexStringFile", "nimitzStringFile" ] },
-    scripts      = ['modules/pel/peltool/peltool.py']
+    scripts      = ['modules/pel/peltool/peltool.py'],
+    cmdclass     = { "build_py": BuildPy }
 )
@@ -1,4 +1,10 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 from collections import OrderedDict
 
@@ -90,3 +96,182 @@ class TestParserData(unittest.TestCase):
         expected["Attn Type"] = exp_attn
 
         self.assertEqual(data, expected)
+
+
+class TestParserDataLoading(unittest.TestCase):
+
+    MODEL_ECS = ['20da0010', '20da0020', '60d20011']
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.dict(
+            os.environ, {'PELTOOL_CACHE_DIR': os.path.join(tmp.name, 'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.data_path = os.path.join(tmp.name, 'data')
+        os.mkdir(self.data_path)
+        self.data_files = {}
+        for i, model_ec in enumerate(self.MODEL_ECS):
+            self._write_data_file('chip_%d.json' % i, model_ec,
+                                  'chip%d' % i)
+
+    def _write_data_file(self, name, model_ec, chip_type):
+        data = {
+            "model_ec": {"id": model_ec, "type": chip_type},
+            "attn_types": {"1": "CHECKSTOP"},
+            "signatures": {"1234": ["SIG_NAME", {"5": "sig desc"}]},
+            "registers": {"000abc": ["REG_NAME", {"0": "00010000"}]},
+        }
+        path = os.path.join(self.data_path, name)
+        with open(path, 'w') as fp:
+            json.dump(data, fp)
+        self.data_files[model_ec] = path
+
+    def _count_opens(self, func):
+        """
+        Calls func and returns its result and the data files it opened.
+        """
+        with mock.patch('builtins.open', wraps=open) as mock_open:
+            result = func()
+        opened = [call.args[0] for call in mock_open.call_args_list
+                  if call.args[0] in self.data_files.values()]
+        return result, opened
+
+    def test_lazy_load(self):
+        # Finding the model_ec of each file reads them all once.
+        parser = ParserData(self.data_path)
+        self.assertEqual(
+            self._count_opens(lambda: parser.query_model_ec('20DA0020')),
+            (True, sorted(self.data_files.values())))
+        self.assertEqual(
+            self._count_opens(lambda: parser.query_model_ec('60d20011')),
+            (True, []))
+
+        # After that, only the queried model_ec's file is read.
+        parser = ParserData(self.data_path)
+        path = self.data_files['20da0020']
+        for i in range(3):
+            self.assertEqual(
+                self._count_opens(lambda: parser.get_signature(
+                    '20da0020', '00010001', '12340005')),
+                (OrderedDict([("Chip Desc", "node 0 chip1 1 (0x20DA0020)"),
+                              ("Signature", "SIG_NAME(0)[5] sig desc"),
+                              ("Attn Type", "CHECKSTOP")]),
+                 [path] if i == 0 else []))
+        self.assertEqual(
+            self._count_opens(lambda: parser.get_reg_data('20DA0020',
+                                                          '000ABC', 0)),
+            (("REG_NAME", "0x00010000"), []))
+        self.assertEqual(
+            self._count_opens(lambda: parser.query_model_ec('11111111')),
+            (False, []))
+
+        # A changed file is read again to find its model_ec.
+        self._write_data_file('chip_0.json', '20da0030', 'new')
+        del self.data_files['20da0010']
+        parser = ParserData(self.data_path)
+        self.assertEqual(
+            self._count_opens(lambda: parser.get_chip_desc('20da0030', 1, 2)),
+            ("node 1 new 2 (0x20DA0030)", [self.data_files['20da0030']]))
+        self.assertFalse(parser.query_model_ec('20da0010'))
+
+    def _check_quiet(self):
+        """
+        Checks that the data files are found, and nothing is printed.
+        """
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+            parser = ParserData(self.data_path)
+            self.assertEqual(parser.get_chip_desc('20da0010', 1, 2),
+                             "node 1 chip0 2 (0x20DA0010)")
+        self.assertEqual(out.getvalue(), '')
+
+    def test_unusable_cache(self):
+        index_path = os.path.join(os.environ['PELTOOL_CACHE_DIR'],
+                                  'hwdiags-index.json')
+
+        # The index can't be written.
+        with mock.patch('os.replace', side_effect=PermissionError):
+            self._check_quiet()
+        self.assertFalse(os.path.exists(index_path))
+
+        # The cache directory can't be created.
+        with open(os.path.join(self.data_path, '..', 'file'), 'w'):
+            pass
+        with mock.patch.dict(os.environ, {'PELTOOL_CACHE_DIR': os.path.join(
+                self.data_path, '..', 'file', 'cache')}):
+            self._check_quiet()
+
+        # A corrupt index is rebuilt.
+        for data in ('not JSON', '[]', '{"Context": null}',
+                     json.dumps({"Context": [ParserData.INDEX_VERSION,
+                                             os.path.realpath(
+                                                 self.data_path)],
+                                 "Files": []})):
+            with open(index_path, 'w') as fp:
+                fp.write(data)
+            self._check_quiet()
+            with open(index_path) as fp:
+                self.assertEqual(len(json.load(fp)["Files"]), 3)
+
+    def test_memoized(self):
+        parser = ParserData(self.data_path)
+        with mock.patch.object(parser, '_get_data',
+                               wraps=parser._get_data) as get_data:
+            for i in range(3):
+                self.assertEqual(parser.get_reg_data('20da0020', '000abc', 0),
+                                 ("REG_NAME", "0x00010000"))
+                self.assertEqual(parser.get_sig_desc('20da0020', '1234', 0,
+                                                     5),
+                                 "SIG_NAME(0)[5] sig desc")
+            self.assertEqual(get_data.call_count, 2)
+
+        # Callers get their own copy of a cached signature.
+        sig = parser.get_signature('20da0020', '00010001', '12340005')
+        sig["Chip Desc"] = "changed"
+        self.assertEqual(
+            parser.get_signature('20da0020', '00010001', '12340005'),
+            OrderedDict([("Chip Desc", "node 0 chip1 1 (0x20DA0020)"),
+                         ("Signature", "SIG_NAME(0)[5] sig desc"),
+                         ("Attn Type", "CHECKSTOP")]))
+
+        # Invalid parameters are still checked.
+        with self.assertRaises(AssertionError):
+            parser.get_reg_data('20da0020', '000abc', 256)
+
+    def test_get_signature_list(self):
+        parser = ParserData(self.data_path)
+        data = bytes.fromhex('00000002'
+                             '60d20011 00020301 12340005'
+                             '60d20011 00020301 99990000')
+        self.assertEqual(parser.get_signature_list(memoryview(data)), [
+            OrderedDict([("Chip Desc", "node 3 chip2 2 (0x60D20011)"),
+                         ("Signature", "SIG_NAME(0)[5] sig desc"),
+                         ("Attn Type", "CHECKSTOP")]),
+            OrderedDict([("Chip Desc", "node 3 chip2 2 (0x60D20011)"),
+                         ("Signature", "id:9999(0)[0] "),
+                         ("Attn Type", "CHECKSTOP")])])
+
+        with self.assertRaises(AssertionError):
+            parser.get_signature_list(memoryview(data[:-1]))
+
+    def test_get_register_dump(self):
+        parser = ParserData(self.data_path)
+        data = bytes.fromhex('00000002'
+                             '20da0010 0004 01 00000002'
+                             '000abc 00 02 1234'
+                             '000abd 01 03 abcdef'
+                             '11111111 0000 00 00000000')
+        dump = parser.get_register_dump(memoryview(data))
+        self.assertEqual(
+            [(chip, [(name, addr, bytes(buf)) for name, addr, buf in regs])
+             for chip, regs in dump],
+            [("node 1 chip0 4 (0x20DA0010)",
+              [("REG_NAME", 0x00010000, b'\x12\x34'),
+               ("id:000ABD inst:1", 0, b'\xab\xcd\xef')]),
+             ("node 0 unknown 0 (0x11111111)", [])])
+
+        with self.assertRaises(AssertionError):
+            parser.get_register_dump(memoryview(data[:-1]))
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from io_drawer.cache import clear_cache, get_cached
+from io_drawer.drawer_type import MEX_DRAWER_TYPE, NIMITZ_DRAWER_TYPE
+from io_drawer.hlog import get_hlog_fields, parse_hlog_data
+from io_drawer.ilog import get_pte_table, parse_ilog_data
+from io_drawer.trace import get_trace_string_file, parse_trace_data
+
+
+class TestCache(unittest.TestCase):
+    """
+    Unit tests for the cache module.
+    """
+
+    def setUp(self):
+        clear_cache()
+        self.addCleanup(clear_cache)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _copy_file(self, file_path: str, age: int = 3600) -> str:
+        """
+        Copies a file to the temporary directory and sets its modification
+        time to age seconds ago.  Returns the path to the copy.
+        """
+        path = os.path.join(self.tmp_dir.name, os.path.basename(file_path))
+        shutil.copyfile(file_path, path)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _count_opens(self, func, paths: list) -> dict:
+        """
+        Calls func and returns the number of times each of the specified
+        files was opened.
+        """
+        with mock.patch('builtins.open', wraps=open) as mock_open:
+            func()
+        counts = {}
+        for call in mock_open.call_args_list:
+            path = call.args[0]
+            if path in paths:
+                counts[path] = counts.get(path, 0) + 1
+        return counts
+
+    def test_definition_files_read_once(self):
+        for drawer_type in (MEX_DRAWER_TYPE, NIMITZ_DRAWER_TYPE):
+            header_file = self._copy_file(drawer_type.get_header_file_path())
+            string_file = self._copy_file(
+                drawer_type.get_trace_string_file_path())
+            data = memoryview(bytes.fromhex('00050001 01040000'))
+
+            def parse():
+                for i in range(3):
+                    parse_ilog_data(data, header_file)
+                    parse_hlog_data(data, header_file)
+                    parse_trace_data(data, string_file)
+
+            # The header file is parsed once for the PTE table and once for
+            # the history log fields
+            paths = [header_file, string_file]
+            counts = self._count_opens(parse, paths)
+            self.assertEqual(counts, {header_file: 2, string_file: 1})
+            self.assertEqual(self._count_opens(parse, paths), {})
+
+            # The cached objects are shared
+            self.assertIs(get_pte_table(header_file),
+                          get_pte_table(header_file))
+            self.assertIs(get_trace_string_file(string_file),
+                          get_trace_string_file(string_file))
+            self.assertEqual(get_hlog_fields(header_file),
+                             get_hlog_fields(header_file))
+
+    def test_changed_file(self):
+        path = os.path.join(self.tmp_dir.name, 'defs.txt')
+
+        def read(path: str) -> str:
+            with open(path) as file:
+                return file.read()
+
+        load = mock.Mock(side_effect=read)
+
+        def write(content: str, mtime: float):
+            with open(path, 'w') as file:
+                file.write(content)
+            os.utime(path, (mtime, mtime))
+
+        # Test where file is unchanged
+        write('first', 1000000)
+        self.assertEqual(get_cached(path, load), 'first')
+        self.assertEqual(get_cached(path, load), 'first')
+        self.assertEqual(load.call_count, 1)
+
+        # Test where modification time changes
+        write('other', 2000000)
+        self.assertEqual(get_cached(path, load), 'other')
+        self.assertEqual(get_cached(path, load), 'other')
+        self.assertEqual(load.call_count, 2)
+
+        # Test where size changes
+        write('changed', 2000000)
+        self.assertEqual(get_cached(path, load), 'changed')
+        self.assertEqual(load.call_count, 3)
+
+        # Test where file was modified too recently to be cached
+        write('recent', time.time())
+        self.assertEqual(get_cached(path, load), 'recent')
+        self.assertEqual(get_cached(path, load), 'recent')
+        self.assertEqual(load.call_count, 5)
+
+        # Test where file does not exist.  Exception from load is not caught.
+        with self.assertRaises(FileNotFoundError):
+            get_cached(os.path.join(self.tmp_dir.name, 'dne.txt'), load)
+
+    def test_clear_cache(self):
+        header_file = self._copy_file(MEX_DRAWER_TYPE.get_header_file_path())
+        string_file = self._copy_file(
+            MEX_DRAWER_TYPE.get_trace_string_file_path())
+        table = get_pte_table(header_file)
+        string_file_obj = get_trace_string_file(string_file)
+
+        # Test where only one file is removed from cache
+        clear_cache(header_file)
+        self.assertIsNot(get_pte_table(header_file), table)
+        self.assertIs(get_trace_string_file(string_file), string_file_obj)
+
+        # Test where all files are removed from cache
+        table = get_pte_table(header_file)
+        clear_cache()
+        self.assertIsNot(get_pte_table(header_file), table)
+        self.assertIsNot(get_trace_string_file(string_file), string_file_obj)
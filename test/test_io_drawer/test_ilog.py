@@ -4,7 +4,8 @@ import tempfile
 import unittest
 
 from io_drawer.drawer_type import MEX_DRAWER_TYPE, NIMITZ_DRAWER_TYPE
-from io_drawer.ilog import PTETableEntry, PTETable, parse_ilog_data
+from io_drawer.ilog import (PTETableEntry, PTETable, parse_ilog_data,
+                            REPORTED_MASK)
 
 
 class TestILogBase(unittest.TestCase):
@@ -259,6 +260,45 @@ class TestPTETable(TestILogBase):
         # Test where matching entry is not found
         self.assertIsNone(table.get_entry(0x0102BEEF))
 
+        # Test where more than one entry matches: First one in table order is
+        # returned, including when the match is on the PTE with the reported
+        # flag removed
+        self._create_header_file([
+            'struct pte_entry_struct static_pte_entry_table[PTE_TABLE_SIZE] = ',
+            '{',
+            '  { "E208****", "VRM fault %d", {4}, "vrm.cpp", 100 },',
+            '  { "E24C0001", "Reported fault", {}, "vrm.cpp", 110 },',
+            '  { "E24*0001", "Any fault", {}, "vrm.cpp", 120 },',
+            '  { "E2080001", "Unreachable", {}, "vrm.cpp", 130 },',
+            '  { ""        , "The End" }',
+            '};'
+        ])
+        table = PTETable(self.header_file_path)
+        self.assertIs(table.get_entry(0xE2080001), table.entries[0])
+        self.assertIs(table.get_entry(0xE24C0001), table.entries[1])
+        self.assertIs(table.get_entry(0xE24D0001), table.entries[2])
+        self.assertIs(table.get_entry(0xE20C0001), table.entries[0])
+
+        # Test where an entry is added after a lookup, and where the pattern
+        # cannot be expressed as a mask and value
+        self.assertIsNone(table.get_entry(0x01040000))
+        table._add_entry(('0104000', 'Short pattern', '', 'a.cpp', '1'))
+        table._add_entry(('01040000', 'Power on complete', '', 'a.cpp', '2'))
+        self.assertIs(table.get_entry(0x01040000), table.entries[5])
+        table.entries.insert(0, PTETableEntry('0104.000', 'Dot pattern', (),
+                                              'a.cpp', 3))
+        self.assertIs(table.get_entry(0x01040000), table.entries[0])
+
+        # Test that results match a linear search of the full MEX table
+        table = PTETable(MEX_DRAWER_TYPE.get_header_file_path())
+        ptes = [entry.pte_value | (n * 0x01010101 & ~entry.pte_mask)
+                for entry in table.entries for n in (0, 0x5A, 0xFF)]
+        ptes += [pte | REPORTED_MASK for pte in ptes]
+        for pte in ptes:
+            expected = next((entry for entry in table.entries
+                             if entry.matches(pte)), None)
+            self.assertIs(table.get_entry(pte), expected)
+
     def test__add_entry(self):
         # Create empty header file and empty PTE table
         self._create_header_file([''])
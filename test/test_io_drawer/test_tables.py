@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import io_drawer.hlog
+import io_drawer.ilog
+import io_drawer.trace
+from io_drawer.drawer_type import DRAWER_TYPES
+from io_drawer.hlog import get_hlog_fields
+from io_drawer.ilog import PTETable
+from io_drawer.tables import (PTE_TABLE, TRACE_STRINGS, get_tables_file_path,
+                              load_table, write_drawer_tables_files,
+                              write_tables_file)
+from io_drawer.trace import TraceStringFile
+
+
+class TestTables(unittest.TestCase):
+    """
+    Unit tests for the tables module.
+    """
+
+    def setUp(self):
+        # Copy the drawer type source files to a temporary directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.source_files = []
+        for drawer_type in DRAWER_TYPES:
+            for path in (drawer_type.get_header_file_path(),
+                         drawer_type.get_trace_string_file_path()):
+                copy = os.path.join(self.tmp_dir.name, os.path.basename(path))
+                shutil.copyfile(path, copy)
+                self.source_files.append(copy)
+
+    def _get_tables(self) -> list:
+        """
+        Returns the tables from each drawer type source file in the temporary
+        directory.
+        """
+        tables = []
+        for path in self.source_files:
+            if path.endswith('.h'):
+                table = PTETable(path)
+                tables.append([(e.pte_pattern, e.message_format, e.params,
+                                e.file, e.line) for e in table.entries])
+                tables.append(get_hlog_fields(path))
+            else:
+                string_file = TraceStringFile(path)
+                tables.append([(s.hash_value, s.message_format, s.location)
+                               for s in string_file.trace_strings])
+        return tables
+
+    def test_write_drawer_tables_files(self):
+        expected = self._get_tables()
+
+        paths = write_drawer_tables_files(self.tmp_dir.name)
+        self.assertEqual(paths, [get_tables_file_path(path)
+                                 for path in self.source_files])
+
+        # Test that tables are loaded from the precompiled files without
+        # parsing the source files
+        with mock.patch.object(io_drawer.ilog, 'read_pte_table_fields') \
+                as read_pte_table, \
+             mock.patch.object(io_drawer.hlog, 'read_hlog_field_definitions') \
+                as read_hlog_fields, \
+             mock.patch.object(io_drawer.trace, 'read_trace_string_fields') \
+                as read_trace_strings:
+            self.assertEqual(self._get_tables(), expected)
+        read_pte_table.assert_not_called()
+        read_hlog_fields.assert_not_called()
+        read_trace_strings.assert_not_called()
+
+    def test_load_table(self):
+        path = self.source_files[0]
+        fields = [('010000**', 'Begin power on', '4', 'states.cpp', '485')]
+
+        # Test where precompiled file does not exist
+        self.assertIsNone(load_table(path, PTE_TABLE))
+
+        # Test where precompiled file is valid
+        write_tables_file(path, {PTE_TABLE: fields})
+        self.assertEqual(load_table(path, PTE_TABLE), fields)
+
+        # Test where precompiled file does not contain the table
+        self.assertIsNone(load_table(path, TRACE_STRINGS))
+
+        # Test where source file has changed
+        with open(path, 'a') as file:
+            file.write('\n')
+        self.assertIsNone(load_table(path, PTE_TABLE))
+        self.assertTrue(len(PTETable(path).entries) > 600)
+
+        # Test where source file does not exist
+        write_tables_file(path, {PTE_TABLE: fields})
+        os.remove(path)
+        self.assertIsNone(load_table(path, PTE_TABLE))
+
+        # Test where precompiled file is not valid
+        path = self.source_files[1]
+        with open(get_tables_file_path(path), 'wb') as file:
+            file.write(b'not a tables file')
+        self.assertIsNone(load_table(path, TRACE_STRINGS))
+        self.assertTrue(len(TraceStringFile(path).trace_strings) > 700)
@@ -268,6 +268,24 @@ class TestTraceStringFile(TestTraceBase):
         # Test where matching trace string is not found
         self.assertIsNone(file.get_trace_string(103402746))
 
+        # Create dummy string file with duplicate and partially matching hash
+        # values
+        self._create_string_file([
+            '103402736||First exact||fans_mgr.cpp(1034)',
+            '103402736||Second exact||fans_mgr.cpp(1034)',
+            '97802736||First partial||fans_mgr.cpp(978)',
+            '12302736||Last partial||fans_mgr.cpp(123)'
+        ])
+        file = TraceStringFile(self.string_file_path)
+
+        # Test where exact match exists: First exact match wins
+        self.assertEqual(file.get_trace_string(103402736).message_format,
+                         'First exact')
+
+        # Test where only partial matches exist: Last partial match wins
+        self.assertEqual(file.get_trace_string(55502736).message_format,
+                         'Last partial')
+
     def test__add_trace_string(self):
         # Create empty string file and load it
         self._create_string_file([''])
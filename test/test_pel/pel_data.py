@@ -0,0 +1,102 @@
+"""
+Helpers to build small, valid PELs for unit tests.
+"""
+
+import struct
+
+
+def build_section(section_id: str, body: bytes, version: int = 1,
+                  sub_type: int = 0, comp_id: int = 0x2000) -> bytes:
+    """
+    Returns a PEL section with the standard 8 byte section header.
+    """
+    return struct.pack('>2sHBBH', section_id.encode(), 8 + len(body),
+                       version, sub_type, comp_id) + body
+
+
+def build_src(refcode: str = 'BD8D1001', words: tuple = (0,) * 8,
+              callouts: list = None) -> bytes:
+    """
+    Returns a Primary SRC section, with a callouts subsection if any callouts
+    built by build_callout() are given.
+    """
+    subsection = b''
+    if callouts:
+        subsection = b''.join(callouts)
+        subsection = struct.pack('>BBH', 0xC0, 0, 1 + len(subsection) // 4) + \
+            subsection
+    body = struct.pack('>BBBBHH', 0x02, 1 if callouts else 0, 0, 9, 0,
+                       72 + len(subsection))
+    body += struct.pack('>8I', *words)
+    body += refcode.encode().ljust(32)
+    return build_section('PS', body + subsection, sub_type=1)
+
+
+def build_callout(priority: str = 'H', location: str = '',
+                  pn: str = None, procedure: str = None, ccin: str = None,
+                  sn: str = None, mrus: list = None) -> bytes:
+    """
+    Returns an SRC callout with a FRU identity structure and, if MRUs are
+    given as (priority, ID) tuples, an MRU structure.
+    """
+    location = location.encode()
+    location += b'\0' * (-len(location) % 4) if location else b''
+
+    flags = 0x10
+    fru = b''
+    if pn is not None or procedure is not None:
+        flags |= 0x08 if pn is not None else 0x02
+        fru += (pn if pn is not None else procedure).encode().ljust(8, b'\0')
+    if ccin is not None:
+        flags |= 0x04
+        fru += ccin.encode().ljust(4, b'\0')
+    if sn is not None:
+        flags |= 0x01
+        fru += sn.encode().ljust(12, b'\0')
+    fru = struct.pack('>HBB', 0x4944, 4 + len(fru), flags) + fru
+
+    mru = b''
+    if mrus:
+        mru = struct.pack('>HBBI', 0x4D52, 8 + 8 * len(mrus), len(mrus), 0)
+        for mru_priority, mru_id in mrus:
+            mru += struct.pack('>II', mru_priority, mru_id)
+
+    size = 4 + len(location) + len(fru) + len(mru)
+    return struct.pack('>BBcB', size, 0, priority.encode(), len(location)) + \
+        location + fru + mru
+
+
+def build_user_data(data: bytes, sub_type: int = 1,
+                    comp_id: int = 0x2000) -> bytes:
+    """
+    Returns a User Data section.  Pads the data to a 4 byte boundary.
+    """
+    data += b'\0' * (-len(data) % 4)
+    return build_section('UD', data, sub_type=sub_type, comp_id=comp_id)
+
+
+def build_pel(eid: int = 0x50000001, plid: int = None, creator: str = 'O',
+              severity: int = 0x40, action_flags: int = 0x2000,
+              subsystem: int = 0x10, obmc_log_id: int = 1,
+              refcode: str = 'BD8D1001', sections: list = None,
+              callouts: list = None) -> bytes:
+    """
+    Returns a PEL with a Private Header, User Header, Primary SRC, with any
+    callouts given, and any additional sections given.
+    """
+    if plid is None:
+        plid = eid
+
+    if sections is None:
+        sections = []
+    sections = [build_src(refcode, callouts=callouts)] + sections
+
+    timestamp = bytes.fromhex('2022030818402700')
+    ph = timestamp + timestamp
+    ph += struct.pack('>cxxBIQII', creator.encode(), 2 + len(sections),
+                      obmc_log_id, 0, plid, eid)
+    uh = struct.pack('>BBBBIBBHI', subsystem, 0x03, severity, 0, 0, 0, 0,
+                     action_flags, 0)
+
+    return build_section('PH', ph) + build_section('UH', uh) + \
+        b''.join(sections)
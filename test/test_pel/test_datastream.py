@@ -1,3 +1,4 @@
+import struct
 import unittest
 
 from pel.datastream import DataStream
@@ -32,3 +33,24 @@ class TestDataStream(unittest.TestCase):
         # attempt to access out of bounds
         with self.assertRaises(AssertionError):
             s.get_mem(1)
+
+    def test_unpack(self):
+        s = DataStream(self.data, byte_order='big', is_signed=False)
+
+        # unpacks fields and advances past them
+        self.assertEqual((0xf0f1, 0xf2, b'\xf3\xf4'), s.unpack('>HB2s'))
+        self.assertEqual(5, s.index)
+
+        # attempt to unpack beyond the end of the data
+        with self.assertRaises(AssertionError):
+            s.unpack('>I')
+        self.assertEqual(5, s.index)
+
+    def test_unpack_record(self):
+        s = DataStream(self.data, byte_order='big', is_signed=False)
+        record = struct.Struct('>HH')
+
+        self.assertEqual((0xf0f1, 0xf2f3), s.unpack_record(record))
+        self.assertEqual((0xf4f5, 0xf6f7), s.unpack_record(record))
+        with self.assertRaises(AssertionError):
+            s.unpack_record(record)
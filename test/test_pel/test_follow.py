@@ -0,0 +1,171 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.follow import (InotifyWatcher, PollingWatcher,
+                                followPELFiles, isCompletePEL)
+
+from test_pel.pel_data import build_pel
+
+
+def write(path: str, data: bytes) -> None:
+    with open(path, 'wb') as fd:
+        fd.write(data)
+
+
+class TestFollow(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.pel = build_pel(eid=0x50000001)
+
+    def test_is_complete_pel(self):
+        file = os.path.join(self.dir, 'pel')
+        write(file, self.pel)
+        self.assertTrue(isCompletePEL(file))
+
+        write(file, self.pel[:40])
+        self.assertFalse(isCompletePEL(file))
+
+        write(file, b'not a PEL')
+        self.assertTrue(isCompletePEL(file))
+
+        # A complete PEL with a corrupt section length won't be completed by
+        # further writes, so it's reported and the parser shows the error.
+        pel = bytearray(self.pel)
+        pel[74:76] = (4).to_bytes(2, 'big')
+        write(file, pel)
+        self.assertTrue(isCompletePEL(file))
+
+        self.assertFalse(isCompletePEL(os.path.join(self.dir, 'missing')))
+
+    def _checkWatcher(self, watcher):
+        self.addCleanup(watcher.close)
+        self.assertEqual(watcher.read(0.1), [])
+
+        write(os.path.join(self.dir, 'a'), self.pel)
+        self.assertEqual(watcher.read(2), ['a'])
+
+        os.remove(os.path.join(self.dir, 'a'))
+        self.assertEqual(watcher.read(2), ['a'])
+
+    def test_polling_watcher(self):
+        self._checkWatcher(PollingWatcher(self.dir, 0.01))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher(self.dir)
+        except OSError:
+            self.skipTest("inotify is not available")
+        self._checkWatcher(watcher)
+
+    def _follow(self, watcher, extension: str = None):
+        """
+        Runs followPELFiles() with the watcher in a thread, which ends when
+        the directory is removed.
+        Returns: the thread and the list of files it reports.
+        """
+        files = []
+        follower = followPELFiles(self.dir, extension, 0.01, watcher)
+
+        def run():
+            for file in follower:
+                files.append(os.path.basename(file))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, files
+
+    def _waitFor(self, files: list, count: int):
+        for _ in range(200):
+            if len(files) >= count:
+                return
+            threading.Event().wait(0.01)
+
+    def _checkFollow(self, watcher):
+        write(os.path.join(self.dir, 'old'), self.pel)
+        thread, files = self._follow(watcher)
+
+        # A PEL written in two parts is only reported once it's complete.
+        part = os.path.join(self.dir, 'new')
+        write(part, self.pel[:40])
+        threading.Event().wait(0.1)
+        self.assertEqual(files, [])
+        write(part, self.pel)
+        self._waitFor(files, 1)
+        self.assertEqual(files, ['new'])
+
+        # Rewriting a reported file doesn't report it again.
+        write(part, self.pel)
+        write(os.path.join(self.dir, 'junk'), b'not a PEL')
+        self._waitFor(files, 2)
+
+        shutil.rmtree(self.dir)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(files, ['new', 'junk'])
+
+    def test_follow_polling(self):
+        self._checkFollow(PollingWatcher(self.dir, 0.01))
+
+    def test_follow_inotify(self):
+        try:
+            watcher = InotifyWatcher(self.dir)
+        except OSError:
+            self.skipTest("inotify is not available")
+        self._checkFollow(watcher)
+
+    def test_follow_file_created_while_watching_starts(self):
+        def openWatcher(path, interval):
+            # The polling watcher's first scan includes the file, so only
+            # reading the directory again finds it.
+            write(os.path.join(self.dir, 'gap'), self.pel)
+            return PollingWatcher(path, interval)
+
+        write(os.path.join(self.dir, 'old'), self.pel)
+        with mock.patch('pel.peltool.follow.openWatcher', openWatcher):
+            thread, files = self._follow(None)
+        self._waitFor(files, 1)
+        shutil.rmtree(self.dir)
+        thread.join(5)
+        self.assertEqual(files, ['gap'])
+
+    def test_follow_extension(self):
+        thread, files = self._follow(PollingWatcher(self.dir, 0.01), '.pel')
+        write(os.path.join(self.dir, 'a.txt'), self.pel)
+        write(os.path.join(self.dir, 'b.pel'), self.pel)
+        self._waitFor(files, 1)
+        shutil.rmtree(self.dir)
+        thread.join(5)
+        self.assertEqual(files, ['b.pel'])
+
+    def test_follow_pels(self):
+        config = Config()
+        config.every_pel = True
+        files = [os.path.join(self.dir, name) for name in ('a', 'b')]
+        write(files[0], self.pel)
+        write(files[1], build_pel(eid=0x50000002, severity=0x00))
+
+        for mode in ('list', 'all'):
+            config.every_pel = mode == 'all'
+            out = io.StringIO()
+            with mock.patch('pel.peltool.follow.followPELFiles',
+                            return_value=iter(files)), \
+                    contextlib.redirect_stdout(out):
+                peltool.followPELs(self.dir, config, mode)
+            text = out.getvalue()
+            self.assertIn('0x50000001', text)
+            # The informational PEL is filtered out unless -E is used.
+            self.assertEqual('0x50000002' in text, config.every_pel)
+
+
+if __name__ == '__main__':
+    unittest.main()
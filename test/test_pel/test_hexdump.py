@@ -1,6 +1,6 @@
 import unittest
 
-from pel.hexdump import hexdump, parse
+from pel.hexdump import _compile_line_format, hexdump, parse
 
 
 class TestHexDump(unittest.TestCase):
@@ -59,6 +59,16 @@ class TestHexDump(unittest.TestCase):
         with self.assertRaises(Exception):
             lines = hexdump(data, bytes_per_line=8, bytes_per_chunk=257)
 
+    def test_hexdump_partial_chunks(self):
+        # Line size is not a multiple of the chunk size, so the last chunk of
+        # each line is short.
+        data = memoryview(bytes(range(0x1e, 0x32)) + b'\x7e\x7f\xff')
+        lines = hexdump(data, bytes_per_line=10, bytes_per_chunk=4)
+        self.assertEqual(lines, [
+            '00000000     1E1F2021  22232425  2627     .. !"#$%&\'',
+            '0000000A     28292A2B  2C2D2E2F  3031     ()*+,-./01',
+            '00000014     7E7FFF                       ~..       '])
+
     def test_parse(self):
         # Test with default line format: Less than one full line of data
         lines = [
@@ -179,3 +189,32 @@ class TestHexDump(unittest.TestCase):
         expected_data = memoryview(b'')
         data = parse(lines, line_format)
         self.assertEqual(data, expected_data)
+
+    def test_parse_line_format(self):
+        line_format = 'AAAA DDDD DDDD CCCC'
+        self.assertIsNotNone(_compile_line_format(line_format))
+
+        # Short final line, including one that ends in the middle of a byte
+        lines = ['0000 0102 0304 ....', '0004 05']
+        self.assertEqual(parse(lines, line_format), b'\x01\x02\x03\x04\x05')
+        lines = ['0000 0102 0304 ....', '0004 050']
+        self.assertEqual(parse(lines, line_format), b'\x01\x02\x03\x04\x05')
+
+        # Lines longer than the format are ignored
+        lines = ['0000 0102 0304 ....', '0004 0506 0708 ....extra']
+        self.assertEqual(parse(lines, line_format), b'\x01\x02\x03\x04')
+
+        # Non-hex data characters end the line, keeping the bytes before
+        # them.  Lowercase digits are accepted.
+        lines = ['0000 01G2 0304 ....', '0004 abcd ef01 ....']
+        self.assertEqual(parse(lines, line_format), b'\x01\xab\xcd\xef\x01')
+        lines = ['000X 0102 0304 ....']
+        self.assertEqual(parse(lines, line_format), b'')
+
+        # A format with an odd-length run of data digits can't be matched
+        # with a regular expression, so every line is parsed a character at
+        # a time.  The last digit of the run is dropped.
+        line_format = 'AA DDD'
+        self.assertIsNone(_compile_line_format(line_format))
+        lines = ['00 ABC', '01 DEF', '02 12']
+        self.assertEqual(parse(lines, line_format), b'\xab\xde\x12')
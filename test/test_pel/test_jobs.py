@@ -0,0 +1,125 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from test_pel.pel_data import build_pel, build_user_data
+
+MODULES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                           '..', '..', 'modules'))
+PELTOOL = os.path.join(MODULES_DIR, 'pel', 'peltool', 'peltool.py')
+
+
+class TestJobs(unittest.TestCase):
+    """
+    Checks that --jobs gives the same output as parsing the PELs in one
+    process.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.pels = os.path.join(self.dir, 'pels')
+        os.mkdir(self.pels)
+
+        pels = [build_pel(eid=0x50000000 + i, severity=0x40 if i % 3 else 0,
+                          sections=[build_user_data(b'{"Key": %d}' % i)])
+                for i in range(1, 13)]
+        # Errors are reported, in order, by the workers.
+        pels.append(build_pel(eid=0x50000020)[:100])
+        pels.append(b'not a PEL')
+        # The index doesn't store files modified in the last few seconds.
+        mtime = time.time() - 10
+        for i, pel in enumerate(pels):
+            path = os.path.join(self.pels, 'pel%02d' % i)
+            with open(path, 'wb') as fd:
+                fd.write(pel)
+            os.utime(path, (mtime, mtime))
+
+    def _run(self, args: list, name: str):
+        """
+        Runs peltool with its own cache directory.
+        Returns: stdout, stderr and the saved summary indexes.
+        """
+        cache = os.path.join(self.dir, name)
+        env = dict(os.environ, PYTHONPATH=MODULES_DIR,
+                   PELTOOL_CACHE_DIR=cache)
+        result = subprocess.run([sys.executable, PELTOOL, '-p', self.pels] +
+                                args, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        indexes = {}
+        if os.path.isdir(cache):
+            for file in os.listdir(cache):
+                if file.startswith('summary-'):
+                    with open(os.path.join(cache, file)) as fd:
+                        indexes[file] = json.load(fd)
+        return result.stdout, result.stderr, indexes
+
+    def _outputs(self, outputDir: str) -> dict:
+        outputs = {}
+        for file in os.listdir(outputDir):
+            with open(os.path.join(outputDir, file)) as fd:
+                outputs[file] = fd.read()
+        return outputs
+
+    def test_jobs_match_sequential(self):
+        for options in (['-a'], ['-l'], ['-j']):
+            for reverse in ([], ['-r']):
+                args = options + reverse
+                with self.subTest(args=args):
+                    name = ''.join(args)
+                    outputs = {}
+                    for jobs in ([], ['--jobs', '3']):
+                        run = name + ''.join(jobs)
+                        runArgs = args + jobs
+                        if options == ['-j']:
+                            outputDir = os.path.join(self.dir, run + '-out')
+                            os.mkdir(outputDir)
+                            runArgs = runArgs + ['-o', outputDir]
+                        outputs[bool(jobs)] = self._run(runArgs, run)
+                        if options == ['-j']:
+                            outputs[bool(jobs)] += (
+                                self._outputs(outputDir),)
+
+                    self.assertEqual(outputs[True], outputs[False])
+                    if options == ['-l']:
+                        _, _, indexes = outputs[False]
+                        self.assertEqual(len(indexes), 1)
+                    if options == ['-j']:
+                        self.assertEqual(len(outputs[False][3]), 8)
+
+    def test_user_data_cache_stats(self):
+        # Every PEL has the same user data, so it is only parsed once per
+        # process.
+        shutil.rmtree(self.pels)
+        os.mkdir(self.pels)
+        for i in range(8):
+            with open(os.path.join(self.pels, 'pel%02d' % i), 'wb') as fd:
+                fd.write(build_pel(eid=0x50000100 + i, sections=[
+                    build_user_data(b'{"Key": "Same"}')]))
+
+        stats = {}
+        for jobs in ([], ['--jobs', '2']):
+            _, err, _ = self._run(['-a', '--user-data-cache', '100'] + jobs,
+                                  'cache' + ''.join(jobs))
+            match = re.search(r'User data parse cache: (\d+) hits, '
+                              r'(\d+) misses', err)
+            self.assertIsNotNone(match, err)
+            stats[bool(jobs)] = int(match.group(1)), int(match.group(2))
+
+        self.assertEqual(stats[False], (7, 1))
+        # Each worker has its own cache, so there may be a miss per worker,
+        # but the lookups of every worker are counted.
+        hits, misses = stats[True]
+        self.assertEqual(hits + misses, 8)
+        self.assertIn(misses, (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
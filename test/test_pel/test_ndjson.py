@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+
+from test_pel.pel_data import build_pel
+
+
+class TestNDJSON(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        os.environ['PELTOOL_CACHE_DIR'] = os.path.join(self.dir, 'cache')
+        self.addCleanup(os.environ.pop, 'PELTOOL_CACHE_DIR')
+        self.pels = os.path.join(self.dir, 'pels')
+        os.mkdir(self.pels)
+        pels = [build_pel(eid=0x50000001, refcode='BD8D1001'),
+                build_pel(eid=0x50000002, plid=0x50000001,
+                          refcode='BD8D1002'),
+                build_pel(eid=0x50000003, refcode='BD001003')]
+        for i, pel in enumerate(pels):
+            with open(os.path.join(self.pels, f'pel{i}'), 'wb') as fd:
+                fd.write(pel)
+
+    def _run(self, func, config: Config) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            func(self.pels, config)
+        return out.getvalue()
+
+    def _compare(self, func, **options):
+        """
+        Runs func with JSON and NDJSON output.
+        Returns: the JSON output and the objects on each NDJSON line.
+        """
+        config = Config()
+        for name, value in options.items():
+            setattr(config, name, value)
+        expected = json.loads(self._run(func, config),
+                              object_pairs_hook=OrderedDict)
+
+        config.output = 'ndjson'
+        lines = self._run(func, config).splitlines()
+        for line in lines:
+            # Compact, without indentation or alignment.
+            self.assertNotIn(': ', line)
+        return expected, [json.loads(line, object_pairs_hook=OrderedDict)
+                          for line in lines]
+
+    def _checkSummaries(self, expected: dict, records: list):
+        self.assertEqual(len(records), len(expected))
+        for record, (eid, summary) in zip(records, expected.items()):
+            self.assertEqual(list(record.items()),
+                             [("EID", eid)] + list(summary.items()))
+
+    def test_write_ndjson(self):
+        out = io.StringIO()
+        peltool.writeNDJSON(OrderedDict([("b", 1), ("a", "x\ny")]), out)
+        self.assertEqual(out.getvalue(), '{"b":1,"a":"x\\ny"}\n')
+
+    def test_list(self):
+        self._checkSummaries(*self._compare(peltool.listOption))
+        # Compact list mode doesn't apply to NDJSON.
+        _, records = self._compare(peltool.listOption, compact=True)
+        self.assertEqual(len(records), 3)
+
+    def test_all(self):
+        expected, records = self._compare(peltool.extractAllPELsData)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records, expected)
+
+    def test_plid(self):
+        expected, records = self._compare(peltool.parsePelFromPLID,
+                                          plid='50000001')
+        self.assertEqual(len(records), 2)
+        self._checkSummaries(expected, records)
+
+    def test_src(self):
+        expected, records = self._compare(peltool.parsePelFromSRCID,
+                                          src='BD8D')
+        self.assertEqual(len(records), 2)
+        self._checkSummaries(expected, records)
+
+        expected, records = self._compare(peltool.parsePelDataFromSRCID,
+                                          src='BD8D')
+        self.assertEqual(records, list(expected.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+from pel.peltool.config import Config
+from pel.peltool.parse_user_data import ParseUserData, parseCache
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        parseCache.clear()
+        self.addCleanup(parseCache.clear)
+        self.config = Config()
+        self.config.user_data_cache_size = 2
+
+    def _parse(self, data: bytes, version: int = 1,
+               config: Config = None) -> str:
+        parser = ParseUserData('O', 0x2000, 3, version, memoryview(data))
+        return parser.parse(config or self.config)
+
+    def test_cache(self):
+        with mock.patch.object(ParseUserData, 'parseData', autospec=True,
+                               side_effect=ParseUserData.parseData) as parse:
+            # Test where identical data is parsed once
+            self.assertEqual(self._parse(b'first'), '["first"]')
+            self.assertEqual(self._parse(b'first'), '["first"]')
+            self.assertEqual(parse.call_count, 1)
+            self.assertEqual((parseCache.hits, parseCache.misses), (1, 1))
+
+            # Test where the data or header fields differ
+            self.assertEqual(self._parse(b'other'), '["other"]')
+            self.assertEqual(self._parse(b'first', version=2), '["first"]')
+            self.assertEqual(parse.call_count, 3)
+
+            # Test where the least recently used result was dropped
+            self.assertEqual(self._parse(b'first'), '["first"]')
+            self.assertEqual(parse.call_count, 4)
+            self.assertEqual((parseCache.hits, parseCache.misses), (1, 4))
+            self.assertEqual(len(parseCache.results), 2)
+
+    def test_disabled(self):
+        config = Config()
+        with mock.patch.object(ParseUserData, 'parseData', autospec=True,
+                               side_effect=ParseUserData.parseData) as parse:
+            self._parse(b'first', config=config)
+            self._parse(b'first', config=config)
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual((parseCache.hits, parseCache.misses), (0, 0))
+        self.assertEqual(len(parseCache.results), 0)
+
+    def test_plugins_in_key(self):
+        config = Config()
+        config.user_data_cache_size = 10
+        config.allow_plugins = False
+        parser = ParseUserData('H', 0x1000, 1, 1, memoryview(b'data'))
+        without_plugins = parser.parse(config)
+        config.allow_plugins = True
+        parser.parse(config)
+        self.assertEqual(parseCache.misses, 2)
+        config.allow_plugins = False
+        self.assertEqual(parser.parse(config), without_plugins)
+        self.assertEqual(parseCache.hits, 1)
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import pel
+from pel.datastream import DataStream
+from pel.peltool import parsed_pel
+from pel.peltool.config import Config
+from pel.peltool.peltool import parsePEL
+from pel.peltool.private_header import PrivateHeader
+from pel.peltool.src import SRC
+from pel.peltool.user_data import UserData
+from pel.peltool.user_header import UserHeader
+
+from test_pel.pel_data import build_callout, build_pel, build_user_data
+
+
+class TestParsedPEL(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config()
+        self.config.allow_plugins = False
+        self.config.every_pel = True
+        self.data = build_pel(
+            eid=0x50000010, refcode='BD8D1002',
+            callouts=[build_callout('H', 'P0', pn='01AB234')],
+            sections=[build_user_data(b'{"Key": "A"}'),
+                      build_user_data(b'{"Key": "B"}')])
+
+    def test_parse(self):
+        log = pel.parse(self.data, self.config)
+
+        self.assertEqual(log.eid, '50000010')
+        self.assertEqual(log.referenceCode, 'BD8D1002')
+        self.assertIsInstance(log.privateHeader, PrivateHeader)
+        self.assertIsInstance(log.userHeader, UserHeader)
+
+        self.assertEqual([s.name for s in log.sections],
+                         ['Private Header', 'User Header', 'Primary SRC',
+                          'User Data 0', 'User Data 1'])
+        self.assertEqual([type(s.section) for s in log.sections],
+                         [PrivateHeader, UserHeader, SRC, UserData, UserData])
+        self.assertEqual([s.sectionID for s in log.sections],
+                         [0x5048, 0x5548, 0x5053, 0x5544, 0x5544])
+        self.assertEqual(log.sections[4].data['Key'], 'B')
+        self.assertIs(log.toDict()['User Data 1'], log.sections[4].data)
+
+        # The JSON text matches parsePEL() and is only rendered once
+        stream = DataStream(self.data, byte_order='big', is_signed=False)
+        _, expected = parsePEL(stream, self.config, False)
+        with mock.patch.object(parsed_pel.json, 'dumps',
+                               wraps=parsed_pel.json.dumps) as dumps:
+            self.assertEqual(log.toJSON(), expected)
+            self.assertEqual(log.toJSON(), expected)
+        self.assertEqual(dumps.call_count, 1)
+
+    def test_default_config(self):
+        # Non-serviceable PELs are parsed unless a config excludes them
+        data = build_pel(action_flags=0)
+        self.assertEqual(pel.parse(data).eid, '50000001')
+        self.assertIsNone(pel.parse(data, Config()))
+
+    def test_not_a_pel(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertIsNone(pel.parse(b'UH' + self.data[2:]))
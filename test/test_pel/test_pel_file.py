@@ -0,0 +1,73 @@
+import mmap
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pel.peltool.config import Config
+from pel.peltool.pel_file import openPELFile
+from pel.peltool.peltool import parsePELFile
+
+from test_pel.pel_data import build_callout, build_pel, build_user_data
+
+
+class TestPELFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = os.path.join(self.tmp_dir.name, 'pel')
+        with open(path, 'wb') as fd:
+            fd.write(data)
+        return path
+
+    def test_mapped(self):
+        data = build_pel()
+        path = self._write(data)
+
+        with openPELFile(path) as view:
+            self.assertIsInstance(view.obj, mmap.mmap)
+            self.assertTrue(view.readonly)
+            self.assertEqual(view, data)
+            mapping = view.obj
+            part = view[0:8]
+        self.assertFalse(mapping.closed)
+        self.assertEqual(part, data[0:8])
+
+        with openPELFile(path) as view:
+            mapping = view.obj
+        self.assertTrue(mapping.closed)
+
+    def test_read_fallback(self):
+        data = build_pel()
+        path = self._write(data)
+
+        # Test where the file system doesn't support mmap
+        with mock.patch('mmap.mmap', side_effect=OSError):
+            with openPELFile(path) as view:
+                self.assertIsInstance(view.obj, bytes)
+                self.assertEqual(view, data)
+
+        # Test where the file is empty, which cannot be mapped
+        path = self._write(b'')
+        with openPELFile(path) as view:
+            self.assertEqual(len(view), 0)
+
+    def test_parse(self):
+        callouts = [build_callout('H', 'U78DA.ND0.1234567-P0', pn='01AB234',
+                                  ccin='2E2D', sn='YL10UF12345')]
+        user_data = build_user_data(b'{"Key": "Value"}\0')
+        path = self._write(build_pel(callouts=callouts,
+                                     sections=[user_data]))
+
+        config = Config()
+        config.allow_plugins = False
+        expected = parsePELFile(path, config)
+        with mock.patch('mmap.mmap', side_effect=OSError):
+            self.assertEqual(parsePELFile(path, config), expected)
+
+        callout = expected["Primary SRC"]["Callout Section"]["Callouts"][0]
+        self.assertEqual(callout["Location Code"], "U78DA.ND0.1234567-P0")
+        self.assertEqual(expected["User Data"]["Key"], "Value")
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.pel_headers import readHeaders
+from pel.peltool.private_header import PrivateHeader
+
+from test_pel.pel_data import build_pel
+
+
+class TestPELHeaders(unittest.TestCase):
+
+    def test_read_headers(self):
+        data = build_pel(eid=0x50000010, plid=0x50000001, creator='B',
+                         severity=0x20, action_flags=0xA800, subsystem=0x62,
+                         obmc_log_id=12)
+        headers = readHeaders(data)
+
+        self.assertEqual(headers.creatorID, 'B')
+        self.assertEqual(headers.sectionCount, 3)
+        self.assertEqual(headers.lEID, 0x50000010)
+        self.assertEqual(headers.pLID, 0x50000001)
+        self.assertEqual(headers.obmcLogID, 12)
+        self.assertEqual(headers.eventSubsystem, 0x62)
+        self.assertEqual(headers.eventSeverity, 0x20)
+        self.assertEqual(headers.actionFlags, 0xA800)
+        self.assertTrue(headers.isServiceable())
+        self.assertFalse(headers.isHidden())
+
+    def test_bad_section_id(self):
+        data = bytearray(build_pel())
+        struct.pack_into('>H', data, 48, 0x4142)
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertIsNone(readHeaders(data))
+        self.assertIn('Failed to parse User Header', err.getvalue())
+
+        data[0:2] = b'XX'
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertIsNone(readHeaders(data))
+        self.assertIn('Failed to parse Private Header', err.getvalue())
+
+    def test_short_data(self):
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertIsNone(readHeaders(build_pel()[:60]))
+        self.assertIn('Failed to parse User Header', err.getvalue())
+
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertIsNone(readHeaders(build_pel()[:20]))
+        self.assertIn('Failed to parse Private Header', err.getvalue())
+
+    def test_truncated_file(self):
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, 'pel'), 'wb') as fd:
+                fd.write(build_pel()[:60])
+            config = Config()
+            config.every_pel = True
+            config.use_index = False
+            out = io.StringIO()
+            err = io.StringIO()
+            with contextlib.redirect_stdout(out), \
+                    contextlib.redirect_stderr(err):
+                peltool.printPELCount(path, config)
+            self.assertIn('"Number of PELs found": 0', out.getvalue())
+            self.assertIn('Failed to parse User Header', err.getvalue())
+            self.assertNotIn('Exception', err.getvalue())
+
+    def test_count_skips_formatting(self):
+        with tempfile.TemporaryDirectory() as pel_dir:
+            for i in range(3):
+                with open(os.path.join(pel_dir, str(i)), 'wb') as fd:
+                    fd.write(build_pel(eid=0x50000001 + i,
+                                       severity=0x40 if i else 0x00))
+
+            config = Config()
+            config.use_index = False
+            out = io.StringIO()
+            with mock.patch.object(PrivateHeader, 'toJSON') as to_json, \
+                    contextlib.redirect_stdout(out):
+                peltool.printPELCount(pel_dir, config)
+
+            to_json.assert_not_called()
+            self.assertIn('"Number of PELs found": 2', out.getvalue())
@@ -0,0 +1,153 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.pel_stream import (getPELLength, iterPELs, openPELStream,
+                                    readPELs)
+
+from test_pel.pel_data import build_pel, build_user_data
+
+MODULES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                           '..', '..', 'modules'))
+PELTOOL = os.path.join(MODULES_DIR, 'pel', 'peltool', 'peltool.py')
+
+
+class ChunkedReader:
+    """
+    File object that returns at most a few bytes from each read, like a pipe.
+    """
+
+    def __init__(self, data: bytes, chunk: int = 5):
+        self.fd = io.BytesIO(data)
+        self.chunk = chunk
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.chunk:
+            size = self.chunk
+        return self.fd.read(size)
+
+
+class TestPELStream(unittest.TestCase):
+
+    def setUp(self):
+        self.pels = [build_pel(eid=0x50000001),
+                     build_pel(eid=0x50000002,
+                               sections=[build_user_data(b'x' * 30)]),
+                     build_pel(eid=0x50000003)]
+        self.blob = b''.join(self.pels)
+
+    def _tar(self, files: dict, mode: str = 'w') -> bytes:
+        out = io.BytesIO()
+        with tarfile.open(fileobj=out, mode=mode) as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return out.getvalue()
+
+    def test_get_pel_length(self):
+        self.assertEqual(getPELLength(self.blob), len(self.pels[0]))
+        self.assertEqual(getPELLength(self.blob, len(self.pels[0])),
+                         len(self.pels[1]))
+
+        with self.assertRaisesRegex(ValueError, 'Truncated'):
+            getPELLength(self.pels[0][:-1])
+        with self.assertRaisesRegex(ValueError, 'No Private Header'):
+            getPELLength(self.blob, 4)
+
+    def test_iter_pels(self):
+        data = memoryview(self.blob)
+        pels = list(iterPELs(data))
+
+        self.assertEqual([pel for _, pel in pels], self.pels)
+        self.assertEqual([offset for offset, _ in pels],
+                         [0, len(self.pels[0]),
+                          len(self.pels[0]) + len(self.pels[1])])
+        # The PELs are slices of the data, not copies
+        self.assertTrue(all(pel.obj is self.blob for _, pel in pels))
+
+        # Test where there is trailing data that isn't a PEL
+        pels = iterPELs(self.blob + b'junk')
+        self.assertEqual(len([next(pels) for _ in range(3)]), 3)
+        with self.assertRaises(ValueError):
+            next(pels)
+
+    def test_read_pels(self):
+        pels = list(readPELs(ChunkedReader(self.blob), 'blob'))
+        self.assertEqual([bytes(pel) for _, pel in pels], self.pels)
+        self.assertEqual(pels[1][0], 'blob at offset %d' % len(self.pels[0]))
+
+        # Test where the stream is empty
+        self.assertEqual(list(readPELs(io.BytesIO(b''))), [])
+
+        # Test where the last PEL is truncated
+        pels = readPELs(ChunkedReader(self.blob[:-10]))
+        self.assertEqual(bytes(next(pels)[1]), self.pels[0])
+        self.assertEqual(bytes(next(pels)[1]), self.pels[1])
+        with self.assertRaisesRegex(ValueError, 'Truncated'):
+            next(pels)
+
+    def test_read_tar(self):
+        files = {'one': self.pels[0], 'bad': b'not a PEL',
+                 'rest': self.pels[1] + self.pels[2]}
+        for mode in ('w', 'w:gz'):
+            data = self._tar(files, mode)
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                pels = [(name, bytes(pel)) for name, pel in
+                        readPELs(ChunkedReader(data, 100), 'pels.tar')]
+
+            self.assertEqual([pel for _, pel in pels], self.pels)
+            self.assertEqual(pels[0][0], 'pels.tar:one at offset 0')
+            self.assertIn('pels.tar:bad', err.getvalue())
+
+        with self.assertRaisesRegex(ValueError, 'Not a PEL stream'):
+            list(readPELs(io.BytesIO(b'neither a PEL nor a tar archive')))
+
+    def test_process_pel_stream(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'pels.bin')
+            with open(path, 'wb') as fd:
+                fd.write(self.blob)
+
+            self.assertEqual([bytes(pel) for _, pel in openPELStream(path)],
+                             self.pels)
+
+            config = Config()
+            config.allow_plugins = False
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                peltool.processPELStream(path, config, 'count')
+                peltool.processPELStream(path, config, 'list')
+            out = out.getvalue()
+            self.assertIn('"Number of PELs found": 3', out)
+            self.assertIn('"0x50000002"', out)
+
+    def test_stream_rejects_filters(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'pels.bin')
+            with open(path, 'wb') as fd:
+                fd.write(self.blob)
+
+            env = dict(os.environ, PYTHONPATH=MODULES_DIR,
+                       PELTOOL_CACHE_DIR=os.path.join(tmp_dir, 'cache'))
+            for args in (['-i', '0x50000001'], ['--plid', '0x50000001'],
+                         ['--src', 'BD8D'], ['-R', '0'], ['-l', '-r']):
+                result = subprocess.run(
+                    [sys.executable, PELTOOL, '-p', tmp_dir, '--stream',
+                     path] + args, env=env, capture_output=True, text=True)
+                self.assertEqual(result.returncode, 2, args)
+                self.assertIn("--stream can't be used with", result.stderr)
+                self.assertEqual(result.stdout, '')
+
+            result = subprocess.run(
+                [sys.executable, PELTOOL, '-p', tmp_dir, '--stream', path,
+                 '-n'], env=env, capture_output=True, text=True)
+            self.assertEqual(result.returncode, 0)
+            self.assertIn('"Number of PELs found": 3', result.stdout)
@@ -0,0 +1,55 @@
+import io
+import json
+import unittest
+from collections import OrderedDict
+
+from pel.datastream import DataStream
+from pel.peltool import peltool
+from pel.peltool.config import Config
+
+from test_pel.pel_data import build_pel, build_user_data
+
+
+class TestWritePrettyJSON(unittest.TestCase):
+
+    def _check(self, data, desired_space=34):
+        expected = peltool.prettyPrint(json.dumps(data, indent=4),
+                                       desired_space)
+        out = io.StringIO()
+        peltool.writePrettyJSON(data, out, desired_space)
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_matches_pretty_print(self):
+        data = OrderedDict()
+        data["Section"] = OrderedDict([
+            ("Version", 1),
+            ("Text", "line\nbreak \"quoted\": {brace}"),
+            ("Empty", {}),
+            ("Empty list", []),
+            ("List", ["a", 1, {"nested": True}, None]),
+            ("Unicode", "café"),
+        ])
+        data["A much longer key than the alignment column allows"] = 0.5
+        self._check(data)
+        self._check(data, 29)
+        self._check({})
+        self._check([])
+        self._check("text")
+
+    def test_parsed_pel(self):
+        # Not BMC JSON user data, so it is hexdumped over several hundred
+        # lines.
+        pel = build_pel(sections=[
+            build_user_data(bytes(range(256)) * 16, sub_type=9),
+            build_user_data(b'\x00' * 40, sub_type=9)])
+        stream = DataStream(pel, byte_order='big', is_signed=False)
+        eid, data = peltool.parsePELData(stream, Config(), False)
+        self.assertEqual(eid, '50000001')
+        self.assertIn('User Data 1', data)
+        self._check(data)
+
+        stream = DataStream(pel, byte_order='big', is_signed=False)
+        out = io.StringIO()
+        peltool.writePrettyJSON(data, out)
+        self.assertEqual(peltool.parsePEL(stream, Config(), False),
+                         (eid, out.getvalue()))
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pel.peltool.registry import Registry
+
+
+def linear_search(pels, code, src_type):
+    for pel in pels:
+        if "ReasonCode" not in pel["SRC"]:
+            continue
+        if src_type != pel["SRC"].get("Type", "BD"):
+            continue
+        if code not in pel["SRC"]["ReasonCode"]:
+            continue
+        return pel
+    return None
+
+
+def entry(message, **src):
+    return {"SRC": src, "Documentation": {"Message": message}}
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry.__new__(Registry)
+        self.registry.pels = [
+            entry("No reason code"),
+            entry("First 1001", ReasonCode="0x1001"),
+            entry("Second 1001", ReasonCode="0x1001"),
+            entry("Power 1001", ReasonCode="0x1001", Type="11"),
+            entry("List", ReasonCode=["0x2001", "0x2002"]),
+            entry("Joined", ReasonCode="0x3001 0x3002"),
+        ]
+        self.registry.index = Registry.buildIndex(self.registry.pels)
+
+    def test_matches_linear_search(self):
+        codes = ["0x1001", "0x2001", "0x2002", "0x3001", "0x3002",
+                 "0x4001", "1 0x30", "0x", "0x200"]
+        for src_type in ("BD", "11", "B1"):
+            for code in codes:
+                self.assertIs(
+                    self.registry.findEntry(code, src_type),
+                    linear_search(self.registry.pels, code, src_type),
+                    (src_type, code))
+
+    def test_get_error_message(self):
+        self.assertEqual(self.registry.getErrorMessage("0x1001", "BD"),
+                         {"Message": "First 1001"})
+        self.assertEqual(self.registry.getErrorMessage("0x1001", "11"),
+                         {"Message": "Power 1001"})
+        self.assertEqual(self.registry.getErrorMessage("0x3002", "BD"),
+                         {"Message": "Joined"})
+        self.assertEqual(self.registry.getErrorMessage("0x9999", "BD"), {})
+
+
+class TestRegistryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(
+            os.environ, {'PELTOOL_CACHE_DIR': os.path.join(self.tmp.name,
+                                                           'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.path = os.path.join(self.tmp.name, 'message_registry.json')
+        self._write_registry("First")
+
+    def _write_registry(self, message):
+        pels = [entry(message, ReasonCode="0x1001"),
+                entry("Other", ReasonCode="0x1002")]
+        with open(self.path, 'w') as fd:
+            json.dump({"PELs": pels}, fd)
+
+    def _lookup(self):
+        registry = Registry(self.path)
+        with mock.patch.object(Registry, 'loadJson',
+                               wraps=registry.loadJson) as load_json:
+            message = registry.getErrorMessage("0x1001", "BD")
+        return message, load_json.call_count
+
+    def test_lazy_load(self):
+        with mock.patch.object(Registry, 'loadJson') as load_json:
+            Registry(self.path)
+        load_json.assert_not_called()
+
+    def test_cache(self):
+        self.assertEqual(self._lookup(), ({"Message": "First"}, 1))
+        self.assertTrue(os.path.exists(self.path + '.marshal'))
+
+        # The cache is used while the registry is unchanged.
+        self.assertEqual(self._lookup(), ({"Message": "First"}, 0))
+
+        # And rebuilt when it changes.
+        self._write_registry("Changed")
+        self.assertEqual(self._lookup(), ({"Message": "Changed"}, 1))
+        self.assertEqual(self._lookup(), ({"Message": "Changed"}, 0))
+
+    def test_read_only_registry_dir(self):
+        access = os.access
+        registry_dir = os.path.dirname(self.path)
+        with mock.patch('os.access',
+                        side_effect=lambda path, mode:
+                        path != registry_dir and access(path, mode)):
+            self.assertEqual(self._lookup()[1], 1)
+            self.assertFalse(os.path.exists(self.path + '.marshal'))
+
+            # The peltool cache directory is used instead.
+            self.assertEqual(self._lookup()[1], 0)
+
+    def test_corrupt_cache(self):
+        with open(self.path + '.marshal', 'wb') as fd:
+            fd.write(b'not a cache')
+        self.assertEqual(self._lookup(), ({"Message": "First"}, 1))
+        self.assertEqual(self._lookup(), ({"Message": "First"}, 0))
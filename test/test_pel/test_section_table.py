@@ -0,0 +1,105 @@
+import io
+import unittest
+from collections import OrderedDict
+from contextlib import redirect_stderr
+from unittest import mock
+
+import pel
+from pel.datastream import DataStream
+from pel.peltool.config import Config
+from pel.peltool.peltool import parsePELData
+from pel.peltool.pel_headers import numberSectionNames, readSectionHeaders, \
+    readSectionTable
+from pel.peltool.user_data import UserData
+
+from test_pel.pel_data import build_pel, build_user_data
+
+
+class TestSectionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config()
+        self.config.allow_plugins = False
+        self.user_data = [build_user_data(b'{"Key": %d}' % i)
+                          for i in range(4)]
+        self.data = build_pel(sections=self.user_data)
+
+    def test_number_section_names(self):
+        self.assertEqual(numberSectionNames(['A', 'B', 'A', 'C', 'A']),
+                         ['A 0', 'B', 'A 1', 'C', 'A 2'])
+
+    def test_read_section_table(self):
+        table = readSectionTable(self.data)
+
+        self.assertEqual([entry.name for entry in table],
+                         ['Private Header', 'User Header', 'Primary SRC',
+                          'User Data 0', 'User Data 1', 'User Data 2',
+                          'User Data 3'])
+        self.assertEqual([entry.index for entry in table], list(range(7)))
+        self.assertEqual(table[0].offset, 0)
+        self.assertEqual(table[1].offset, 48)
+        self.assertEqual(table[3].offset, len(self.data) -
+                         sum(len(ud) for ud in self.user_data))
+        self.assertEqual(table[3].sectionID, 0x5544)
+        self.assertEqual(table[3].sectionLen, len(self.user_data[0]))
+        self.assertEqual(table[3].componentID, 0x2000)
+
+        # Test where the PEL is at an offset in the data
+        table = readSectionTable(b'\0' * 16 + self.data, 16)
+        self.assertEqual(table[1].offset, 64)
+
+        with self.assertRaisesRegex(ValueError, 'Truncated'):
+            readSectionTable(self.data[:-1])
+        with self.assertRaisesRegex(ValueError, 'No Private Header'):
+            readSectionTable(self.data[48:])
+
+    def test_read_section_headers(self):
+        headers = readSectionHeaders(self.data)
+        self.assertEqual(headers, [(entry.offset, entry.sectionID,
+                                    entry.sectionLen, entry.versionID,
+                                    entry.subType, entry.componentID)
+                                   for entry in readSectionTable(self.data)])
+        self.assertEqual(headers[0][:2], (0, 0x5048))
+
+    def test_parse_sections(self):
+        full = pel.parse(self.data, self.config).toDict()
+
+        with mock.patch.object(UserData, 'toJSON',
+                               wraps=UserData.toJSON, autospec=True) as ud:
+            sections = pel.parseSections(self.data, ['Primary SRC'],
+                                         self.config)
+        ud.assert_not_called()
+        self.assertEqual([s.name for s in sections], ['Primary SRC'])
+        self.assertEqual(sections[0].data, full['Primary SRC'])
+
+        # A name without a count selects every section with that name
+        sections = pel.parseSections(self.data, ['User Data 2', 'User Header'],
+                                     self.config)
+        self.assertEqual([s.name for s in sections],
+                         ['User Header', 'User Data 2'])
+        self.assertEqual(sections[1].data['Key'], 2)
+        sections = pel.parseSections(self.data, ['User Data'], self.config)
+        self.assertEqual([s.data for s in sections],
+                         [full['User Data %d' % i] for i in range(4)])
+
+        # The sections are the same as the CLI shows with --section
+        self.config.sections = ['Private Header', 'User Data 3']
+        stream = DataStream(self.data, byte_order='big', is_signed=False)
+        eid, out = parsePELData(stream, self.config, False)
+        self.assertEqual(eid, '50000001')
+        self.assertEqual(out, OrderedDict(
+            (name, full[name]) for name in self.config.sections))
+
+    def test_parse_missing_sections(self):
+        self.config.sections = ['Nope', 'User Data 7']
+        stream = DataStream(self.data, byte_order='big', is_signed=False)
+        err = io.StringIO()
+        with redirect_stderr(err):
+            eid, out = parsePELData(stream, self.config, False)
+        self.assertEqual(eid, '50000001')
+        self.assertEqual(out, OrderedDict())
+        self.assertEqual(err.getvalue(),
+                         "PEL 0x50000001 has none of the sections 'Nope', "
+                         "'User Data 7'; available sections: Private Header, "
+                         "User Header, Primary SRC, User Data 0, User Data 1, "
+                         "User Data 2, User Data 3\n")
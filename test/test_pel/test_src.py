@@ -0,0 +1,52 @@
+import unittest
+
+from pel.datastream import DataStream
+from pel.peltool.config import Config
+from pel.peltool.src import SRC
+
+from test_pel.pel_data import build_callout, build_src
+
+
+class TestSRC(unittest.TestCase):
+
+    def parse(self, data: bytes) -> dict:
+        stream = DataStream(data, byte_order='big', is_signed=False)
+        stream.index = 8
+        config = Config()
+        config.allow_plugins = False
+        src = SRC(stream, 0x5053, len(data), 1, 1, 0x2000, 'O')
+        out = src.toJSON(config)
+        self.assertEqual(stream.index, len(data))
+        return out
+
+    def test_hex_words(self):
+        out = self.parse(build_src('BD8D1001', tuple(range(0x10, 0x18))))
+
+        self.assertEqual(out['SRC Version'], '0x02')
+        self.assertEqual(out['Valid Word Count'], '0x09')
+        self.assertEqual(out['Reference Code'], 'BD8D1001')
+        self.assertEqual(out['Hex Word 2'], '00000010')
+        self.assertEqual(out['Hex Word 9'], '00000017')
+        self.assertNotIn('Callout Section', out)
+
+    def test_callouts(self):
+        callouts = [
+            build_callout('H', 'U78DA.ND0.1234567-P0', pn='01AB234',
+                          ccin='2E2D', sn='YL10UF12345'),
+            build_callout('M', procedure='BMC0001'),
+            build_callout('L', 'P1', mrus=[(0x48, 0x12345),
+                                           (0x4D, 0xABCDEF01)]),
+            build_callout('A', ccin='1234')]
+        out = self.parse(build_src(callouts=callouts))['Callout Section']
+
+        self.assertEqual(out['Callout Count'], 4)
+        first, second, third, fourth = out['Callouts']
+        self.assertEqual(first['Location Code'], 'U78DA.ND0.1234567-P0')
+        self.assertEqual(first['Part Number'], '01AB234')
+        self.assertEqual(first['CCIN'], '2E2D')
+        self.assertEqual(first['Serial Number'], 'YL10UF12345')
+        self.assertEqual(second['Procedure'], 'BMC0001')
+        self.assertNotIn('Part Number', second)
+        self.assertEqual(third['MRU Id'], '00012345,ABCDEF01')
+        self.assertEqual(fourth['CCIN'], '1234')
+        self.assertNotIn('Serial Number', fourth)
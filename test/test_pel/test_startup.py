@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from test_pel.pel_data import build_pel
+
+MODULES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                           '..', '..', 'modules'))
+PELTOOL = os.path.join(MODULES_DIR, 'pel', 'peltool', 'peltool.py')
+
+# Modules that only the commands that parse whole PELs need.
+DEFERRED_MODULES = ['pel.peltool.src', 'pel.peltool.registry',
+                    'pel.peltool.user_data', 'pel.peltool.ext_user_data',
+                    'pel.peltool.parse_user_data', 'pel.hexdump',
+                    'pel.peltool.summary_index', 'multiprocessing',
+                    'tempfile', 'hashlib']
+
+
+class TestStartup(unittest.TestCase):
+    """
+    Checks peltool's startup cost with 'python -X importtime'.
+    """
+
+    # Cumulative import time allowed for pel.peltool.peltool.  This is a
+    # few times what it takes on a development machine, so it only catches
+    # an expensive import being added back to the startup path.
+    IMPORT_BUDGET_US = 100000
+
+    def setUp(self):
+        self.pycache = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pycache.cleanup)
+
+    def _import_times(self, args: list, fresh_cache: bool = False) -> dict:
+        """
+        Runs python with -X importtime and returns the cumulative import
+        time of each module, in microseconds.  The command is run once
+        first so the timed run loads from compiled bytecode, as it would
+        on the BMC.  With fresh_cache, the timed run uses an empty peltool
+        cache directory, so it builds and writes its caches again.
+        """
+        env = dict(os.environ)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        env['PYTHONPATH'] = MODULES_DIR
+        env['PYTHONPYCACHEPREFIX'] = self.pycache.name
+        env['PELTOOL_CACHE_DIR'] = self.pycache.name
+
+        cmd = [sys.executable, '-X', 'importtime'] + args
+        subprocess.run(cmd, env=env, capture_output=True, check=True)
+        if fresh_cache:
+            env['PELTOOL_CACHE_DIR'] = os.path.join(self.pycache.name,
+                                                    'cache')
+        result = subprocess.run(cmd, env=env, capture_output=True,
+                                check=True, text=True)
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            fields = line[len('import time:'):].split('|')
+            if fields[1].strip().isdigit():
+                times[fields[2].strip()] = int(fields[1])
+        return times
+
+    def test_import_budget(self):
+        times = self._import_times(['-c', 'import pel.peltool.peltool'])
+
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, times)
+        self.assertLess(times['pel.peltool.peltool'], self.IMPORT_BUDGET_US)
+
+    def test_count_defers_section_parsers(self):
+        with tempfile.TemporaryDirectory() as pel_dir:
+            path = os.path.join(pel_dir, '50000001')
+            with open(path, 'wb') as fd:
+                fd.write(build_pel())
+            # Old enough to be stored, so the summary index is written.
+            mtime = time.time() - 10
+            os.utime(path, (mtime, mtime))
+
+            times = self._import_times([PELTOOL, '-p', pel_dir, '-n'],
+                                       fresh_cache=True)
+            self.assertTrue(any(name.startswith('summary-') for name in
+                                os.listdir(os.path.join(self.pycache.name,
+                                                        'cache'))))
+
+        # The summary index is the default path of -n, but none of what it
+        # needs to check the summaries is.
+        for module in DEFERRED_MODULES:
+            if module != 'pel.peltool.summary_index':
+                self.assertNotIn(module, times)
+        self.assertIn('pel.peltool.summary_index', times)
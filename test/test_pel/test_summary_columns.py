@@ -0,0 +1,146 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.summary_columns import (COLUMNS, loadSummaryColumnsNumPy,
+                                         readSummaryColumns,
+                                         readSummaryFields)
+
+from test_pel.pel_data import build_pel, build_user_data
+
+
+class BinaryStdout(io.StringIO):
+    """
+    Text stdout with a binary buffer, like sys.stdout.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = io.BytesIO()
+
+
+class TestSummaryColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        os.environ['PELTOOL_CACHE_DIR'] = os.path.join(self.dir, 'cache')
+        self.addCleanup(os.environ.pop, 'PELTOOL_CACHE_DIR')
+        self.pels = os.path.join(self.dir, 'pels')
+        os.mkdir(self.pels)
+        pels = [build_pel(eid=0x50000001, refcode='BD8D1001'),
+                build_pel(eid=0x50000002, plid=0x50000001, creator='B',
+                          subsystem=0x20, refcode='BD8D1002'),
+                build_pel(eid=0x50000003, severity=0x00, refcode='BD001003',
+                          sections=[build_user_data(b'x' * 5000)]),
+                build_pel(eid=0x50000004, refcode='BD8D1001')]
+        for i, pel in enumerate(pels):
+            self._write(f'pel{i}', pel)
+        self._write('bad', b'not a PEL')
+
+    def _write(self, name: str, data: bytes):
+        with open(os.path.join(self.pels, name), 'wb') as fd:
+            fd.write(data)
+
+    def _run(self, func, config: Config, *args) -> BinaryStdout:
+        out = BinaryStdout()
+        with contextlib.redirect_stdout(out), \
+                contextlib.redirect_stderr(io.StringIO()):
+            func(self.pels, config, *args)
+        return out
+
+    def _summaries(self, config: Config) -> dict:
+        return json.loads(self._run(peltool.listOption, config).getvalue())
+
+    def test_read_summary_fields(self):
+        headers, src, commitTime, componentID = readSummaryFields(
+            build_pel(eid=0x50000002, plid=0x50000001, creator='B'))
+        self.assertEqual(headers.lEID, 0x50000002)
+        self.assertEqual(headers.pLID, 0x50000001)
+        self.assertEqual(headers.creatorID, 'B')
+        self.assertEqual(src, 'BD8D1001')
+        self.assertEqual(commitTime.hex(), '2022030818402700')
+
+        self.assertIsNone(readSummaryFields(b'\0' * 100))
+
+    def test_csv_matches_list(self):
+        for every_pel in (False, True):
+            config = Config()
+            config.every_pel = every_pel
+            config.use_index = False
+            expected = self._summaries(config)
+
+            out = self._run(peltool.exportPELSummaries, config, 'csv')
+            rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+            self.assertEqual(len(rows), 4 if every_pel else 3)
+            self.assertEqual(
+                rows, [dict({"EID": eid},
+                            **{name: summary[name] for name in COLUMNS
+                               if name != "EID"})
+                       for eid, summary in expected.items()])
+
+    def test_columns(self):
+        config = Config()
+        config.every_pel = True
+        out = self._run(peltool.exportPELSummaries, config, 'columns')
+        self.assertEqual(out.getvalue(), "")
+        columns = readSummaryColumns(out.buffer.getvalue())
+
+        self.assertEqual(len(columns), 4)
+        self.assertEqual(list(columns.columns["EID"]),
+                         [0x50000001, 0x50000002, 0x50000003, 0x50000004])
+        self.assertEqual(list(columns.columns["PLID"]),
+                         [0x50000001, 0x50000001, 0x50000003, 0x50000004])
+        self.assertEqual(columns.strings["SRC"],
+                         ['BD8D1001', 'BD8D1002', 'BD001003'])
+        self.assertEqual(list(columns.columns["SRC"]), [0, 1, 2, 0])
+        self.assertEqual(list(columns.columns["CreatorID"]),
+                         [ord('O'), ord('B'), ord('O'), ord('O')])
+        self.assertEqual(list(columns.columns["Subsystem"]),
+                         [0x10, 0x20, 0x10, 0x10])
+        self.assertEqual(list(columns.columns["Sev"]), [0x40, 0x40, 0, 0x40])
+        self.assertEqual(list(columns.columns["Commit Time"]),
+                         [20220308184027] * 4)
+
+        with self.assertRaisesRegex(ValueError, 'Not a PEL summary'):
+            readSummaryColumns(b'PELCOLS0' + out.buffer.getvalue()[8:])
+        with self.assertRaisesRegex(ValueError, 'Truncated'):
+            readSummaryColumns(out.buffer.getvalue()[:-20])
+
+    def test_columns_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+
+        config = Config()
+        config.every_pel = True
+        data = self._run(peltool.exportPELSummaries, config,
+                         'columns').buffer.getvalue()
+        columns = loadSummaryColumnsNumPy(data)
+        self.assertEqual(columns["EID"].tolist(),
+                         [0x50000001, 0x50000002, 0x50000003, 0x50000004])
+        self.assertEqual(columns["SRC"].tolist(),
+                         ['BD8D1001', 'BD8D1002', 'BD001003', 'BD8D1001'])
+
+    def test_truncated_pel(self):
+        self._write('pel9', build_pel(eid=0x50000009)[:60])
+        config = Config()
+        config.every_pel = True
+        err = io.StringIO()
+        out = BinaryStdout()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            peltool.exportPELSummaries(self.pels, config, 'csv')
+        self.assertIn('No PEL parsed for pel9', err.getvalue())
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
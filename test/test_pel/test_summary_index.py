@@ -0,0 +1,199 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from pel.peltool import peltool
+from pel.peltool.config import Config
+from pel.peltool.summary_index import SummaryIndex
+
+from test_pel.pel_data import build_pel
+
+
+class TestSummaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.pel_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ,
+                                  {'PELTOOL_CACHE_DIR': self.cache_dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Alternate serviceable and informational PELs.
+        for i in range(4):
+            self._write_pel(i, 0x40 if i % 2 else 0x00)
+
+    def tearDown(self):
+        self.pel_dir.cleanup()
+        self.cache_dir.cleanup()
+
+    def _write_pel(self, i: int, severity: int, data: bytes = None,
+                   recent: bool = False):
+        eid = 0x50000001 + i
+        path = os.path.join(self.pel_dir.name, '%08X' % eid)
+        with open(path, 'wb') as fd:
+            fd.write(data or build_pel(eid=eid, severity=severity))
+        if not recent:
+            # Files modified in the last few seconds aren't indexed.
+            mtime = time.time_ns() - 10 * 1000 * 1000 * 1000
+            os.utime(path, ns=(mtime, mtime))
+
+    def _run(self, func, config: Config) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), \
+                contextlib.redirect_stderr(io.StringIO()):
+            func(self.pel_dir.name, config)
+        return out.getvalue()
+
+    def test_list_uses_index(self):
+        config = Config()
+        expected = self._run(peltool.listOption, config)
+        self.assertIn('0x50000002', expected)
+        self.assertNotIn('0x50000001', expected)
+
+        # Nothing changed, so no files should be parsed again.
+        with mock.patch.object(peltool, 'indexPELFile',
+                               wraps=peltool.indexPELFile) as index_file:
+            self.assertEqual(self._run(peltool.listOption, config), expected)
+            self.assertEqual(index_file.call_count, 0)
+
+        # Only the changed file is parsed again.
+        self._write_pel(0, 0x40)
+        with mock.patch.object(peltool, 'indexPELFile',
+                               wraps=peltool.indexPELFile) as index_file:
+            output = self._run(peltool.listOption, config)
+            self.assertEqual(index_file.call_count, 1)
+        self.assertIn('0x50000001', output)
+
+    def test_filters_match_unindexed(self):
+        for setup in (lambda c: None,
+                      lambda c: setattr(c, 'every_pel', True),
+                      lambda c: setattr(c, 'non_serviceable', True)):
+            config = Config()
+            setup(config)
+            indexed = [self._run(peltool.listOption, config),
+                       self._run(peltool.printPELCount, config)]
+
+            config.use_index = False
+            unindexed = [self._run(peltool.listOption, config),
+                         self._run(peltool.printPELCount, config)]
+
+            self.assertEqual(indexed, unindexed)
+
+    def test_context(self):
+        index = SummaryIndex(self.pel_dir.name, True)
+        index.put('50000001', [1, 2], {"EID": ""})
+        index.save()
+
+        # Reloaded with the same settings.
+        self.assertIn('50000001', SummaryIndex(self.pel_dir.name, True).entries)
+
+        # Skipping plugins uses a separate index.
+        self.assertEqual(SummaryIndex(self.pel_dir.name, False).entries, {})
+
+    def test_context_inputs_changed(self):
+        # The summaries depend on the component ID files and SRC parser
+        # plugins, so changing either discards the summaries, but not the
+        # headers.
+        files = {}
+        for name in ('comp', 'plugin'):
+            files[name] = os.path.join(self.cache_dir.name, name)
+            with open(files[name], 'w') as fd:
+                fd.write('1')
+        config = Config()
+        with mock.patch('pel.peltool.comp_id.getComponentIDFiles',
+                        return_value=[files['comp']]), \
+                mock.patch('pel.peltool.summary_index._getSRCParserFiles',
+                           return_value=[files['plugin']]):
+            expected = self._run(peltool.listOption, config)
+            for name in ('comp', 'plugin'):
+                with open(files[name], 'w') as fd:
+                    fd.write('22')
+                with mock.patch.object(
+                        peltool, 'summarizeIndexedPELFile',
+                        wraps=peltool.summarizeIndexedPELFile) as summarize, \
+                        mock.patch.object(peltool, 'indexPELFile',
+                                          wraps=peltool.indexPELFile) as index:
+                    self.assertEqual(self._run(peltool.listOption, config),
+                                     expected)
+                    self.assertEqual(summarize.call_count, 2)
+                    self.assertEqual(index.call_count, 0)
+
+                    # Unchanged since, so the summaries are used again.
+                    self._run(peltool.listOption, config)
+                    self.assertEqual(summarize.call_count, 2)
+
+    def test_recently_modified_not_indexed(self):
+        config = Config()
+        self._write_pel(1, 0x40, recent=True)
+        self._run(peltool.listOption, config)
+
+        with mock.patch.object(peltool, 'indexPELFile',
+                               wraps=peltool.indexPELFile) as index_file:
+            self._run(peltool.listOption, config)
+            self.assertEqual(index_file.call_count, 1)
+
+    def test_count_reads_only_headers(self):
+        config = Config()
+        with mock.patch.object(peltool, 'summarizeIndexedPELFile',
+                               wraps=peltool.summarizeIndexedPELFile) as summarize:
+            self.assertIn('2', self._run(peltool.printPELCount, config))
+            self.assertEqual(summarize.call_count, 0)
+
+            # Only the PELs that pass the filters are summarized, once.
+            self._run(peltool.listOption, config)
+            self.assertEqual(summarize.call_count, 2)
+            self._run(peltool.listOption, config)
+            self.assertEqual(summarize.call_count, 2)
+
+    def test_errors_reported_every_time(self):
+        config = Config()
+        config.every_pel = True
+        self._write_pel(4, 0x40, data=b'PH' + b'\0' * 20)
+        # The headers are complete, so only the summary fails to parse.
+        self._write_pel(5, 0x40, data=build_pel(eid=0x50000006)[:100])
+
+        # The errors are stored in the index, so the second run reports
+        # the same errors without parsing the PELs again.
+        outputs = []
+        for run in range(2):
+            out = io.StringIO()
+            err = io.StringIO()
+            with mock.patch.object(peltool, 'summarizeIndexedPELFile',
+                                   wraps=peltool.summarizeIndexedPELFile) \
+                    as summarize, contextlib.redirect_stdout(out), \
+                    contextlib.redirect_stderr(err):
+                peltool.listOption(self.pel_dir.name, config)
+            self.assertEqual(summarize.called, run == 0)
+            self.assertIn('Failed to parse Private Header', err.getvalue())
+            self.assertIn('50000006', err.getvalue())
+            outputs.append((out.getvalue(), err.getvalue()))
+        self.assertEqual(outputs[0], outputs[1])
+
+        config.use_index = False
+        err = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(err):
+            peltool.listOption(self.pel_dir.name, config)
+        self.assertEqual(err.getvalue(), outputs[0][1])
+
+    def test_recent_reads_only_headers(self):
+        config = Config()
+        config.recent = 0
+        with mock.patch.object(peltool, 'summarizeIndexedPELFile',
+                               wraps=peltool.summarizeIndexedPELFile) as summarize:
+            self.assertIn('0x50000004', self._run(peltool.parsePelFromRecent,
+                                                  config))
+            self.assertEqual(summarize.call_count, 0)
+
+        config.use_index = False
+        with mock.patch.object(peltool, 'summarizePELFile',
+                               wraps=peltool.summarizePELFile) as summarize:
+            self.assertIn('0x50000004', self._run(peltool.parsePelFromRecent,
+                                                  config))
+            self.assertEqual(summarize.call_count, 0)
+
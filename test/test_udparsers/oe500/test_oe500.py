@@ -0,0 +1,42 @@
+import json
+import unittest
+
+from udparsers.oe500.oe500 import parseUDToJson
+
+
+class TestOE500(unittest.TestCase):
+
+    # There are no hwdiags data files in this repository, so registers and
+    # signatures are reported by ID.
+
+    def test_register_dump(self):
+        data = bytes.fromhex('00000002'
+                             '20da0010 0004 01 00000003'
+                             '000abc 00 02 1234'
+                             '000abd 01 03 abcdef'
+                             '123456 ff 01 00'
+                             '11111111 0000 00 00000000')
+        output = json.loads(parseUDToJson(2, 1, memoryview(data)))
+        self.assertEqual(output, {"Register Dump": [
+            "node 1 unknown 4 (0x20DA0010) " + '*' * 30,
+            "  id:000ABC inst:0          (0x00000000) 1234",
+            "  id:000ABD inst:1          (0x00000000) ABCD EF",
+            "  id:123456 inst:255        (0x00000000) 00",
+            "node 0 unknown 0 (0x11111111) " + '*' * 30,
+        ]})
+
+        # Test where data is truncated or a register has no data
+        with self.assertRaises(AssertionError):
+            parseUDToJson(2, 1, memoryview(data[:-1]))
+        with self.assertRaises(AssertionError):
+            parseUDToJson(2, 1, memoryview(bytes.fromhex(
+                '00000001 20da0010 0004 01 00000001 000abc 00 00')))
+
+    def test_signature_list(self):
+        data = bytes.fromhex('00000001 20da0010 00020301 12340005')
+        output = json.loads(parseUDToJson(1, 1, memoryview(data)))
+        self.assertEqual(output, {"Signature List": [{
+            "Chip Desc": "node 3 unknown 2 (0x20DA0010)",
+            "Signature": "id:1234(0)[5] ",
+            "Attn Type": "1",
+        }]})